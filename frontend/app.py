@@ -12,7 +12,7 @@ st.set_page_config(
 st.markdown("""
 # SweepGraph UI
 
-Use the sidebar to navigate: **Explorer**, **Editor**, **Dashboard**.
+Use the sidebar to navigate: **Explorer**, **Editor**, **Dashboard**, **Graph**.
 
 This UI is schema-agnostic: it discovers labels and relationship types from your database.
 """)
@@ -5,10 +5,9 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-import pandas as pd
 import streamlit as st
 
-from frontend.utils.graph_helpers import flatten_node_for_display, search_nodes
+from frontend.utils.graph_helpers import FULLTEXT_MAX_HITS, search_nodes_frame
 from frontend.utils.neo4j_connector import get_labels, get_relationship_types
 
 st.title("🔍 Explorer")
@@ -24,25 +23,48 @@ with filters[1]:
 with filters[2]:
     prop_key = st.text_input("Property key", placeholder="name", help="Optional property to target in search")
 
-search_term = st.text_input("Contains", placeholder="Search across node properties")
-limit = st.slider("Limit", 10, 500, 100, 10)
+search_term = st.text_input(
+    "Contains",
+    placeholder="Search across node properties",
+    help=f"Where a full-text index exists, results are the {FULLTEXT_MAX_HITS:,} most relevant matches at most",
+)
+page_size = st.select_slider("Page size", options=[25, 50, 100, 200, 500], value=100)
 
-nodes = search_nodes(
+search = dict(
     label=None if sel_label == "<any>" else sel_label,
     relationship_type=None if sel_rel == "<any>" else sel_rel,
     term=search_term or None,
     property_key=prop_key or None,
-    limit=limit,
+    page_size=page_size,
 )
 
-records = [flatten_node_for_display(node) for node in nodes]
+# Pages already fetched for the current search are kept, so going back costs
+# nothing; a new search starts over at the first page.
+if st.session_state.get("explorer_search") != search:
+    st.session_state.explorer_search = search
+    st.session_state.explorer_pages = [search_nodes_frame(**search)]
+    st.session_state.explorer_page = 0
+
+pages = st.session_state.explorer_pages
+current = st.session_state.explorer_page
+
+nav = st.columns([1, 1, 4])
+with nav[0]:
+    if st.button("← Previous", disabled=current == 0):
+        st.session_state.explorer_page = current - 1
+        st.rerun()
+with nav[1]:
+    if st.button("Next →", disabled=pages[current]["next"] is None):
+        if current + 1 == len(pages):
+            pages.append(search_nodes_frame(**search, after=pages[current]["next"]))
+        st.session_state.explorer_page = current + 1
+        st.rerun()
+
+frame = pages[current]["frame"]
 
-if records:
-    df = pd.DataFrame(records)
-    preferred = [col for col in ["labels", "name", "title", "id", "element_id"] if col in df.columns]
-    remainder = [col for col in df.columns if col not in preferred]
-    ordered_df = df[preferred + remainder] if preferred or remainder else df
-    st.caption(f"Showing {len(ordered_df)} nodes")
-    st.dataframe(ordered_df, use_container_width=True, hide_index=True)
+if len(frame):
+    first = current * page_size + 1
+    st.caption(f"Page {current + 1}: nodes {first}–{first + len(frame) - 1}")
+    st.dataframe(frame, use_container_width=True, hide_index=True)
 else:
     st.info("No nodes matched your filters.")
@@ -5,11 +5,19 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-import pandas as pd
 import streamlit as st
+from neo4j.exceptions import DriverError, Neo4jError
 
-from frontend.utils.graph_helpers import flatten_node_for_display, search_nodes
-from frontend.utils.neo4j_connector import get_labels, run_cypher
+from frontend.utils.bulk_edits import (
+    BULK_COLUMNS,
+    apply_edits,
+    parse_edit_table,
+    preview_edits,
+    valid_relationship_type,
+    validate_edits,
+)
+from frontend.utils.graph_helpers import BASE_LABEL, search_nodes_frame
+from frontend.utils.neo4j_connector import RELATIONSHIP_TYPES, RELATIONSHIPS, get_labels, write_cypher
 
 st.title("✏️ Editor (Relationships)")
 
@@ -27,60 +35,139 @@ with lookup_cols[2]:
 
 lookup_term = st.text_input("Contains", placeholder="Type to filter node properties", key="lookup_term")
 
-lookup_nodes = search_nodes(
+lookup_df = search_nodes_frame(
     label=None if lookup_label == "<any>" else lookup_label,
     term=lookup_term or None,
     property_key=lookup_prop_key or None,
-    limit=lookup_limit,
-)
+    page_size=lookup_limit,
+)["frame"]
 
-lookup_records = [flatten_node_for_display(node) for node in lookup_nodes]
-
-if lookup_records:
-    lookup_df = pd.DataFrame(lookup_records)
-    preferred = [col for col in ["labels", "name", "title", "id", "element_id"] if col in lookup_df.columns]
-    remainder = [col for col in lookup_df.columns if col not in preferred]
-    ordered_lookup_df = lookup_df[preferred + remainder] if preferred or remainder else lookup_df
-    st.caption(f"Found {len(ordered_lookup_df)} matching nodes")
-    st.dataframe(ordered_lookup_df, use_container_width=True, hide_index=True)
+if len(lookup_df):
+    st.caption(f"Found {len(lookup_df)} matching nodes")
+    st.dataframe(lookup_df, use_container_width=True, hide_index=True)
 else:
     st.info("No nodes match the current search.")
 
+TYPE_HELP = "Letters, digits and underscores, not starting with a digit"
+
 st.divider()
 
 with st.form("create_rel"):
     st.subheader("Create relationship")
     source_id = st.text_input("Source node id (property id)")
     target_id = st.text_input("Target node id (property id)")
-    rel_type = st.text_input("Relationship type", value="RELATED_TO")
+    rel_type = st.text_input("Relationship type", value="RELATED_TO", help=TYPE_HELP)
     submitted = st.form_submit_button("Create")
-    if submitted and source_id and target_id and rel_type:
+    if submitted and rel_type and not valid_relationship_type(rel_type):
+        st.error(f"Invalid relationship type {rel_type!r}: {TYPE_HELP.lower()}.")
+    elif submitted and source_id and target_id and rel_type:
         q = f"""
-        MATCH (a {{id: $source}})
-        MATCH (b {{id: $target}})
-        MERGE (a)-[r:{rel_type}]->(b)
+        MATCH (a:`{BASE_LABEL}` {{id: $source}})
+        MATCH (b:`{BASE_LABEL}` {{id: $target}})
+        MERGE (a)-[r:`{rel_type}`]->(b)
         RETURN type(r) AS created
         """
-        res = run_cypher(q, {"source": source_id, "target": target_id})
-        if res:
-            st.success(f"Created relationship of type {res[0].get('created')}")
+        try:
+            res = write_cypher(
+                q, {"source": source_id, "target": target_id}, invalidates=(RELATIONSHIPS, RELATIONSHIP_TYPES)
+            )
+        except (Neo4jError, DriverError) as exc:
+            st.error(f"Could not create the relationship: {exc}")
         else:
-            st.warning("The database did not report a created relationship.")
+            if res:
+                st.success(f"Created relationship of type {res[0].get('created')}")
+            else:
+                st.warning("The database did not report a created relationship.")
 
 with st.form("delete_rel"):
     st.subheader("Delete relationship")
     source_id_d = st.text_input("Source id")
     target_id_d = st.text_input("Target id")
-    rel_type_d = st.text_input("Type", value="RELATED_TO")
+    rel_type_d = st.text_input("Type", value="RELATED_TO", help=TYPE_HELP)
     del_submit = st.form_submit_button("Delete")
-    if del_submit and source_id_d and target_id_d and rel_type_d:
+    if del_submit and rel_type_d and not valid_relationship_type(rel_type_d):
+        st.error(f"Invalid relationship type {rel_type_d!r}: {TYPE_HELP.lower()}.")
+    elif del_submit and source_id_d and target_id_d and rel_type_d:
         q = f"""
-        MATCH (a {{id: $source}})-[r:{rel_type_d}]->(b {{id: $target}})
+        MATCH (a:`{BASE_LABEL}` {{id: $source}})-[r:`{rel_type_d}`]->(b:`{BASE_LABEL}` {{id: $target}})
         DELETE r
         RETURN 1 AS deleted
         """
-        res = run_cypher(q, {"source": source_id_d, "target": target_id_d})
-        if res:
-            st.success("Relationship deleted")
+        try:
+            res = write_cypher(
+                q, {"source": source_id_d, "target": target_id_d}, invalidates=(RELATIONSHIPS, RELATIONSHIP_TYPES)
+            )
+        except (Neo4jError, DriverError) as exc:
+            st.error(f"Could not delete the relationship: {exc}")
+        else:
+            if res:
+                st.success("Relationship deleted")
+            else:
+                st.info("No matching relationship found to delete.")
+
+st.divider()
+
+st.subheader("Bulk edit")
+st.caption(
+    f"One row per relationship with columns {', '.join(BULK_COLUMNS)}; action is create (default) or delete. "
+    "Rows are checked and previewed first, then applied together in one transaction."
+)
+
+upload_tab, paste_tab = st.tabs(["Upload CSV", "Paste table"])
+with upload_tab:
+    uploaded = st.file_uploader("CSV file", type=["csv", "tsv", "txt"], key="bulk_upload")
+with paste_tab:
+    pasted = st.text_area(
+        "Rows", height=160, key="bulk_paste", placeholder="source,target,type,action\nconcept:a,concept:b,RELATED_TO,create"
+    )
+
+bulk_text = uploaded.getvalue().decode("utf-8-sig") if uploaded is not None else pasted
+
+# The preview belongs to the input it was made from; a different input needs a new one
+if st.session_state.get("bulk_input") != bulk_text:
+    st.session_state.bulk_input = bulk_text
+    st.session_state.bulk_preview = None
+    st.session_state.bulk_report = None
+
+if st.button("Validate and preview", disabled=not bulk_text.strip()):
+    try:
+        edits = validate_edits(parse_edit_table(bulk_text))
+    except ValueError as exc:
+        st.error(f"Could not read the rows: {exc}")
+    else:
+        try:
+            st.session_state.bulk_preview = preview_edits(edits)
+        except (Neo4jError, DriverError) as exc:
+            st.error(f"Could not check the rows against the database: {exc}")
+        st.session_state.bulk_report = None
+
+preview = st.session_state.get("bulk_preview")
+if preview is not None:
+    changes = preview["change"].str.split(":").str[0].value_counts()
+    cols = st.columns(4)
+    cols[0].metric("Create", int(changes.get("create", 0)))
+    cols[1].metric("Delete", int(changes.get("delete", 0)))
+    cols[2].metric("Skip", int(changes.get("skip", 0)))
+    cols[3].metric("Invalid", int(changes.get("invalid", 0)))
+    st.dataframe(preview.drop(columns=["error"]), use_container_width=True, hide_index=True)
+
+    pending = int(changes.get("create", 0) + changes.get("delete", 0))
+    if st.button(f"Apply {pending} change{'s' if pending != 1 else ''}", type="primary", disabled=pending == 0):
+        try:
+            report = apply_edits(preview.drop(columns=["change"]))
+        except (Neo4jError, DriverError) as exc:
+            # One transaction: nothing was applied, so the preview still holds
+            st.error(f"The transaction failed and no changes were applied: {exc}")
         else:
-            st.info("No matching relationship found to delete.")
+            st.session_state.bulk_report = report
+            st.session_state.bulk_preview = None
+            st.rerun()
+
+report = st.session_state.get("bulk_report")
+if report is not None:
+    outcomes = report["result"].str.split(":").str[0].value_counts()
+    st.success(", ".join(f"{count} {outcome}" for outcome, count in outcomes.items()))
+    st.dataframe(report.drop(columns=["error"]), use_container_width=True, hide_index=True)
+    st.download_button(
+        "Download report", report.to_csv(index=False), file_name="bulk_edit_report.csv", mime="text/csv"
+    )
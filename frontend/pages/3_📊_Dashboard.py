@@ -5,23 +5,74 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+import altair as alt
+import pandas as pd
 import streamlit as st
-from frontend.utils.neo4j_connector import run_cypher
+from frontend.utils.graph_helpers import get_graph_counts, get_graph_stats
 
 st.title("📊 Dashboard")
 
-node_count = run_cypher("MATCH (n) RETURN count(n) AS c")[0]["c"]
-rel_count = run_cypher("MATCH ()-[r]->() RETURN count(r) AS c")[0]["c"]
+# Totals and per-type counts come from the count store; the per-label
+# profiles below are read from the snapshot written at the end of each import.
+counts = get_graph_counts()
+stats = get_graph_stats()
 
-col1, col2 = st.columns(2)
-col1.metric("Nodes", node_count)
-col2.metric("Relationships", rel_count)
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Nodes", counts["nodes"])
+col2.metric("Relationships", counts["relationships"])
+col3.metric("Labels", len(counts["labels"]))
+col4.metric("Relationship types", len(counts["relationship_types"]))
 
 st.subheader("Top relationship types")
-rows = run_cypher("""
-    MATCH ()-[r]->()
-    RETURN type(r) AS type, count(*) AS c
-    ORDER BY c DESC
-    LIMIT 10
-""")
-st.dataframe(rows)
+type_counts = pd.Series(counts["relationship_types"], dtype="int64").sort_values(ascending=False)
+st.bar_chart(type_counts.head(10))
+st.dataframe(type_counts.rename_axis("type").reset_index(name="c"), hide_index=True)
+
+st.subheader("Nodes by label")
+st.bar_chart(pd.Series(counts["labels"], dtype="int64").sort_values(ascending=False))
+
+st.subheader("Label profiles")
+if not stats or not stats.get("profiles"):
+    st.info(
+        "No statistics snapshot yet. Imports write one when they finish; "
+        "to build it now, run `python scripts/refresh_graph_stats.py`."
+    )
+    st.stop()
+
+st.caption(f"Snapshot from {stats['updated_at']}")
+label = st.selectbox("Label", sorted(stats["profiles"]))
+profile = stats["profiles"][label]
+
+col1, col2, col3 = st.columns(3)
+col1.metric("Nodes", profile["count"])
+col2.metric("Properties", len(profile["properties"]))
+col3.metric("Max degree", profile["max_degree"])
+
+left, right = st.columns(2)
+with left:
+    st.markdown("**Property fill rate**")
+    if profile["count"]:
+        fill = pd.Series(profile["properties"], dtype="float64") / profile["count"]
+        st.bar_chart(fill.sort_values(ascending=False))
+with right:
+    st.markdown("**Degree histogram**")
+    # Buckets are stored in degree order; st.bar_chart would sort them by name
+    degrees = pd.DataFrame({"degree": list(profile["degrees"]), "nodes": list(profile["degrees"].values())})
+    chart = alt.Chart(degrees).mark_bar().encode(x=alt.X("degree:N", sort=None), y="nodes:Q")
+    st.altair_chart(chart, use_container_width=True)
+
+relationships = stats.get("label_relationships", {}).get(label)
+if relationships:
+    st.markdown("**Relationships by type**")
+    st.dataframe(
+        pd.DataFrame(
+            [{"type": rel_type, "outgoing": out, "incoming": inc} for rel_type, (out, inc) in relationships.items()]
+        ).sort_values("outgoing", ascending=False),
+        hide_index=True,
+    )
+st.caption(f"Profiled at {profile['profiled_at']}")
+if label in stats.get("pending", []):
+    st.caption(
+        "This profile predates the latest import, which only refreshed the counts; "
+        "run `python scripts/refresh_graph_stats.py` to update it."
+    )
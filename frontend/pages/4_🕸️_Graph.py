@@ -0,0 +1,250 @@
+import math
+import sys
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import streamlit as st
+from streamlit_agraph import Config, Edge, Node, agraph
+
+from frontend.utils.graph_helpers import (
+    BASE_LABEL,
+    HUB_DEGREE,
+    get_degree_sample,
+    get_edges_between,
+    get_graph_counts,
+    get_label_overview,
+    get_neighbors,
+    get_node,
+    get_relationship_summary,
+    get_view_nodes,
+)
+from frontend.utils.neo4j_connector import get_labels
+
+st.title("🕸️ Graph")
+
+PALETTE = ["#4E79A7", "#F28E2B", "#E15759", "#76B7B2", "#59A14F", "#EDC948", "#B07AA1", "#FF9DA7", "#9C755F"]
+STUB_COLOR = "#D3D3D3"
+OVERVIEW_MAX_EDGES = 200
+
+# A click on a label cluster in the overview opens a sample of that label;
+# widget state can only be set before the widgets are drawn, hence the detour.
+pending_label = st.session_state.pop("graph_pending_label", None)
+if pending_label:
+    st.session_state.graph_start = "Degree sample"
+    st.session_state.graph_label = pending_label
+
+labels = get_labels()
+
+with st.sidebar:
+    start = st.radio("Start from", ["Degree sample", "Label overview", "Node"], key="graph_start")
+    sample_label = sample_size = start_id = None
+    if start == "Degree sample":
+        sample_label = st.selectbox("Label", ["<any>"] + labels, key="graph_label")
+        sample_size = st.slider("Sample size", 10, 200, 50, 10)
+    elif start == "Node":
+        start_id = st.text_input("Node id", key="graph_node")
+    max_nodes = st.slider("Max rendered nodes", 50, 500, 200, 50, help="Expansions stop adding nodes at this cap")
+    batch_size = st.slider("Expansion batch", 5, 100, 25, 5, help="Neighbours added per click")
+    physics = st.checkbox("Physics layout", value=True)
+    reset = st.button("Reset view")
+
+
+def _color(label_names: List[str]) -> str:
+    key = label_names[0] if label_names else BASE_LABEL
+    return PALETTE[zlib.crc32(key.encode("utf-8")) % len(PALETTE)]
+
+
+def _size(degree: int) -> float:
+    return 10 + 4 * math.log2(degree + 1)
+
+
+def _new_view() -> Dict[str, Any]:
+    return {"nodes": {}, "edges": set(), "stubs": {}, "expanded": set(), "seq": 0, "clicked": None, "selected": None}
+
+
+def _room(view: Dict[str, Any]) -> int:
+    return max_nodes - len(view["nodes"]) - len(view["stubs"])
+
+
+def _add_node(view: Dict[str, Any], row: Dict[str, Any]):
+    view["nodes"].setdefault(row["id"], {"caption": row["caption"], "labels": row["labels"], "degree": row["degree"]})
+
+
+def _add_edge(view: Dict[str, Any], node_id: str, row: Dict[str, Any]):
+    source, target = (node_id, row["id"]) if row["outgoing"] else (row["id"], node_id)
+    view["edges"].add((source, row["type"], target))
+
+
+def _add_stub(view: Dict[str, Any], stub: Dict[str, Any]):
+    view["seq"] += 1
+    view["stubs"][f"stub:{view['seq']}"] = stub
+
+
+def _place(view: Dict[str, Any], node_id: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Neighbours already drawn only gain an edge; new ones fill the batch and the rest wait
+    limit = min(batch_size, _room(view))
+    added, waiting = 0, []
+    for row in rows:
+        if row["id"] in view["nodes"]:
+            _add_edge(view, node_id, row)
+        elif added < limit:
+            _add_node(view, row)
+            _add_edge(view, node_id, row)
+            added += 1
+        else:
+            waiting.append(row)
+    return waiting
+
+
+def _expand(view: Dict[str, Any], node_id: str):
+    view["expanded"].add(node_id)
+    if view["nodes"][node_id]["degree"] <= HUB_DEGREE:
+        waiting = _place(view, node_id, get_neighbors(node_id, limit=HUB_DEGREE))
+        if waiting:
+            _add_stub(view, {"node": node_id, "pending": waiting})
+        return
+
+    # A hub is summarised per relationship type and direction; each summary
+    # loads its neighbours in batches when clicked
+    summary = get_relationship_summary(node_id)
+    for row in summary[:max(_room(view), 1)]:
+        _add_stub(view, {"node": node_id, **row, "loaded": []})
+
+
+def _load_stub(view: Dict[str, Any], stub_id: str):
+    stub = view["stubs"].pop(stub_id)
+    node_id = stub["node"]
+    if _room(view) <= 0:
+        view["stubs"][stub_id] = stub
+        return
+    if "pending" in stub:
+        waiting = _place(view, node_id, stub["pending"])
+        if waiting:
+            _add_stub(view, {**stub, "pending": waiting})
+        return
+
+    rows = get_neighbors(
+        node_id,
+        rel_type=stub["type"],
+        direction=stub["direction"],
+        exclude=stub["loaded"],
+        limit=min(batch_size, _room(view)),
+    )
+    _place(view, node_id, rows)
+    loaded = stub["loaded"] + [row["id"] for row in rows if row["id"] in view["nodes"]]
+    if rows and len(loaded) < stub["count"]:
+        _add_stub(view, {**stub, "loaded": loaded})
+
+
+def _build_view() -> Dict[str, Any]:
+    view = _new_view()
+    if start == "Degree sample":
+        rows = get_degree_sample(None if sample_label == "<any>" else sample_label, min(sample_size, max_nodes))
+    elif start_id:
+        rows = get_view_nodes([start_id])
+    else:
+        rows = []
+    for row in rows:
+        _add_node(view, row)
+
+    ids = list(view["nodes"])
+    via = [node_id for node_id, node in view["nodes"].items() if node["degree"] <= HUB_DEGREE]
+    for row in get_edges_between(ids, via):
+        view["edges"].add((row["source"], row["type"], row["target"]))
+    if start == "Node" and ids:
+        _expand(view, ids[0])
+    return view
+
+
+def _render_overview():
+    counts = get_graph_counts()["labels"]
+    nodes = [
+        Node(id=label, label=f"{label} ({count:,})", title=f"{count:,} nodes", size=_size(count), color=_color([label]))
+        for label, count in counts.items()
+        if label != BASE_LABEL and count
+    ]
+    edges = {}
+    for row in get_label_overview():
+        if row["source"] in counts and row["target"] in counts:
+            key = (row["source"], row["type"], row["target"])
+            edges[key] = edges.get(key, 0) + row["count"]
+    top = sorted(edges.items(), key=lambda item: -item[1])[:OVERVIEW_MAX_EDGES]
+    st.caption("One node per label; relationship counts are estimated from a sample. Click a label to open it.")
+    clicked = agraph(
+        nodes=nodes,
+        edges=[Edge(source=s, target=t, label=f"{rel} ({c:,})") for (s, rel, t), c in top],
+        config=Config(width=1100, height=700, directed=True, physics=physics),
+    )
+    if clicked and clicked != st.session_state.get("graph_overview_clicked"):
+        st.session_state.graph_overview_clicked = clicked
+        st.session_state.graph_pending_label = clicked
+        st.rerun()
+
+
+if start == "Label overview":
+    _render_overview()
+    st.stop()
+
+view_key = (start, sample_label, sample_size, start_id)
+if reset or st.session_state.get("graph_view_key") != view_key:
+    st.session_state.graph_view_key = view_key
+    st.session_state.graph_view = _build_view()
+view = st.session_state.graph_view
+
+if not view["nodes"]:
+    st.info("Nothing to show. Pick a label with nodes, or a node id that exists.")
+    st.stop()
+
+nodes = []
+for node_id, node in view["nodes"].items():
+    hub = node["degree"] > HUB_DEGREE
+    nodes.append(Node(
+        id=node_id,
+        label=node["caption"][:40],
+        title=f"{':'.join(node['labels'])} · {node['degree']:,} relationships" + (" (hub)" if hub else ""),
+        size=_size(node["degree"]),
+        color=_color(node["labels"]),
+        shape="diamond" if hub and node_id not in view["expanded"] else "dot",
+    ))
+edges = [Edge(source=s, target=t, label=rel) for s, rel, t in view["edges"]]
+
+for stub_id, stub in view["stubs"].items():
+    if "pending" in stub:
+        caption = f"+{len(stub['pending'])} more"
+    else:
+        arrow = "→" if stub["direction"] == "out" else "←"
+        caption = f"{arrow} {stub['type']} ({stub['count'] - len(stub['loaded']):,})"
+    nodes.append(Node(id=stub_id, label=caption, title="Click to load the next batch", shape="box", color=STUB_COLOR))
+    edges.append(Edge(source=stub["node"], target=stub_id, color=STUB_COLOR, dashes=True))
+
+st.caption(
+    f"{len(view['nodes'])} nodes and {len(view['edges'])} relationships shown (cap {max_nodes}). "
+    f"Click a node to expand it; diamonds are hubs with more than {HUB_DEGREE} relationships, "
+    "summarised by type. Grey boxes load the next batch."
+)
+if _room(view) <= 0:
+    st.warning("Node cap reached. Raise the cap or reset the view to expand further.")
+
+clicked = agraph(nodes=nodes, edges=edges, config=Config(width=1100, height=700, directed=True, physics=physics))
+
+# The component keeps returning its last selection, so act on changes only
+if clicked and clicked != view["clicked"]:
+    view["clicked"] = clicked
+    if clicked in view["stubs"]:
+        _load_stub(view, clicked)
+    elif clicked in view["nodes"]:
+        view["selected"] = clicked
+        if clicked not in view["expanded"] and _room(view) > 0:
+            _expand(view, clicked)
+    st.rerun()
+
+if view["selected"]:
+    node = get_node(view["selected"])
+    if node:
+        st.subheader(str(node.get("name") or node.get("title") or view["selected"]))
+        st.json(node, expanded=False)
@@ -0,0 +1,173 @@
+import csv
+import io
+import re
+from itertools import islice
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+
+from .graph_helpers import BASE_LABEL
+from .neo4j_connector import RELATIONSHIP_TYPES, RELATIONSHIPS, run_cypher, write_statements
+
+# Bulk relationship edits: a table of source/target/type/action rows is
+# checked locally, previewed against the database, then applied with one
+# UNWIND statement per action and type (in batches) inside a single
+# transaction. Endpoints are looked up through the base label's id index.
+BULK_ACTIONS = ("create", "delete")
+BULK_BATCH_SIZE = 1000
+BULK_COLUMNS = ["source", "target", "type", "action"]
+
+_COLUMN_ALIASES = {"source_id": "source", "target_id": "target", "rel_type": "type", "relationship": "type"}
+_REL_TYPE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def valid_relationship_type(name: str) -> bool:
+    """Whether ``name`` is safe to splice into a query as a relationship type."""
+    return bool(_REL_TYPE.match(name))
+
+
+def parse_edit_table(text: str) -> pd.DataFrame:
+    """Read CSV or tab-separated rows with a ``source,target,type[,action]`` header."""
+    sample = text[:4096]
+    try:
+        delimiter = csv.Sniffer().sniff(sample, delimiters=",\t;|").delimiter
+    except csv.Error:
+        delimiter = ","
+    frame = pd.read_csv(io.StringIO(text), sep=delimiter, dtype=str, keep_default_na=False, skipinitialspace=True)
+    frame.columns = [_COLUMN_ALIASES.get(col.strip().lower(), col.strip().lower()) for col in frame.columns]
+    if "action" not in frame.columns:
+        frame["action"] = "create"
+    missing = [col for col in BULK_COLUMNS if col not in frame.columns]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+
+    frame = frame[BULK_COLUMNS].apply(lambda column: column.str.strip())
+    frame["action"] = frame["action"].str.lower().replace("", "create")
+    # Row numbers as a spreadsheet shows them, header being row 1
+    frame.insert(0, "row", range(2, len(frame) + 2))
+    return frame
+
+
+def validate_edits(frame: pd.DataFrame) -> pd.DataFrame:
+    """Add an ``error`` column for rows that cannot be applied, without touching the database."""
+    errors = []
+    seen: Dict[Tuple[str, str, str], Tuple[int, str]] = {}
+    for row in frame.itertuples(index=False):
+        key = (row.source, row.type, row.target)
+        if not row.source or not row.target or not row.type:
+            error = "source, target and type are required"
+        elif row.action not in BULK_ACTIONS:
+            error = f"action must be one of: {', '.join(BULK_ACTIONS)}"
+        elif not valid_relationship_type(row.type):
+            error = "type must be letters, digits and underscores"
+        elif key in seen:
+            first_row, first_action = seen[key]
+            if first_action == row.action:
+                error = f"duplicate of row {first_row}"
+            else:
+                error = f"conflicts with row {first_row} ({first_action})"
+        else:
+            seen[key] = (row.row, row.action)
+            error = ""
+        errors.append(error)
+    return frame.assign(error=errors)
+
+
+def preview_edits(frame: pd.DataFrame) -> pd.DataFrame:
+    """Compare valid rows with the database and add the ``change`` each would make."""
+    frame = frame.copy()
+    frame["change"] = frame["error"].where(frame["error"] == "", "invalid: " + frame["error"])
+
+    valid = frame[frame["error"] == ""]
+    found: Dict[int, Dict[str, Any]] = {}
+    for chunk in _chunks(valid, BULK_BATCH_SIZE):
+        rows = run_cypher(f"""
+            UNWIND $rows AS row
+            OPTIONAL MATCH (a:`{BASE_LABEL}` {{id: row.source}})
+            OPTIONAL MATCH (b:`{BASE_LABEL}` {{id: row.target}})
+            RETURN row.row AS row,
+                   a IS NOT NULL AS source_found,
+                   b IS NOT NULL AS target_found,
+                   CASE WHEN a IS NULL OR b IS NULL THEN 0
+                        ELSE COUNT {{ (a)-[r]->(b) WHERE type(r) = row.type }} END AS existing
+        """, {"rows": chunk})
+        found.update({row["row"]: row for row in rows})
+
+    changes = []
+    for row in frame.itertuples(index=False):
+        check = found.get(row.row)
+        if check is None:
+            changes.append(row.change)
+        elif not check["source_found"] or not check["target_found"]:
+            missing = [name for name in ("source", "target") if not check[f"{name}_found"]]
+            changes.append(f"skip: {' and '.join(missing)} not found")
+        elif row.action == "create":
+            changes.append("skip: already exists" if check["existing"] else "create")
+        else:
+            changes.append("delete" if check["existing"] else "skip: not found")
+    frame["change"] = changes
+    return frame
+
+
+def apply_edits(frame: pd.DataFrame) -> pd.DataFrame:
+    """Apply the valid rows in one transaction and add a per-row ``result`` column.
+
+    Rows are grouped by action and type, and each group is written as
+    ``UNWIND`` batches of ``BULK_BATCH_SIZE`` rows; the database re-checks
+    every row, so the results reflect its state at commit time rather than
+    at preview time.
+    """
+    valid = frame[frame["error"] == ""]
+    statements = []
+    for (action, rel_type), group in valid.groupby(["action", "type"], sort=False):
+        query = _create_query(rel_type) if action == "create" else _delete_query(rel_type)
+        for chunk in _chunks(group, BULK_BATCH_SIZE):
+            statements.append((query, {"rows": chunk}))
+
+    outcomes: Dict[int, str] = {}
+    if statements:
+        for records in write_statements(statements, invalidates=(RELATIONSHIPS, RELATIONSHIP_TYPES)):
+            outcomes.update({record["row"]: record["result"] for record in records})
+
+    results = []
+    for row in frame.itertuples(index=False):
+        if row.error:
+            results.append(f"invalid: {row.error}")
+        else:
+            results.append(outcomes.get(row.row, "skipped: source or target not found"))
+    return frame.assign(result=results)
+
+
+def _create_query(rel_type: str) -> str:
+    return f"""
+    UNWIND $rows AS row
+    MATCH (a:`{BASE_LABEL}` {{id: row.source}})
+    MATCH (b:`{BASE_LABEL}` {{id: row.target}})
+    WITH row, a, b, COUNT {{ (a)-[:`{rel_type}`]->(b) }} AS before
+    MERGE (a)-[:`{rel_type}`]->(b)
+    RETURN row.row AS row, CASE WHEN before = 0 THEN 'created' ELSE 'unchanged: already exists' END AS result
+    """
+
+
+def _delete_query(rel_type: str) -> str:
+    return f"""
+    UNWIND $rows AS row
+    MATCH (a:`{BASE_LABEL}` {{id: row.source}})
+    MATCH (b:`{BASE_LABEL}` {{id: row.target}})
+    OPTIONAL MATCH (a)-[r:`{rel_type}`]->(b)
+    WITH row, collect(r) AS rels
+    FOREACH (r IN rels | DELETE r)
+    RETURN row.row AS row, CASE WHEN size(rels) = 0 THEN 'unchanged: not found' ELSE 'deleted' END AS result
+    """
+
+
+def _chunks(frame: pd.DataFrame, size: int):
+    records = iter(
+        {"row": int(row.row), "source": row.source, "target": row.target, "type": row.type}
+        for row in frame.itertuples(index=False)
+    )
+    while True:
+        chunk: List[Dict[str, Any]] = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
@@ -1,24 +1,258 @@
 import json
-from typing import Any, Dict, List, Optional
+import re
+from contextlib import closing
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from .neo4j_connector import run_cypher
+from .neo4j_connector import (
+    NODES,
+    RELATIONSHIP_TYPES,
+    RELATIONSHIPS,
+    SCHEMA_CACHE_TTL,
+    STATS_LABEL,
+    STREAM_FETCH_SIZE,
+    cached_cypher,
+    cached_frame,
+    get_labels,
+    get_relationship_types,
+    stream_cypher,
+)
+
+# Full-text search: one index per label over its string properties, plus the
+# shared ``Node`` base label's index for searches across all labels. The
+# importer and scripts/refresh_graph_stats.py maintain the indexes (see
+# scripts/utils/search_indexes.py); searches only look them up and fall back
+# to a scan where none is usable. An indexed search ranks at most
+# FULLTEXT_MAX_HITS hits, so paging through them never sorts more than that.
+BASE_LABEL = "Node"
+SEARCH_INDEX_PREFIX = "search_"
+FULLTEXT_MAX_HITS = 1000
+SEARCH_INDEXES = "search_indexes"  # cache tag
+
+# The snapshot changes only when an import or refresh script rewrites it
+GRAPH_STATS = "graph_stats"  # cache tag
+
+# Graph view: nodes with more relationships than HUB_DEGREE are expanded one
+# relationship type at a time; samples look at no more than SAMPLE_SCAN_LIMIT
+# nodes, so their cost does not grow with the graph.
+HUB_DEGREE = 100
+SAMPLE_SCAN_LIMIT = 20_000
+
+_LUCENE_TOKEN = re.compile(r"\w+", re.UNICODE)
+_SIMPLE_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
 
 
 def get_nodes_by_label(label: str, limit: int = 100) -> List[Dict[str, Any]]:
     q = f"MATCH (n:`{label}`) RETURN n LIMIT $limit"
-    return run_cypher(q, {"limit": limit})
+    return cached_cypher(q, {"limit": limit}, tags=(NODES,))
 
 
 def get_graph_sample(limit: int = 100) -> Dict[str, Any]:
-    nodes = run_cypher("MATCH (n) RETURN id(n) AS id, labels(n) AS labels, n AS props LIMIT $limit", {"limit": limit})
-    rels = run_cypher("""
+    nodes = cached_cypher(
+        "MATCH (n) RETURN id(n) AS id, labels(n) AS labels, n AS props LIMIT $limit", {"limit": limit}, tags=(NODES,)
+    )
+    rels = cached_cypher("""
         MATCH (a)-[r]->(b)
         RETURN id(a) AS source, type(r) AS type, id(b) AS target
         LIMIT $limit
-    """, {"limit": limit})
+    """, {"limit": limit}, tags=(RELATIONSHIPS,))
     return {"nodes": nodes, "relationships": rels}
 
 
+def get_graph_counts() -> Dict[str, Any]:
+    """Node and relationship totals plus per-label and per-type counts.
+
+    Every branch is a bare count over at most one label or type, which Neo4j
+    answers from its count store without scanning the graph.
+    """
+    labels = get_labels()
+    rel_types = get_relationship_types()
+    branches = [
+        "MATCH (x)",
+        f"MATCH (x:`{STATS_LABEL}`)",
+        "MATCH ()-[x]->()",
+        *(f"MATCH (x:`{label}`)" for label in labels),
+        *(f"MATCH ()-[x:`{rel_type}`]->()" for rel_type in rel_types),
+    ]
+    query = "\nUNION ALL\n".join(
+        f"{branch} RETURN {position} AS position, count(x) AS count" for position, branch in enumerate(branches)
+    )
+    counts = [0] * len(branches)
+    for row in cached_cypher(query, tags=(NODES, RELATIONSHIPS)):
+        counts[row["position"]] = row["count"]
+
+    label_counts = counts[3:3 + len(labels)]
+    type_counts = counts[3 + len(labels):]
+    return {
+        "nodes": counts[0] - counts[1],
+        "relationships": counts[2],
+        "labels": dict(zip(labels, label_counts)),
+        "relationship_types": dict(zip(rel_types, type_counts)),
+    }
+
+
+def get_graph_stats() -> Optional[Dict[str, Any]]:
+    """The statistics snapshot materialized by the last import, or ``None`` if there is none yet."""
+    rows = cached_cypher(
+        f"MATCH (s:`{STATS_LABEL}`) RETURN s.snapshot AS snapshot LIMIT 1", tags=(GRAPH_STATS,)
+    )
+    if not rows or not rows[0].get("snapshot"):
+        return None
+    return json.loads(rows[0]["snapshot"])
+
+
+def _view_fields(var: str) -> str:
+    return (
+        f"{var}.id AS id, [l IN labels({var}) WHERE l <> '{BASE_LABEL}'] AS labels, "
+        f"toString(coalesce({var}.name, {var}.title, {var}.id)) AS caption, "
+        f"COUNT {{ ({var})--() }} AS degree"
+    )
+
+
+def get_degree_sample(label: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+    """The best-connected nodes among the first ``SAMPLE_SCAN_LIMIT`` of ``label``.
+
+    Degrees are read from each node's relationship counters, so the sample
+    costs one pass over at most ``SAMPLE_SCAN_LIMIT`` nodes.
+    """
+    q = f"""
+    MATCH (n:`{label or BASE_LABEL}`) WHERE n.id IS NOT NULL
+    WITH n LIMIT $scan
+    RETURN {_view_fields("n")}
+    ORDER BY degree DESC, id
+    LIMIT $limit
+    """
+    return cached_cypher(q, {"scan": SAMPLE_SCAN_LIMIT, "limit": limit}, tags=(NODES, RELATIONSHIPS))
+
+
+def get_view_nodes(node_ids: List[str]) -> List[Dict[str, Any]]:
+    q = f"""
+    UNWIND $ids AS node_id
+    MATCH (n:`{BASE_LABEL}` {{id: node_id}})
+    RETURN {_view_fields("n")}
+    """
+    return cached_cypher(q, {"ids": node_ids}, tags=(NODES, RELATIONSHIPS))
+
+
+def get_edges_between(node_ids: List[str], via: List[str]) -> List[Dict[str, Any]]:
+    """Relationships among ``node_ids``, found by expanding only the ``via`` nodes.
+
+    Pass the non-hub nodes as ``via`` so no hub's relationships are walked;
+    edges between two hubs are left out.
+    """
+    if not node_ids or not via:
+        return []
+    q = f"""
+    UNWIND $via AS node_id
+    MATCH (a:`{BASE_LABEL}` {{id: node_id}})-[r]-(b:`{BASE_LABEL}`)
+    WHERE b.id IN $ids
+    RETURN DISTINCT startNode(r).id AS source, type(r) AS type, endNode(r).id AS target
+    """
+    return cached_cypher(q, {"via": via, "ids": node_ids}, tags=(NODES, RELATIONSHIPS))
+
+
+def get_neighbors(
+    node_id: str,
+    *,
+    rel_type: Optional[str] = None,
+    direction: Optional[str] = None,
+    exclude: Optional[List[str]] = None,
+    limit: int = 25,
+) -> List[Dict[str, Any]]:
+    """Up to ``limit`` neighbours of a node, optionally of one type and ``direction`` (``out``/``in``).
+
+    Neighbours in ``exclude`` are skipped; the walk stops as soon as
+    ``limit`` rows are found, so a batch from a hub costs what it returns.
+    """
+    rel = f"[r:`{rel_type}`]" if rel_type else "[r]"
+    pattern = {"out": f"-{rel}->", "in": f"<-{rel}-"}.get(direction, f"-{rel}-")
+    q = f"""
+    MATCH (n:`{BASE_LABEL}` {{id: $id}}){pattern}(m:`{BASE_LABEL}`)
+    WHERE NOT m.id IN $exclude
+    WITH n, r, m LIMIT $limit
+    RETURN {_view_fields("m")}, type(r) AS type, startNode(r) = n AS outgoing
+    """
+    params = {"id": node_id, "exclude": exclude or [], "limit": limit}
+    return cached_cypher(q, params, tags=(NODES, RELATIONSHIPS))
+
+
+def get_relationship_summary(node_id: str) -> List[Dict[str, Any]]:
+    """Relationship counts of a node per type and direction, read from its counters."""
+    rel_types = get_relationship_types()
+    if not rel_types:
+        return []
+    counts = ", ".join(
+        f"COUNT {{ (n)-[:`{rel_type}`]->() }}, COUNT {{ (n)<-[:`{rel_type}`]-() }}" for rel_type in rel_types
+    )
+    rows = cached_cypher(
+        f"MATCH (n:`{BASE_LABEL}` {{id: $id}}) RETURN [{counts}] AS counts",
+        {"id": node_id},
+        tags=(RELATIONSHIPS, RELATIONSHIP_TYPES),
+    )
+    if not rows:
+        return []
+    summary = []
+    for position, rel_type in enumerate(rel_types):
+        for direction, count in zip(("out", "in"), rows[0]["counts"][2 * position:2 * position + 2]):
+            if count:
+                summary.append({"type": rel_type, "direction": direction, "count": count})
+    return sorted(summary, key=lambda row: -row["count"])
+
+
+def get_label_overview(sample: int = 10_000) -> List[Dict[str, Any]]:
+    """Relationship counts between labels, estimated from the first ``sample`` relationships."""
+    q = f"""
+    MATCH (a:`{BASE_LABEL}`)-[r]->(b:`{BASE_LABEL}`)
+    WITH a, r, b LIMIT $sample
+    UNWIND [l IN labels(a) WHERE l <> '{BASE_LABEL}'] AS source
+    UNWIND [l IN labels(b) WHERE l <> '{BASE_LABEL}'] AS target
+    RETURN source, type(r) AS type, target, count(*) AS count
+    ORDER BY count DESC
+    """
+    return cached_cypher(q, {"sample": sample}, tags=(NODES, RELATIONSHIPS))
+
+
+def get_node(node_id: str) -> Optional[Dict[str, Any]]:
+    rows = cached_cypher(f"MATCH (n:`{BASE_LABEL}` {{id: $id}}) RETURN n", {"id": node_id}, tags=(NODES,))
+    return rows[0]["n"] if rows else None
+
+
+def search_index_name(label: str) -> str:
+    return SEARCH_INDEX_PREFIX + re.sub(r"\W", "_", label).lower()
+
+
+def get_search_indexes() -> Dict[str, Dict[str, Any]]:
+    rows = cached_cypher("""
+        SHOW FULLTEXT INDEXES
+        YIELD name, state, entityType, labelsOrTypes, properties
+        RETURN name, state, entityType, labelsOrTypes, properties
+    """, ttl=SCHEMA_CACHE_TTL, tags=(SEARCH_INDEXES,))
+    return {
+        row["name"]: row for row in rows
+        if row.get("entityType") == "NODE" and str(row.get("name", "")).startswith(SEARCH_INDEX_PREFIX)
+    }
+
+
+def _usable_search_index(label: Optional[str], property_key: Optional[str]) -> Optional[str]:
+    index = get_search_indexes().get(search_index_name(label or BASE_LABEL))
+    if not index or index.get("state") != "ONLINE":
+        return None
+    if property_key and (
+        property_key not in (index.get("properties") or []) or not _SIMPLE_NAME.match(property_key)
+    ):
+        return None
+    return index["name"]
+
+
+def fulltext_query(term: str, property_key: Optional[str] = None) -> Optional[str]:
+    # Whole tokens rank above prefix matches; wildcard terms are not analysed, hence lower()
+    tokens = _LUCENE_TOKEN.findall(term.lower())
+    if not tokens:
+        return None
+    query = " AND ".join(f"({token}^2 OR {token}*)" for token in tokens)
+    return f"{property_key}:({query})" if property_key else query
+
+
 def search_nodes(
     *,
     label: Optional[str] = None,
@@ -27,16 +261,134 @@ def search_nodes(
     property_key: Optional[str] = None,
     limit: int = 100,
 ) -> List[Dict[str, Any]]:
-    node_pattern = "n"
-    if label:
-        node_pattern = f"n:`{label}`"
+    return list(islice(iter_search_nodes(
+        label=label,
+        relationship_type=relationship_type,
+        term=term,
+        property_key=property_key,
+        page_size=limit,
+    ), limit))
+
+
+def iter_search_nodes(
+    *,
+    label: Optional[str] = None,
+    relationship_type: Optional[str] = None,
+    term: Optional[str] = None,
+    property_key: Optional[str] = None,
+    page_size: int = STREAM_FETCH_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """Yield every matching node, in the order ``search_nodes_page`` pages through them.
+
+    Pages are streamed through ``stream_cypher`` and not cached, so only the
+    driver's fetch buffer is held at a time, and a caller that stops early
+    fetches nothing further.
+    """
+    after = None
+    while True:
+        query, params, _ = _search_page_query(label, relationship_type, term, property_key, page_size, after)
+        # No look-ahead row: a short page is the last one
+        params["limit"] = page_size
+        count = 0
+        with closing(stream_cypher(query, params, fetch_size=page_size)) as rows:
+            for row in rows:
+                count += 1
+                after = _cursor(row)
+                if row.get("n"):
+                    yield row["n"]
+        if count < page_size:
+            return
+
+
+def search_nodes_page(
+    *,
+    label: Optional[str] = None,
+    relationship_type: Optional[str] = None,
+    term: Optional[str] = None,
+    property_key: Optional[str] = None,
+    page_size: int = 100,
+    after: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """One page of matching nodes plus the cursor for the next (``None`` on the last page).
 
-    match_clause = f"MATCH ({node_pattern})"
+    The page is fetched whole and cached, so ``page_size`` bounds what is held
+    in memory; use ``iter_search_nodes`` to stream results instead.
+
+    Pages are keyed on the indexed ``id`` (after the relevance score for
+    full-text searches) rather than skipped over, so a deep page costs the
+    same as the first. Full-text searches are bounded by hit count: only the
+    ``FULLTEXT_MAX_HITS`` most relevant hits are fetched and sorted, and
+    filters apply to those. Without a label, nodes are browsed through the
+    ``Node`` base label.
+    """
+    query, params, tags = _search_page_query(label, relationship_type, term, property_key, page_size, after)
+    rows = cached_cypher(query, params, tags=tags)
+
+    # One extra row was fetched to tell whether another page follows
+    page = rows[:page_size]
+    return {
+        "nodes": [row["n"] for row in page if row.get("n")],
+        "next": _cursor(page[-1]) if len(rows) > page_size and page else None,
+    }
+
+
+def search_nodes_frame(
+    *,
+    label: Optional[str] = None,
+    relationship_type: Optional[str] = None,
+    term: Optional[str] = None,
+    property_key: Optional[str] = None,
+    page_size: int = 100,
+    after: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """``search_nodes_page`` as a display-ready DataFrame (``frame``) plus the next cursor."""
+    query, params, tags = _search_page_query(label, relationship_type, term, property_key, page_size, after)
+    frame = cached_frame(query, params, node_columns=("n",), tags=tags)
+
+    page = frame.iloc[:page_size]
+    next_cursor = None
+    if len(frame) > page_size and len(page):
+        next_cursor = _cursor({key: _python(page[key].iloc[-1]) for key in ("key", "score") if key in page})
+    page = page.drop(columns=["key", "score"], errors="ignore")
+
+    preferred = [col for col in ["labels", "name", "title", "id", "element_id"] if col in page.columns]
+    remainder = [col for col in page.columns if col not in preferred]
+    return {"frame": page[preferred + remainder], "next": next_cursor}
+
+
+def _search_page_query(
+    label: Optional[str],
+    relationship_type: Optional[str],
+    term: Optional[str],
+    property_key: Optional[str],
+    page_size: int,
+    after: Optional[Dict[str, Any]],
+) -> Tuple[str, Dict[str, Any], Tuple[str, ...]]:
+    tags = (NODES, RELATIONSHIPS) if relationship_type else (NODES,)
+    where_clauses = ["n.id IS NOT NULL"]
+    params: Dict[str, Any] = {"limit": page_size + 1}
     if relationship_type:
-        match_clause += f"-[:`{relationship_type}`]-()"
+        where_clauses.append(f"EXISTS {{ (n)-[:`{relationship_type}`]-() }}")
 
-    where_clauses = []
-    params: Dict[str, Any] = {"limit": limit}
+    if term:
+        index = _usable_search_index(label, property_key)
+        query = fulltext_query(term, property_key) if index else None
+        if query:
+            params.update({"index": index, "query": query, "hits": FULLTEXT_MAX_HITS})
+            if after is not None:
+                params["after_score"] = after["score"]
+                params["after_id"] = after["id"]
+                where_clauses.append("(score < $after_score OR (score = $after_score AND n.id > $after_id))")
+            query_parts = [
+                "CALL db.index.fulltext.queryNodes($index, $query, {limit: $hits}) YIELD node AS n, score",
+                "WHERE " + " AND ".join(where_clauses),
+                "RETURN n, n.id AS key, score ORDER BY score DESC, n.id LIMIT $limit",
+            ]
+            return "\n".join(query_parts), params, tags
+
+    if after is not None:
+        params["after_id"] = after["id"]
+        where_clauses.append("n.id > $after_id")
 
     if term:
         params["term"] = term
@@ -50,13 +402,24 @@ def search_nodes(
                 "any(k IN keys(n) WHERE toLower(toString(n[k])) CONTAINS toLower($term))"
             )
 
-    query_parts = [match_clause]
-    if where_clauses:
-        query_parts.append("WHERE " + " AND ".join(where_clauses))
-    query_parts.append("RETURN n LIMIT $limit")
+    query_parts = [
+        f"MATCH (n:`{label or BASE_LABEL}`)",
+        "WHERE " + " AND ".join(where_clauses),
+        "RETURN n, n.id AS key ORDER BY n.id LIMIT $limit",
+    ]
+    return "\n".join(query_parts), params, tags
+
+
+def _cursor(row: Dict[str, Any]) -> Dict[str, Any]:
+    cursor = {"id": row["key"]}
+    if "score" in row:
+        cursor["score"] = row["score"]
+    return cursor
+
 
-    rows = run_cypher("\n".join(query_parts), params)
-    return [row.get("n") for row in rows if row.get("n")]
+def _python(value: Any) -> Any:
+    # numpy scalars from a DataFrame are not accepted as query parameters
+    return value.item() if hasattr(value, "item") else value
 
 
 def flatten_node_for_display(node: Dict[str, Any]) -> Dict[str, Any]:
@@ -1,8 +1,12 @@
+from collections import OrderedDict
 from functools import lru_cache
 import json
 import os
-from typing import Any, Dict, List, Mapping, Optional
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
 
+import pandas as pd
 from neo4j import GraphDatabase
 from neo4j.graph import Node, Relationship, Path
 
@@ -15,9 +19,239 @@ def get_driver():
     return GraphDatabase.driver(uri, auth=(user, pwd))
 
 
+# Read results are shared by every session of the app process. Entries
+# expire after their TTL and are dropped early when a write touches one of
+# their tags; the least recently used go first once the cache is full.
+QUERY_CACHE_TTL = float(os.getenv("QUERY_CACHE_TTL", "60"))
+SCHEMA_CACHE_TTL = float(os.getenv("SCHEMA_CACHE_TTL", "300"))
+QUERY_CACHE_MAX_ENTRIES = int(os.getenv("QUERY_CACHE_MAX_ENTRIES", "512"))
+QUERY_CACHE_MAX_ROWS = 10_000  # larger results are not worth the memory
+
+# Cache tags: what a read depends on, and what a write changes
+NODES = "nodes"
+RELATIONSHIPS = "relationships"
+LABELS = "labels"
+RELATIONSHIP_TYPES = "relationship_types"
+ALL_TAGS = (NODES, RELATIONSHIPS, LABELS, RELATIONSHIP_TYPES)
+
+# Holds the statistics snapshot written by imports (scripts/utils/graph_stats.py); not graph data
+STATS_LABEL = "GraphStats"
+
+
+class QueryCache:
+    def __init__(self, max_entries: int = QUERY_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, frozenset, List[Dict[str, Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str]) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key: Tuple[str, str], rows: List[Dict[str, Any]], ttl: float, tags: Iterable[str]):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, frozenset(tags), rows)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, tags: Iterable[str] = ALL_TAGS) -> int:
+        tags = frozenset(tags)
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry[1] & tags]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+query_cache = QueryCache()
+
+
+def _cache_key(query: str, params: Optional[Dict[str, Any]]) -> Tuple[str, str]:
+    return " ".join(query.split()), json.dumps(params or {}, sort_keys=True, default=str)
+
+
+STREAM_FETCH_SIZE = 500
+
+
+def stream_cypher(
+    query: str,
+    params: Optional[Dict[str, Any]] = None,
+    fetch_size: int = STREAM_FETCH_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """Yield serialised records as the server sends them, ``fetch_size`` at a time.
+
+    The session stays open until the generator is exhausted or closed, so a
+    caller can stop early without the rest of the result being pulled.
+    """
+    with get_driver().session(fetch_size=fetch_size) as session:
+        for record in session.run(query, params or {}):
+            yield _serialise_record(record)
+
+
 def run_cypher(query: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-    with get_driver().session() as session:
-        return [_serialise_record(record) for record in session.run(query, params or {})]
+    return list(stream_cypher(query, params))
+
+
+def cached_cypher(
+    query: str,
+    params: Optional[Dict[str, Any]] = None,
+    *,
+    ttl: float = QUERY_CACHE_TTL,
+    tags: Iterable[str] = ALL_TAGS,
+) -> List[Dict[str, Any]]:
+    """Run a read query, reusing a result cached under the same query and params.
+
+    ``tags`` name what the result depends on, so writes can invalidate it.
+    The returned list is shared with other callers; copy rows before changing them.
+    """
+    key = _cache_key(query, params)
+    rows = query_cache.get(key)
+    if rows is None:
+        rows = run_cypher(query, params)
+        if len(rows) <= QUERY_CACHE_MAX_ROWS:
+            query_cache.put(key, rows, ttl, tags)
+    return list(rows)
+
+
+def write_cypher(
+    query: str,
+    params: Optional[Dict[str, Any]] = None,
+    *,
+    invalidates: Iterable[str] = ALL_TAGS,
+) -> List[Dict[str, Any]]:
+    """Run a write query in a write transaction and drop cached reads it may affect."""
+    def work(tx):
+        return [_serialise_record(record) for record in tx.run(query, params or {})]
+
+    try:
+        with get_driver().session() as session:
+            return session.execute_write(work)
+    finally:
+        query_cache.invalidate(invalidates)
+
+
+def write_statements(
+    statements: Sequence[Tuple[str, Dict[str, Any]]],
+    *,
+    invalidates: Iterable[str] = ALL_TAGS,
+) -> List[List[Dict[str, Any]]]:
+    """Run several write queries in one write transaction; all of them apply or none do.
+
+    Returns the records of each statement, in order.
+    """
+    def work(tx):
+        return [[_serialise_record(record) for record in tx.run(query, params)] for query, params in statements]
+
+    try:
+        with get_driver().session() as session:
+            return session.execute_write(work)
+    finally:
+        query_cache.invalidate(invalidates)
+
+
+def frame_cypher(
+    query: str,
+    params: Optional[Dict[str, Any]] = None,
+    *,
+    node_columns: Sequence[str] = (),
+) -> pd.DataFrame:
+    """Run a read query straight into a DataFrame, one typed column per result key.
+
+    Records stay tuples until pandas builds the columns; there is no per-record
+    dict and no recursive serialisation. Each column in ``node_columns`` holds
+    nodes and is expanded into ``labels``, ``element_id`` and one column per
+    property. Values pandas cannot display natively (lists, maps, temporal
+    types) are converted only in the columns that contain them.
+    """
+    with get_driver().session(fetch_size=STREAM_FETCH_SIZE) as session:
+        result = session.run(query, params or {})
+        keys = list(result.keys())
+        rows = [tuple(record) for record in result]
+
+    frame = pd.DataFrame.from_records(rows, columns=keys)
+    parts = []
+    for key in keys:
+        if key in node_columns:
+            parts.append(_node_frame(frame[key].tolist()))
+        else:
+            parts.append(_display_column(frame[key]).to_frame(key))
+    return pd.concat(parts, axis=1) if parts else frame
+
+
+def cached_frame(
+    query: str,
+    params: Optional[Dict[str, Any]] = None,
+    *,
+    node_columns: Sequence[str] = (),
+    ttl: float = QUERY_CACHE_TTL,
+    tags: Iterable[str] = ALL_TAGS,
+) -> pd.DataFrame:
+    """``frame_cypher`` through the query cache; treat the frame as read-only."""
+    key = ("frame:" + ",".join(node_columns),) + _cache_key(query, params)
+    frame = query_cache.get(key)
+    if frame is None:
+        frame = frame_cypher(query, params, node_columns=node_columns)
+        if len(frame) <= QUERY_CACHE_MAX_ROWS:
+            query_cache.put(key, frame, ttl, tags)
+    return frame
+
+
+_DISPLAY_TYPES = (str, int, float, bool, type(None))
+
+
+def _display_column(column: pd.Series) -> pd.Series:
+    if column.dtype != object:
+        return column
+    if all(isinstance(value, _DISPLAY_TYPES) for value in column.tolist()):
+        return column
+    return column.map(_display_value)
+
+
+def _display_value(value: Any) -> Any:
+    if isinstance(value, _DISPLAY_TYPES):
+        return value
+    if isinstance(value, (Node, Relationship, Path, Mapping)):
+        return json.dumps(_serialise_value(value), ensure_ascii=False, default=str)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return ", ".join(str(_display_value(v)) for v in value)
+    return str(value)
+
+
+def _node_frame(nodes: List[Any]) -> pd.DataFrame:
+    """Expand a column of nodes into ``labels``, one column per property and ``element_id``.
+
+    Each column is read straight off the nodes, so no per-node dict is built.
+    """
+    present = [node for node in nodes if node is not None]
+    keys = dict.fromkeys(key for node in present for key in node.keys())
+    # Like flatten_node_for_display, the node's own labels and element id win
+    keys.pop("labels", None)
+    keys.pop("element_id", None)
+
+    columns = {"labels": [":".join(sorted(node.labels)) if node is not None else None for node in nodes]}
+    for key in keys:
+        columns[key] = _display_column(pd.Series([node.get(key) if node is not None else None for node in nodes]))
+    columns["element_id"] = [node.element_id if node is not None else None for node in nodes]
+    return pd.DataFrame(columns, index=range(len(nodes)))
 
 
 def _serialise_record(record: Mapping[str, Any]) -> Dict[str, Any]:
@@ -58,10 +292,11 @@ def _serialise_value(value: Any) -> Any:
 
 
 def get_labels() -> List[str]:
-    recs = run_cypher("CALL db.labels()")
-    return sorted(r.get("label") or r.get("labels") or list(r.values())[0] for r in recs)
+    recs = cached_cypher("CALL db.labels()", ttl=SCHEMA_CACHE_TTL, tags=(LABELS,))
+    labels = (r.get("label") or r.get("labels") or list(r.values())[0] for r in recs)
+    return sorted(label for label in labels if label != STATS_LABEL)
 
 
 def get_relationship_types() -> List[str]:
-    recs = run_cypher("CALL db.relationshipTypes()")
+    recs = cached_cypher("CALL db.relationshipTypes()", ttl=SCHEMA_CACHE_TTL, tags=(RELATIONSHIP_TYPES,))
     return sorted(r.get("relationshipType") or list(r.values())[0] for r in recs)
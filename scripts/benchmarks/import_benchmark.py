@@ -0,0 +1,482 @@
+"""Benchmark Neo4jImporter throughput on synthetic sweeps.
+
+Generates structure-and-concept sweep JSON at fixed scales, with the label and
+relationship-type mix of the quickstart demo's ``parse_corpus`` output plus
+concept and claim layers, then imports each file through
+``Neo4jImporter.import_file``, the same path as the import script: streaming
+parse, batched writes, search-index upkeep and the statistics refresh.
+Throughput is computed from the rows the database reported written, not
+from the nominal scale.
+
+By default the importer talks to a recording stand-in driver that answers
+every batch immediately and counts round trips, so runs measure the
+client-side import path (parsing, batching, partitioning) without a
+database. ``--latency-ms`` adds a fixed delay per round trip to model the
+network, and ``--live`` also runs each scale against the Neo4j instance
+configured in ``.env`` (this WRITES to that database). ``--delta`` adds
+runs that re-import each file against a manifest seeded by a first import,
+measuring the content-hash path that skips unchanged rows.
+
+Each scenario runs in a fresh process so peak RSS is per scenario. Results
+are printed as a table and saved as JSON for comparison between commits.
+
+Usage:
+    uv run python scripts/benchmarks/import_benchmark.py
+    uv run python scripts/benchmarks/import_benchmark.py --scales 10k,100k --workers 1,4
+    uv run python scripts/benchmarks/import_benchmark.py --scales 10k --live
+    uv run python scripts/benchmarks/import_benchmark.py --scales 100k --delta
+"""
+
+import argparse
+import json
+import multiprocessing
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+# Ensure repository root is on sys.path when executed directly
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from rich.console import Console
+from rich.table import Table
+
+from scripts.utils import get_timestamp, setup_logger
+
+LOGGER = setup_logger("benchmark", log_file="output/logs/import_benchmark.log")
+DATA_DIR = Path("output/benchmarks/data")
+RESULTS_DIR = Path("output/benchmarks")
+SWEEP_ID = "sweep_benchmark_synthetic"
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+# Share of elements that are nodes; the rest are relationships
+NODE_SHARE = 0.4
+ENRICHMENT_SHARE = 0.05
+
+
+# ---------------------------------------------------------------------------
+# Synthetic sweep generation
+# ---------------------------------------------------------------------------
+
+def _node(label: str, node_id: str, **properties) -> dict:
+    return {"labels": [label], "properties": {"id": node_id, "sweep_id": SWEEP_ID, **properties}}
+
+
+def _rel(source_id: str, target_id: str, rel_type: str) -> dict:
+    return {
+        "source_id": source_id,
+        "target_id": target_id,
+        "type": rel_type,
+        "properties": {"sweep_id": SWEEP_ID},
+    }
+
+
+def generate_sweep(elements: int, path: Path, seed: int = 7) -> Path:
+    """
+    Write a synthetic sweep of roughly ``elements`` nodes plus relationships.
+
+    The layout mirrors a real run: one Document containing Chapters
+    containing Sections, Sections that MENTION Concepts, Claims that are
+    SUPPORTED_BY Concepts, and Concepts that RELATE_TO each other. Concept
+    popularity is skewed so a few hub concepts attract many edges, which is
+    where lock contention shows up. Elements are written one at a time, so
+    generating the 1M scale needs no more memory than the 10k one.
+    """
+    rng = random.Random(seed)
+    n_nodes = max(10, int(elements * NODE_SHARE))
+    n_rels = elements - n_nodes
+    n_chapters = max(1, n_nodes // 2000)
+    n_sections = max(n_chapters, n_nodes // 50)
+    remaining = n_nodes - 1 - n_chapters - n_sections
+    n_concepts = max(1, remaining * 2 // 3)
+    n_claims = max(1, remaining - n_concepts)
+
+    document_id = "document:synthetic"
+    chapter_ids = [f"chapter:{i:05d}" for i in range(n_chapters)]
+    section_ids = [f"section:{i:07d}" for i in range(n_sections)]
+    concept_ids = [f"concept:{i:07d}" for i in range(n_concepts)]
+    claim_ids = [f"claim:{i:07d}" for i in range(n_claims)]
+
+    def popular_concept() -> str:
+        # Pareto-skewed index: low indices are hubs
+        index = int(rng.paretovariate(1.2)) - 1
+        return concept_ids[index % n_concepts]
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as handle:
+        def write_array(key: str, items, first: bool = False):
+            handle.write(("" if first else ",\n") + json.dumps(key) + ": [\n")
+            for index, item in enumerate(items):
+                if index:
+                    handle.write(",\n")
+                handle.write(json.dumps(item))
+            handle.write("\n]")
+
+        def nodes():
+            yield _node("Document", document_id, name="Synthetic Corpus", title="Synthetic Benchmark Corpus")
+            for i, chapter_id in enumerate(chapter_ids):
+                yield _node("Chapter", chapter_id, name=f"Chapter {i + 1}", order=str(i + 1))
+            for i, section_id in enumerate(section_ids):
+                yield _node(
+                    "Section", section_id,
+                    name=f"Section {i + 1}",
+                    chapter_id=chapter_ids[i % n_chapters],
+                    summary="Synthetic section summary " * rng.randint(1, 8),
+                )
+            for i, concept_id in enumerate(concept_ids):
+                yield _node("Concept", concept_id, name=f"Concept {i}", tier=rng.choice(["core", "supporting"]))
+            for i, claim_id in enumerate(claim_ids):
+                yield _node("Claim", claim_id, name=f"Claim {i}", confidence=rng.choice(["high", "medium", "low"]))
+
+        def relationships():
+            written = 0
+            for chapter_id in chapter_ids:
+                yield _rel(document_id, chapter_id, "CONTAINS")
+                written += 1
+            for i, section_id in enumerate(section_ids):
+                yield _rel(chapter_ids[i % n_chapters], section_id, "CONTAINS")
+                written += 1
+            while written < n_rels:
+                roll = rng.random()
+                if roll < 0.45:
+                    yield _rel(rng.choice(section_ids), popular_concept(), "MENTIONS")
+                elif roll < 0.75:
+                    yield _rel(rng.choice(claim_ids), popular_concept(), "SUPPORTED_BY")
+                else:
+                    yield _rel(popular_concept(), rng.choice(concept_ids), "RELATES_TO")
+                written += 1
+
+        def enrichments():
+            for concept_id in rng.sample(concept_ids, int(n_concepts * ENRICHMENT_SHARE)):
+                yield {
+                    "target_id": concept_id,
+                    "label": "Concept",
+                    "properties": {"definition": "Synthetic definition", "enriched_by": SWEEP_ID},
+                }
+
+        handle.write("{\n" + json.dumps("sweep_id") + ": " + json.dumps(SWEEP_ID))
+        write_array("nodes", nodes())
+        write_array("relationships", relationships())
+        write_array("enrichments", enrichments())
+        handle.write("\n}\n")
+
+    LOGGER.info("Generated %s (%d nodes, %d relationships)", path, n_nodes, n_rels)
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Recording stand-in driver
+# ---------------------------------------------------------------------------
+
+class _RecordingRecord(list):
+    # Positional access gives the batch count and keys; named fields (the
+    # statistics snapshot, for instance) read as missing
+    def __getitem__(self, key):
+        return super().__getitem__(key) if isinstance(key, int) else None
+
+
+class _RecordingResult:
+    def __init__(self, count: int, keys: List[str]):
+        self._count = count
+        self._keys = keys
+
+    def single(self):
+        return _RecordingRecord([self._count, self._keys])
+
+    def consume(self):
+        return None
+
+    def __iter__(self):
+        # Schema and count-store queries see an empty database
+        return iter(())
+
+
+class _RecordingTx:
+    def __init__(self, driver: "RecordingDriver"):
+        self._driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return None
+
+    def commit(self):
+        return None
+
+    def rollback(self):
+        return None
+
+    def run(self, query, parameters=None, **kwargs):
+        rows = kwargs.get("rows") or (parameters or {}).get("rows") or []
+        self._driver.record(len(rows))
+        # Every endpoint and enrichment target "exists", so every manifest key is confirmed
+        return _RecordingResult(len(rows), [row["key"] for row in rows if "key" in row])
+
+
+class _RecordingSession:
+    def __init__(self, driver: "RecordingDriver"):
+        self._driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        return None
+
+    def begin_transaction(self, **kwargs):
+        return _RecordingTx(self._driver)
+
+    def execute_write(self, work, *args, **kwargs):
+        return work(_RecordingTx(self._driver), *args, **kwargs)
+
+    execute_read = execute_write
+
+    def run(self, query, parameters=None, **kwargs):
+        return _RecordingTx(self._driver).run(query, parameters, **kwargs)
+
+
+class RecordingDriver:
+    """
+    Stand-in for ``neo4j.Driver`` that records traffic instead of sending it.
+
+    Every statement counts as one round trip; ``latency`` seconds are slept
+    per round trip to model network and server time.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.round_trips = 0
+        self.rows = 0
+        self._lock = threading.Lock()
+
+    def record(self, rows: int):
+        with self._lock:
+            self.round_trips += 1
+            self.rows += rows
+        if self.latency:
+            time.sleep(self.latency)
+
+    def session(self, **kwargs):
+        return _RecordingSession(self)
+
+    def close(self):
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Scenario execution
+# ---------------------------------------------------------------------------
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _timed(phases: Dict[str, float], name: str, method):
+    """Wrap an importer method so its time adds to ``phases[name]``."""
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            phases[name] = phases.get(name, 0.0) + time.perf_counter() - started
+    return wrapper
+
+
+def run_scenario(scenario: Dict) -> Dict:
+    """Import one synthetic file and return its metrics (runs in a child process)."""
+    from scripts.import_to_neo4j import Neo4jImporter
+    from scripts.utils.import_manifest import ImportManifest
+    from scripts.utils.json_stream import iter_json_array
+
+    path = scenario["path"]
+    recorder = None
+    if scenario["target"] == "fake":
+        recorder = RecordingDriver(latency=scenario["latency_ms"] / 1000)
+        importer = Neo4jImporter(batch_size=scenario["batch_size"], workers=scenario["workers"], driver=recorder)
+    else:
+        importer = Neo4jImporter(batch_size=scenario["batch_size"], workers=scenario["workers"])
+
+    phases = {}
+    written = Counter()
+    manifest = None
+    scratch = tempfile.TemporaryDirectory(prefix="import_benchmark_")
+    try:
+        started = time.perf_counter()
+        for key in ("nodes", "relationships", "enrichments"):
+            sum(1 for _ in iter_json_array(path, key))
+        phases["parse"] = time.perf_counter() - started
+
+        if scenario["delta"]:
+            manifest = ImportManifest(str(Path(scratch.name) / "manifest.sqlite"), scope=f"benchmark|{path}")
+            started = time.perf_counter()
+            importer.import_file(path, manifest=manifest, stats=False)
+            phases["seed"] = time.perf_counter() - started
+            manifest.stats.clear()
+            if recorder:
+                recorder.round_trips = recorder.rows = 0
+
+        # import_file calls these through the instance, so the wrappers see
+        # every phase and the counts the database reported
+        importer.import_nodes = _timed(phases, "nodes", importer.import_nodes)
+        importer.import_relationships = _timed(phases, "relationships", importer.import_relationships)
+        importer.import_enrichments = _timed(phases, "enrichments", importer.import_enrichments)
+        importer.refresh_search_indexes = _timed(phases, "stats", importer.refresh_search_indexes)
+        importer.refresh_stats = _timed(phases, "stats", importer.refresh_stats)
+
+        def counted(name, method):
+            def wrapper(*args, **kwargs):
+                result = method(*args, **kwargs)
+                written[name] += result["matched"] if isinstance(result, dict) else result
+                return result
+            return wrapper
+
+        for name in ("nodes", "relationships", "enrichments"):
+            attribute = f"import_{name}"
+            setattr(importer, attribute, counted(name, getattr(importer, attribute)))
+
+        started = time.perf_counter()
+        importer.import_file(path, manifest=manifest)
+        import_seconds = time.perf_counter() - started
+    finally:
+        importer.close()
+        if manifest is not None:
+            manifest.close()
+        scratch.cleanup()
+
+    total = sum(written.values())
+    return {
+        **{key: scenario[key] for key in ("scale", "target", "batch_size", "workers", "latency_ms", "elements", "delta")},
+        "written": dict(written),
+        "elements_per_sec": total / import_seconds if import_seconds else None,
+        "import_seconds": round(import_seconds, 3),
+        "round_trips": recorder.round_trips if recorder else None,
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "phases": {name: round(seconds, 3) for name, seconds in phases.items()},
+        "retries": dict(importer.retry_stats),
+        "delta_summary": dict(manifest.stats) if manifest is not None else None,
+    }
+
+
+def live_database_available() -> bool:
+    """Return True if the configured Neo4j instance answers."""
+    try:
+        from scripts.import_to_neo4j import NEO4J_PASSWORD, NEO4J_URI, NEO4J_USER
+        from neo4j import GraphDatabase
+
+        if not NEO4J_URI:
+            return False
+        with GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD)) as driver:
+            driver.verify_connectivity()
+        return True
+    except Exception as exc:  # pragma: no cover - connection issues vary
+        LOGGER.warning("Live Neo4j unavailable: %s", exc)
+        return False
+
+
+def print_results(results: List[Dict]):
+    table = Table(title="Importer benchmark")
+    for column in ("scale", "target", "mode", "workers", "batch", "written", "written/s", "round trips",
+                   "peak RSS MB", "parse s", "nodes s", "rels s", "enrich s", "stats s"):
+        table.add_column(column, justify="right")
+    for result in results:
+        phases = result["phases"]
+        table.add_row(
+            result["scale"],
+            result["target"],
+            "delta" if result["delta"] else "full",
+            str(result["workers"]),
+            str(result["batch_size"]),
+            f"{sum(result['written'].values()):,}",
+            f"{result['elements_per_sec']:,.0f}" if result["elements_per_sec"] else "-",
+            f"{result['round_trips']:,}" if result["round_trips"] is not None else "-",
+            f"{result['peak_rss_mb']:.1f}",
+            f"{phases['parse']:.2f}",
+            f"{phases['nodes']:.2f}",
+            f"{phases['relationships']:.2f}",
+            f"{phases['enrichments']:.2f}",
+            f"{phases.get('stats', 0.0):.2f}",
+        )
+    Console().print(table)
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Neo4jImporter on synthetic sweeps")
+    parser.add_argument("--scales", default="10k,100k,1m", help="Comma-separated scales from: " + ", ".join(SCALES))
+    parser.add_argument("--batch-sizes", type=_int_list, default=[1000], help="Comma-separated batch sizes")
+    parser.add_argument("--workers", type=_int_list, default=[1], help="Comma-separated worker counts")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated latency per round trip")
+    parser.add_argument("--live", action="store_true", help="Also import into the configured Neo4j (writes data)")
+    parser.add_argument(
+        "--delta", action="store_true", help="Also time re-imports against a manifest seeded by a first import"
+    )
+    args = parser.parse_args()
+
+    scales = [scale.strip().lower() for scale in args.scales.split(",") if scale.strip()]
+    unknown = [scale for scale in scales if scale not in SCALES]
+    if unknown:
+        parser.error(f"Unknown scales: {', '.join(unknown)}")
+
+    targets = ["fake"]
+    if args.live and live_database_available():
+        targets.append("live")
+
+    scenarios = []
+    for scale in scales:
+        path = DATA_DIR / f"synthetic_{scale}.json"
+        if not path.exists():
+            generate_sweep(SCALES[scale], path)
+        for target in targets:
+            for batch_size in args.batch_sizes:
+                for workers in args.workers:
+                    for delta in ([False, True] if args.delta else [False]):
+                        scenarios.append({
+                            "scale": scale,
+                            "elements": SCALES[scale],
+                            "path": str(path),
+                            "target": target,
+                            "batch_size": batch_size,
+                            "workers": workers,
+                            "latency_ms": args.latency_ms if target == "fake" else 0.0,
+                            "delta": delta,
+                        })
+
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for scenario in scenarios:
+        LOGGER.info(
+            "Running %s on %s (batch %d, %d workers%s)",
+            scenario["scale"], scenario["target"], scenario["batch_size"], scenario["workers"],
+            ", delta" if scenario["delta"] else ""
+        )
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            results.append(pool.submit(run_scenario, scenario).result())
+
+    print_results(results)
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    results_path = RESULTS_DIR / f"import_benchmark_{get_timestamp()}.json"
+    results_path.write_text(json.dumps(results, indent=2))
+    LOGGER.info("Saved results to %s", results_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""
+Export sweep JSON to neo4j-admin bulk import CSV files.
+
+Transactional ``MERGE`` through ``import_to_neo4j.py`` is the right tool for
+adding sweeps to a live graph, but a first load of a fresh database is far
+faster through the offline ``neo4j-admin database import`` tool. This script
+turns one or more sweep files into the CSV layout that tool expects:
+
+- ``nodes_<Labels>.csv`` per label set, with ``id:ID`` and ``:LABEL`` columns
+- ``rels_<TYPE>.csv`` per relationship type, with ``:START_ID``, ``:END_ID``
+  and ``:TYPE`` columns
+
+Property columns carry typed headers (``order:long``, ``tags:string[]``),
+inferred across every row. Nodes are deduplicated by ``id`` and
+relationships by ``(source_id, type, target_id)`` in a single streaming pass;
+the first occurrence wins. Every node also gets the shared ``Node`` base
+label, matching what the transactional importer writes.
+
+The admin tool has no way to update a node, so enrichments are merged into
+the rows of the nodes they target, later enrichments overriding earlier
+ones and the node's own properties as ``SET n += ...`` would. An enrichment
+whose target id (and label, if it names one) matches no exported node is
+skipped and counted, as the importer does. Enrichments are held in memory
+until the CSVs are written.
+
+Usage:
+    python scripts/export_admin_csv.py <output_dir> <json_file> [<json_file> ...]
+"""
+
+import re
+import csv
+import sys
+import json
+import shutil
+import argparse
+from pathlib import Path
+from scripts.utils import setup_logger
+from scripts.utils.ndjson import iter_sweep_items
+
+# Configure logging
+logger = setup_logger("export_csv", log_file="output/logs/export_admin_csv.log")
+
+# Must match BASE_LABEL in import_to_neo4j.py
+BASE_LABEL = "Node"
+ARRAY_DELIMITER = ";"
+
+# Python value type -> neo4j-admin header type
+_SCALAR_TYPES = {bool: "boolean", int: "long", float: "double", str: "string"}
+
+
+def _value_type(value):
+    """Return the neo4j-admin type for ``value``, or None if it has none."""
+    if value is None:
+        return None
+    if isinstance(value, list):
+        element_types = {_value_type(item) for item in value} - {None}
+        if len(element_types) == 1:
+            element_type = element_types.pop()
+            if not element_type.endswith("[]"):
+                return element_type + "[]"
+        return "string[]"
+    return _SCALAR_TYPES.get(type(value), "string")
+
+
+def _merge_types(current, new):
+    """Widen a column type so it can hold both ``current`` and ``new`` values."""
+    if current is None or current == new:
+        return new
+    if new is None:
+        return current
+    if {current, new} == {"long", "double"}:
+        return "double"
+    if {current, new} == {"long[]", "double[]"}:
+        return "double[]"
+    if current.endswith("[]") and new.endswith("[]"):
+        return "string[]"
+    return "string"
+
+
+def _format_value(value, column_type):
+    """Render ``value`` as a CSV cell for a column of ``column_type``."""
+    if value is None:
+        return ""
+    if column_type.endswith("[]"):
+        items = value if isinstance(value, list) else [value]
+        return ARRAY_DELIMITER.join(_format_value(item, column_type[:-2]) for item in items)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+def _file_slug(name):
+    """Make a label or type usable in a file name."""
+    return re.sub(r"[^A-Za-z0-9_-]+", "_", name).strip("_") or "untitled"
+
+
+class _CsvGroup:
+    """Rows for one output CSV, spooled to disk until the header is known."""
+
+    def __init__(self, spool_path, fixed_header):
+        self.spool_path = spool_path
+        self.fixed_header = fixed_header
+        self.column_types = {}
+        self.patches = {}
+        self.rows = 0
+        self._handle = open(spool_path, "w", encoding="utf-8")
+
+    def add(self, fixed_values, properties):
+        """Spool one row and widen column types for its properties."""
+        for key, value in properties.items():
+            self.column_types[key] = _merge_types(self.column_types.get(key), _value_type(value))
+        self._handle.write(json.dumps([fixed_values, properties], ensure_ascii=False))
+        self._handle.write("\n")
+        self.rows += 1
+
+    def patch(self, row_id, properties):
+        """Merge ``properties`` into the spooled row whose first value is ``row_id``."""
+        for key, value in properties.items():
+            self.column_types[key] = _merge_types(self.column_types.get(key), _value_type(value))
+        self.patches.setdefault(row_id, {}).update(properties)
+
+    def write(self, csv_path):
+        """Write the header and every spooled row to ``csv_path``."""
+        self._handle.close()
+        columns = [key for key in self.column_types if self.column_types[key] is not None]
+        header = self.fixed_header + [f"{key}:{self.column_types[key]}" for key in columns]
+
+        with open(csv_path, "w", encoding="utf-8", newline="") as out, \
+                open(self.spool_path, "r", encoding="utf-8") as spool:
+            writer = csv.writer(out)
+            writer.writerow(header)
+            for line in spool:
+                fixed_values, properties = json.loads(line)
+                if self.patches:
+                    properties.update(self.patches.get(fixed_values[0], {}))
+                writer.writerow(fixed_values + [
+                    _format_value(properties.get(key), self.column_types[key])
+                    for key in columns
+                ])
+        self.spool_path.unlink()
+
+
+class AdminCsvExporter:
+    """Build neo4j-admin import CSVs from sweep JSON files."""
+
+    def __init__(self, output_dir):
+        self.output_dir = Path(output_dir)
+        self.spool_dir = self.output_dir / ".spool"
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        self.node_groups = {}
+        self.rel_groups = {}
+        # Node id -> label set, which also names the node's CSV group
+        self.node_ids = {}
+        self.rel_keys = set()
+        # Target id -> [(label or None, properties)], in file order
+        self.enrichments = {}
+        self.duplicates = {"nodes": 0, "relationships": 0}
+        self.enrichment_stats = {"merged": 0, "unmatched": 0}
+
+    def _group(self, groups, key, prefix, fixed_header):
+        """Return the CSV group for ``key``, creating its spool file on first use."""
+        group = groups.get(key)
+        if group is None:
+            spool_path = self.spool_dir / f"{prefix}_{len(groups)}.jsonl"
+            group = groups[key] = _CsvGroup(spool_path, fixed_header)
+        return group
+
+    def add_node(self, node):
+        """Add a sweep node unless its id was already exported."""
+        properties = dict(node["properties"])
+        node_id = properties.pop("id")
+        if node_id in self.node_ids:
+            self.duplicates["nodes"] += 1
+            return
+        labels = tuple(sorted({BASE_LABEL, *(node.get("labels") or [])}))
+        self.node_ids[node_id] = labels
+        group = self._group(self.node_groups, labels, "nodes", ["id:ID", ":LABEL"])
+        group.add([str(node_id), ARRAY_DELIMITER.join(labels)], properties)
+
+    def add_relationship(self, rel):
+        """Add a sweep relationship unless an identical edge was already exported."""
+        key = (rel["source_id"], rel["type"], rel["target_id"])
+        if key in self.rel_keys:
+            self.duplicates["relationships"] += 1
+            return
+        self.rel_keys.add(key)
+
+        group = self._group(self.rel_groups, rel["type"], "rels", [":START_ID", ":END_ID", ":TYPE"])
+        group.add([str(rel["source_id"]), str(rel["target_id"]), rel["type"]], rel.get("properties") or {})
+
+    def add_enrichment(self, enrichment):
+        """Hold an enrichment until ``write`` merges it into its target's row."""
+        target_id = enrichment.get("target_id", enrichment.get("id"))
+        if target_id is None:
+            raise ValueError(f"Enrichment has no target_id: {enrichment!r}")
+        entry = (enrichment.get("label"), enrichment.get("properties") or {})
+        self.enrichments.setdefault(target_id, []).append(entry)
+
+    def add_file(self, json_file):
+        """Stream one sweep file into the export."""
+        logger.info("Reading %s", json_file)
+        for key, value in iter_sweep_items(json_file):
+            if key == "nodes":
+                self.add_node(value)
+            elif key == "relationships":
+                self.add_relationship(value)
+            elif key == "enrichments":
+                self.add_enrichment(value)
+
+    def _merge_enrichments(self):
+        """Merge held enrichments into the node groups of their targets."""
+        for target_id, entries in self.enrichments.items():
+            labels = self.node_ids.get(target_id)
+            for label, properties in entries:
+                if labels is None or (label and label not in labels):
+                    self.enrichment_stats["unmatched"] += 1
+                    continue
+                properties = {key: value for key, value in properties.items() if key != "id"}
+                self.node_groups[labels].patch(str(target_id), properties)
+                self.enrichment_stats["merged"] += 1
+        self.enrichments = {}
+
+    def _csv_path(self, prefix, name, used):
+        """Return an unused CSV path for ``name``."""
+        stem = f"{prefix}_{_file_slug(name)}"
+        candidate = stem
+        index = 1
+        while candidate in used:
+            index += 1
+            candidate = f"{stem}_{index}"
+        used.add(candidate)
+        return self.output_dir / f"{candidate}.csv"
+
+    def write(self):
+        """Write all CSV files and return ``(node_files, relationship_files)``."""
+        self._merge_enrichments()
+        if self.enrichment_stats["merged"]:
+            logger.info("Merged %d enrichments into node rows", self.enrichment_stats["merged"])
+        if self.enrichment_stats["unmatched"]:
+            logger.warning("%d enrichments skipped: target id not found", self.enrichment_stats["unmatched"])
+
+        used = set()
+        node_files = []
+        for labels, group in self.node_groups.items():
+            extra = [label for label in labels if label != BASE_LABEL] or [BASE_LABEL]
+            path = self._csv_path("nodes", "_".join(extra), used)
+            group.write(path)
+            node_files.append(path)
+            logger.info("Wrote %d nodes to %s", group.rows, path)
+
+        rel_files = []
+        for rel_type, group in self.rel_groups.items():
+            path = self._csv_path("rels", rel_type, used)
+            group.write(path)
+            rel_files.append(path)
+            logger.info("Wrote %d relationships to %s", group.rows, path)
+
+        shutil.rmtree(self.spool_dir, ignore_errors=True)
+
+        if any(self.duplicates.values()):
+            logger.info(
+                "Skipped duplicates: %d nodes, %d relationships",
+                self.duplicates["nodes"], self.duplicates["relationships"]
+            )
+        return node_files, rel_files
+
+
+def admin_import_command(node_files, rel_files, database="neo4j"):
+    """Return the neo4j-admin command line that loads the exported files."""
+    parts = ["neo4j-admin database import full", database]
+    parts += [f"--nodes={path}" for path in node_files]
+    parts += [f"--relationships={path}" for path in rel_files]
+    parts += [
+        f'--array-delimiter="{ARRAY_DELIMITER}"',
+        "--multiline-fields=true",
+        "--skip-bad-relationships"
+    ]
+    return " \\\n    ".join(parts)
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Export sweep JSON to neo4j-admin import CSV")
+    parser.add_argument("output_dir", help="Directory for the CSV files")
+    parser.add_argument("json_files", nargs="+", help="Sweep JSON or JSON Lines files, in precedence order")
+    parser.add_argument("--database", default="neo4j", help="Target database name for the printed command")
+    return parser.parse_args(argv)
+
+
+def main():
+    """Main execution."""
+    args = parse_args()
+
+    for json_file in args.json_files:
+        if not Path(json_file).exists():
+            logger.error("File not found: %s", json_file)
+            sys.exit(1)
+
+    exporter = AdminCsvExporter(args.output_dir)
+    for json_file in args.json_files:
+        exporter.add_file(json_file)
+    node_files, rel_files = exporter.write()
+
+    logger.info(
+        "Exported %d nodes and %d relationships",
+        len(exporter.node_ids), len(exporter.rel_keys)
+    )
+    print("\nLoad into a stopped, empty database with:\n")
+    print(admin_import_command(node_files, rel_files, args.database))
+
+
+if __name__ == "__main__":
+    main()
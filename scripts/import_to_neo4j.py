@@ -4,18 +4,87 @@ Import JSON data to Neo4j database.
 Supports multiple JSON formats:
 - Node/Relationship format ({"nodes": [...], "relationships": [...]})
 - Enrichment format ({"enrichments": [...]})
+- JSON Lines, one tagged element per line (see ``scripts/utils/ndjson.py``);
+  detected automatically
+
+An enrichment adds properties to a node that already exists:
+
+    {"target_id": "concept:climate_change", "label": "Concept",
+     "properties": {"definition": "..."}}
+
+``label`` is optional; without it the target is looked up by the base label.
+
+Nodes are written in batches: rows sharing a label set are sent together as
+one ``UNWIND $rows AS row MERGE ...`` statement inside a write
+transaction, so a sweep costs one round trip per batch instead of per node.
+
+Every imported node also carries the shared ``Node`` base label. Before
+loading, the importer creates a uniqueness constraint on ``id`` for the base
+label and for every label seen in the sweep, so nodes are merged and
+relationship endpoints are resolved through index lookups rather than scans.
+Nodes with an ``id`` but without the base label, left by older versions of
+the importer, are given it first.
+
+Files are parsed incrementally, so peak memory is bounded by the batch size
+rather than by the size of the sweep file.
+
+With ``--workers N`` batches are written concurrently, one session per worker
+thread. Relationship batches are partitioned into waves in which no two
+batches share an endpoint, so concurrent transactions do not contend for the
+same node locks; deadlocks and other transient errors are retried with
+jittered exponential backoff.
+
+After each import the graph statistics snapshot read by the Dashboard is
+refreshed (see ``scripts/utils/graph_stats.py``): counts come from the count
+store, and only labels this import wrote to or whose counts changed are
+re-profiled. Imports writing fewer than ``STATS_PROFILE_MIN_ROWS`` rows only
+refresh the counts and leave those labels pending for the next profiling
+refresh; ``--profile-stats`` profiles them now. ``--full-stats`` re-profiles
+every label; ``--no-stats`` skips the refresh. The Explorer's full-text
+indexes are also widened to cover the string properties the import wrote
+(see ``scripts/utils/search_indexes.py``).
+
+With ``--delta`` a local manifest of content hashes (see
+``scripts/utils/import_manifest.py``) is kept per database and sweep file, and
+re-imports send only new and changed rows; ``--delete-missing`` also removes
+rows that disappeared from the file since the last import.
 
 Usage:
     python scripts/import_to_neo4j.py <json_file>
+    python scripts/import_to_neo4j.py <json_file> --batch-size 5000
+    python scripts/import_to_neo4j.py <json_file> --workers 8
+    python scripts/import_to_neo4j.py <json_file> --delta --delete-missing
+    python scripts/import_to_neo4j.py <json_file> --full-stats
 """
 
 import os
 import sys
 import json
+import time
+import random
+import argparse
+import threading
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
 from dotenv import load_dotenv
 from neo4j import GraphDatabase
+from neo4j.exceptions import ClientError, ServiceUnavailable, SessionExpired, TransientError
 from scripts.utils import setup_logger
+from scripts.utils.graph_stats import STATS_LABEL, refresh_snapshot
+from scripts.utils.ndjson import iter_sweep_section
+from scripts.utils.search_indexes import ensure_search_indexes, string_properties
+from scripts.utils.import_manifest import (
+    DEFAULT_MANIFEST_PATH,
+    NODE,
+    RELATIONSHIP,
+    ImportManifest,
+    node_hash,
+    node_key,
+    relationship_hash,
+    relationship_key,
+)
 
 # Load environment
 load_dotenv()
@@ -28,12 +97,226 @@ NEO4J_URI = os.getenv("NEO4J_URI")
 NEO4J_USER = os.getenv("NEO4J_USER")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
 
+# Label shared by every imported node; its id constraint backs endpoint lookups
+BASE_LABEL = "Node"
+
+# Batching defaults
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_WORKERS = 1
+RETRY_BACKOFF_SECONDS = 0.5
+
+# Imports writing fewer rows refresh only the counts after the import; label
+# profiles scan every node of a label, which a small delta does not justify
+STATS_PROFILE_MIN_ROWS = 10_000
+
+# Errors worth retrying a batch for; anything else is a real failure
+RETRYABLE_ERRORS = (TransientError, ServiceUnavailable, SessionExpired)
+
+
+def quote_name(name):
+    """Backtick-quote a label or relationship type for use in Cypher."""
+    return "`" + str(name).replace("`", "``") + "`"
+
+
+def batched(iterable, size):
+    """Yield lists of at most ``size`` items from ``iterable``."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def group_batches(keyed_rows, size):
+    """
+    Group ``(key, row)`` pairs into batches of at most ``size`` rows per key.
+
+    A batch is yielded as soon as its key fills up, and partial batches are
+    flushed at the end, so memory is bounded by ``size`` times the number of
+    distinct keys rather than by the length of the input.
+    """
+    buffers = {}
+    for key, row in keyed_rows:
+        buffer = buffers.setdefault(key, [])
+        buffer.append(row)
+        if len(buffer) >= size:
+            yield key, buffer
+            buffers[key] = []
+    for key, buffer in buffers.items():
+        if buffer:
+            yield key, buffer
+
+
+def node_row(node):
+    """Convert a sweep node into an UNWIND row."""
+    properties = node["properties"]
+    return {"id": properties["id"], "props": properties}
+
+
+def relationship_row(rel):
+    """Convert a sweep relationship into an UNWIND row."""
+    return {
+        "source_id": rel["source_id"],
+        "target_id": rel["target_id"],
+        "props": rel.get("properties") or {}
+    }
+
+
+def partition_waves(keyed_rows, batch_size, slots):
+    """
+    Partition ``(rel_type, row)`` pairs into waves of endpoint-disjoint batches.
+
+    Each wave holds up to ``slots`` batches of at most ``batch_size`` rows, and
+    no node id appears in more than one batch of the same wave, so a wave can
+    be written concurrently without two transactions locking the same node.
+    Rows that would bridge two batches are deferred to a later wave.
+
+    Hub nodes pull most rows into one batch, so while the other batches
+    have room the wave keeps reading ahead for rows that fit them, until
+    ``slots * batch_size`` rows are deferred; at most three times that many
+    rows are held at a time. Batches of a wave that together fit within its
+    largest batch are then merged, which saves transactions without making
+    the wave take longer, and a remainder that fits one batch is written as
+    a single final wave.
+    """
+    iterator = iter(keyed_rows)
+    window = slots * batch_size
+    pending = deque()
+    exhausted = False
+
+    def pull():
+        nonlocal exhausted
+        item = next(iterator, None)
+        if item is None:
+            exhausted = True
+        return item
+
+    while True:
+        while not exhausted and len(pending) < window:
+            item = pull()
+            if item is not None:
+                pending.append(item)
+        if not pending:
+            return
+        if exhausted and len(pending) <= batch_size:
+            # One batch has nothing to conflict with
+            yield [list(pending)]
+            return
+
+        batches = [[] for _ in range(slots)]
+        owner = {}
+        deferred = deque()
+        full = 0
+
+        def place(item):
+            nonlocal full
+            row = item[1]
+            endpoints = (row["source_id"], row["target_id"])
+            owners = {owner[node_id] for node_id in endpoints if node_id in owner}
+            if len(owners) > 1:
+                return False
+            if owners:
+                slot = owners.pop()
+            else:
+                slot = min(range(slots), key=lambda index: len(batches[index]))
+            if len(batches[slot]) >= batch_size:
+                return False
+            batches[slot].append(item)
+            if len(batches[slot]) == batch_size:
+                full += 1
+            for node_id in endpoints:
+                owner[node_id] = slot
+            return True
+
+        for item in pending:
+            if not place(item):
+                deferred.append(item)
+        while not exhausted and len(deferred) < window and full < slots:
+            item = pull()
+            if item is not None and not place(item):
+                deferred.append(item)
+
+        pending = deferred
+        yield _pack_batches([batch for batch in batches if batch])
+
+
+def _pack_batches(batches):
+    """Merge endpoint-disjoint batches, first fit by size, up to the largest one's size."""
+    batches = sorted(batches, key=len, reverse=True)
+    capacity = len(batches[0])
+    packed = []
+    for batch in batches:
+        for target in packed:
+            if len(target) + len(batch) <= capacity:
+                target.extend(batch)
+                break
+        else:
+            packed.append(list(batch))
+    return packed
+
+
+def enrichment_row(enrichment):
+    """Convert a sweep enrichment into an UNWIND row."""
+    target_id = enrichment.get("target_id", enrichment.get("id"))
+    if target_id is None:
+        raise ValueError(f"Enrichment has no target_id: {enrichment!r}")
+    return {"id": target_id, "props": enrichment.get("properties") or {}}
+
+
+def _run_statements(tx, statements):
+    """
+    Run ``(query, rows)`` statements in one transaction.
+
+    Returns the summed counts (each statement's first column) and the
+    values of its optional second column, a list such as the keys reported
+    written (``collect(row.key)``).
+    """
+    count = 0
+    keys = []
+    for query, rows in statements:
+        record = tx.run(query, rows=rows).single()
+        count += record[0]
+        if len(record) > 1:
+            keys.extend(record[1])
+    return count, keys
+
+
+def _is_deadlock(exc):
+    """Return True if ``exc`` reports a deadlock between transactions."""
+    return "DeadlockDetected" in (getattr(exc, "code", None) or "")
+
 
 class Neo4jImporter:
     """Import data to Neo4j database."""
 
-    def __init__(self):
-        self.driver = GraphDatabase.driver(
+    def __init__(
+        self,
+        batch_size=DEFAULT_BATCH_SIZE,
+        max_retries=DEFAULT_MAX_RETRIES,
+        workers=DEFAULT_WORKERS,
+        driver=None
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.workers = workers
+        self.retry_stats = Counter()
+        self._constrained_labels = set()
+        # Labels whose properties were written, and rows written, since the last stats refresh
+        self.touched_labels = set()
+        self.rows_written = 0
+        # String properties written per label since the search indexes were last widened
+        self.written_properties = defaultdict(set)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._worker_sessions = []
+        # An injected driver (e.g. the benchmark's recording driver) skips the connection
+        self.driver = driver or GraphDatabase.driver(
             NEO4J_URI,
             auth=(NEO4J_USER, NEO4J_PASSWORD)
         )
@@ -42,93 +325,590 @@ class Neo4jImporter:
         """Close database connection."""
         self.driver.close()
 
-    def import_nodes(self, nodes):
-        """Import nodes to Neo4j."""
-        logger.info("Importing %d nodes...", len(nodes))
-
+    def _write_batch(self, session, statements):
+        """Write one batch in a write transaction, retrying transient errors.
+
+        The transaction is explicit rather than ``execute_write``, which has
+        its own retry loop; nested under this one the attempts would multiply
+        and ``max_retries`` would not mean what it says.
+        """
+        rows = sum(len(batch) for _, batch in statements)
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                with session.begin_transaction() as tx:
+                    result = _run_statements(tx, statements)
+                    tx.commit()
+                return result
+            except RETRYABLE_ERRORS as exc:
+                reason = "deadlock" if _is_deadlock(exc) else exc.__class__.__name__
+                with self._lock:
+                    self.retry_stats[reason] += 1
+                if attempt > self.max_retries:
+                    logger.error("Batch of %d rows failed after %d attempts", rows, attempt)
+                    raise
+                # Jitter keeps workers that collided from retrying in lockstep
+                delay = RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+                logger.warning(
+                    "Batch of %d rows failed (%s); retrying in %.1fs",
+                    rows, reason, delay
+                )
+                time.sleep(delay)
+
+    def _worker_session(self):
+        """Return the calling worker thread's session, opening it on first use."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self.driver.session()
+            self._local.session = session
+            with self._lock:
+                self._worker_sessions.append(session)
+        return session
+
+    def _write_in_worker(self, statements):
+        """Write one batch using the calling worker thread's session."""
+        return self._write_batch(self._worker_session(), statements)
+
+    def _run_waves(self, waves, on_written=None):
+        """
+        Write waves of batches and return the summed count.
+
+        Batches within a wave run concurrently on the worker pool; a wave
+        finishes before the next one starts. With a single worker everything
+        runs in order on one session. ``on_written`` is called on the calling
+        thread with the keys of each committed batch.
+        """
         count = 0
+        if self.workers == 1:
+            with self.driver.session() as session:
+                for wave in waves:
+                    for statements in wave:
+                        written, keys = self._write_batch(session, statements)
+                        count += written
+                        self.rows_written += written
+                        if on_written is not None and keys:
+                            on_written(keys)
+            return count
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="import") as pool:
+                for wave in waves:
+                    futures = [pool.submit(self._write_in_worker, statements) for statements in wave]
+                    for future in futures:
+                        written, keys = future.result()
+                        count += written
+                        self.rows_written += written
+                        if on_written is not None and keys:
+                            on_written(keys)
+        finally:
+            for session in self._worker_sessions:
+                session.close()
+            self._worker_sessions = []
+            self._local = threading.local()
+        return count
+
+    def ensure_constraints(self, labels):
+        """
+        Create uniqueness constraints on ``id`` for the base label and ``labels``.
+
+        The first call also upgrades a graph loaded before the base label was
+        introduced (see ``backfill_base_label``), since merging on the base
+        label would otherwise duplicate those nodes.
+        """
+        pending = sorted({BASE_LABEL, *labels} - self._constrained_labels)
+        if not pending:
+            return
+        if BASE_LABEL in pending:
+            self.backfill_base_label()
+
+        with self.driver.session() as session:
+            for label in pending:
+                query = (
+                    f"CREATE CONSTRAINT IF NOT EXISTS "
+                    f"FOR (n:{quote_name(label)}) REQUIRE n.id IS UNIQUE"
+                )
+                try:
+                    session.run(query).consume()
+                except ClientError as exc:
+                    # Usually existing duplicate ids; the import still works, just slower
+                    logger.warning("Could not create id constraint for :%s: %s", label, exc.message)
+                self._constrained_labels.add(label)
+
+        logger.info("Ensured id constraints for %d labels", len(pending))
+
+    def backfill_base_label(self) -> int:
+        """
+        Add the base label to nodes imported before it was introduced.
+
+        When every node but the statistics snapshot has the label, this costs
+        three count store reads.
+
+        Returns:
+            Number of nodes labelled
+        """
+        base = quote_name(BASE_LABEL)
         with self.driver.session() as session:
-            for node in nodes:
-                labels = ":".join(node.get("labels", ["Node"]))
-                node_id = node["properties"]["id"]
-                properties = node["properties"]
+            counts = session.run(f"""
+            CALL {{ MATCH (n) RETURN count(n) AS total }}
+            CALL {{ MATCH (n:{base}) RETURN count(n) AS labelled }}
+            CALL {{ MATCH (n:{quote_name(STATS_LABEL)}) RETURN count(n) AS stats }}
+            RETURN total - labelled - stats AS others
+            """).single()
+            if not counts or not counts["others"]:
+                return 0
+            if session.run(
+                f"MATCH (n) WHERE n.id IS NOT NULL AND NOT n:{base} RETURN n.id LIMIT 1"
+            ).single() is None:
+                return 0
+
+            logger.info("Upgrading graph: adding :%s to existing nodes with an id...", BASE_LABEL)
+            summary = session.run(f"""
+            MATCH (n) WHERE n.id IS NOT NULL AND NOT n:{base}
+            CALL {{ WITH n SET n:{base} }} IN TRANSACTIONS OF {self.batch_size} ROWS
+            """).consume()
+        logger.info("Labelled %d existing nodes", summary.counters.labels_added)
+        return summary.counters.labels_added
+
+    def _node_query(self, labels):
+        """Build the UNWIND MERGE statement for nodes with ``labels``."""
+        extra_labels = [label for label in labels if label != BASE_LABEL]
+        set_labels = ""
+        if extra_labels:
+            set_labels = "SET n:" + ":".join(quote_name(label) for label in extra_labels)
+        return f"""
+        UNWIND $rows AS row
+        MERGE (n:{quote_name(BASE_LABEL)} {{id: row.id}})
+        {set_labels}
+        SET n += row.props
+        RETURN count(n) AS created, collect(row.key) AS keys
+        """
+
+    def _relationship_query(self, rel_type):
+        """Build the UNWIND MERGE statement for relationships of ``rel_type``."""
+        base = quote_name(BASE_LABEL)
+        return f"""
+        UNWIND $rows AS row
+        MATCH (source:{base} {{id: row.source_id}})
+        MATCH (target:{base} {{id: row.target_id}})
+        MERGE (source)-[r:{quote_name(rel_type)}]->(target)
+        SET r += row.props
+        RETURN count(r) AS created, collect(row.key) AS keys
+        """
+
+    def _relationship_waves(self, keyed_rows, query_fn):
+        """
+        Turn ``(rel_type, row)`` pairs into waves of relationship batches.
+
+        A single worker gets plain per-type batches; several workers get
+        endpoint-disjoint waves from ``partition_waves``, with each mixed-type
+        batch split into one statement per type.
+        """
+        if self.workers == 1:
+            return (
+                [[(query_fn(rel_type), batch)]]
+                for rel_type, batch in group_batches(keyed_rows, self.batch_size)
+            )
+
+        def statements(batch):
+            by_type = {}
+            for rel_type, row in batch:
+                by_type.setdefault(rel_type, []).append(row)
+            return [(query_fn(rel_type), rows) for rel_type, rows in by_type.items()]
+
+        return (
+            [statements(batch) for batch in wave]
+            for wave in partition_waves(keyed_rows, self.batch_size, self.workers)
+        )
 
-                query = f"""
-                MERGE (n:{labels} {{id: $id}})
-                SET n += $props
-                RETURN count(n) as created
-                """
+    def import_nodes(self, nodes, on_written=None):
+        """Import nodes to Neo4j in batches grouped by label set.
 
-                result = session.run(query, id=node_id, props=properties)
-                count += result.single()["created"]
+        ``nodes`` may be any iterable, including a stream; at most one batch
+        per label set is held in memory at a time. ``on_written`` receives
+        the manifest keys of each batch once its transaction has committed.
+        """
+        logger.info("Importing nodes (batch size %d, %d workers)...", self.batch_size, self.workers)
 
-        logger.info("Imported %d nodes", count)
-        return count
+        def keyed(node):
+            row = node_row(node)
+            if on_written is not None:
+                row["key"] = node_key(node)
+            return row
 
-    def import_relationships(self, relationships):
-        """Import relationships to Neo4j."""
-        logger.info("Importing %d relationships...", len(relationships))
+        rows = (
+            (tuple(node.get("labels") or [BASE_LABEL]), keyed(node))
+            for node in nodes
+        )
 
-        count = 0
-        with self.driver.session() as session:
-            for rel in relationships:
-                source_id = rel["source_id"]
-                target_id = rel["target_id"]
-                rel_type = rel["type"]
-                properties = rel.get("properties", {})
-
-                query = f"""
-                MATCH (source {{id: $source_id}})
-                MATCH (target {{id: $target_id}})
-                MERGE (source)-[r:{rel_type}]->(target)
-                SET r += $props
-                RETURN count(r) as created
-                """
-
-                result = session.run(
-                    query,
-                    source_id=source_id,
-                    target_id=target_id,
-                    props=properties
-                )
-                count += result.single()["created"]
+        def statements():
+            for labels, batch in group_batches(rows, self.batch_size):
+                self.ensure_constraints(labels)
+                self.touched_labels.update(label for label in labels if label != BASE_LABEL)
+                self._note_properties((BASE_LABEL, *labels), batch)
+                yield [(self._node_query(labels), batch)]
+
+        # Distinct ids never share locks, so any batches can run side by side
+        waves = batched(statements(), self.workers)
 
-        logger.info("Imported %d relationships", count)
+        started = time.perf_counter()
+        count = self._run_waves(waves, on_written)
+
+        elapsed = time.perf_counter() - started
+        rate = count / elapsed if elapsed > 0 else float(count)
+        logger.info("Imported %d nodes in %.2fs (%.0f nodes/sec)", count, elapsed, rate)
         return count
 
-    def import_file(self, json_file):
-        """Import data from JSON file."""
-        logger.info("Loading data from %s", json_file)
+    def import_relationships(self, relationships, on_written=None):
+        """Import relationships to Neo4j in batches grouped by type.
+
+        Endpoints are matched on the indexed base label, so each edge costs
+        two index seeks regardless of graph size. ``relationships`` may be
+        any iterable, including a stream. ``on_written`` receives the
+        manifest keys of the relationships each committed batch wrote;
+        rows whose endpoints were not found are not among them.
+        """
+        logger.info(
+            "Importing relationships (batch size %d, %d workers)...",
+            self.batch_size, self.workers
+        )
 
-        data = json.loads(Path(json_file).read_text())
+        seen = 0
 
-        # Import nodes
-        if "nodes" in data:
-            self.import_nodes(data["nodes"])
+        def counted(items):
+            nonlocal seen
+            for item in items:
+                seen += 1
+                yield item
 
-        # Import relationships
-        if "relationships" in data:
-            self.import_relationships(data["relationships"])
+        def keyed(rel):
+            row = relationship_row(rel)
+            if on_written is not None:
+                row["key"] = relationship_key(rel)
+            return row
 
+        rows = counted((rel["type"], keyed(rel)) for rel in relationships)
+        waves = self._relationship_waves(rows, self._relationship_query)
+
+        self.ensure_constraints([])
+
+        started = time.perf_counter()
+        count = self._run_waves(waves, on_written)
+
+        elapsed = time.perf_counter() - started
+        missing = seen - count
+        if missing:
+            logger.warning("%d relationships skipped: endpoint id not found", missing)
+        rate = count / elapsed if elapsed > 0 else float(count)
+        logger.info("Imported %d relationships in %.2fs (%.0f rels/sec)", count, elapsed, rate)
+        return count
+
+    def _enrichment_query(self, label):
+        """Build the UNWIND MATCH SET statement for enrichments of ``label`` nodes.
+
+        Besides the match count it returns the labels of the matched nodes,
+        which for base-label enrichments are not known in advance.
+        """
+        return f"""
+        UNWIND $rows AS row
+        MATCH (n:{quote_name(label)} {{id: row.id}})
+        SET n += row.props
+        RETURN count(n) AS matched,
+               reduce(found = [], names IN collect(DISTINCT labels(n)) |
+                      found + [name IN names WHERE NOT name IN found]) AS labels
+        """
+
+    def import_enrichments(self, enrichments):
+        """Apply enrichments in batches grouped by target label.
+
+        Returns:
+            Dict with ``matched`` and ``unmatched`` target counts
+        """
+        logger.info("Importing enrichments (batch size %d, %d workers)...", self.batch_size, self.workers)
+
+        seen = 0
+
+        def statements():
+            nonlocal seen
+            rows = (
+                (enrichment.get("label") or BASE_LABEL, enrichment_row(enrichment))
+                for enrichment in enrichments
+            )
+            for label, batch in group_batches(rows, self.batch_size):
+                seen += len(batch)
+                self.ensure_constraints([label])
+                self._note_properties((BASE_LABEL, label), batch)
+                yield [(self._enrichment_query(label), batch)]
+
+        def written(labels):
+            self.touched_labels.update(label for label in labels if label != BASE_LABEL)
+
+        started = time.perf_counter()
+        matched = self._run_waves(batched(statements(), self.workers), on_written=written)
+        elapsed = time.perf_counter() - started
+
+        unmatched = seen - matched
+        if unmatched:
+            logger.warning("%d enrichments skipped: target id not found", unmatched)
+        rate = seen / elapsed if elapsed > 0 else float(seen)
+        logger.info("Applied %d enrichments in %.2fs (%.0f rows/sec)", matched, elapsed, rate)
+        return {"matched": matched, "unmatched": unmatched}
+
+    def delete_nodes(self, node_ids):
+        """Detach and delete nodes by id."""
+        query = f"""
+        UNWIND $rows AS row
+        MATCH (n:{quote_name(BASE_LABEL)} {{id: row.id}})
+        DETACH DELETE n
+        RETURN count(*) AS deleted
+        """
+        waves = batched(
+            ([(query, batch)] for batch in batched(({"id": node_id} for node_id in node_ids), self.batch_size)),
+            self.workers
+        )
+        count = self._run_waves(waves)
+        logger.info("Deleted %d nodes", count)
+        return count
+
+    def delete_relationships(self, keys):
+        """Delete relationships identified by ``(source_id, type, target_id)``."""
+        base = quote_name(BASE_LABEL)
+
+        def query(rel_type):
+            return f"""
+            UNWIND $rows AS row
+            MATCH (:{base} {{id: row.source_id}})-[r:{quote_name(rel_type)}]->(:{base} {{id: row.target_id}})
+            DELETE r
+            RETURN count(*) AS deleted
+            """
+
+        rows = (
+            (rel_type, {"source_id": source_id, "target_id": target_id})
+            for source_id, rel_type, target_id in keys
+        )
+        count = self._run_waves(self._relationship_waves(rows, query))
+        logger.info("Deleted %d relationships", count)
+        return count
+
+    def _note_properties(self, labels, rows):
+        """Record the string properties ``rows`` write for the search indexes of ``labels``."""
+        names = set()
+        for row in rows:
+            names.update(string_properties(row["props"]))
+        for label in labels:
+            self.written_properties[label] |= names
+
+    def refresh_search_indexes(self):
+        """Widen the full-text search indexes to cover the properties written.
+
+        Like the stats refresh, a failure is logged rather than raised; the
+        Explorer falls back to a scan for labels without a usable index.
+        """
+        if not self.written_properties:
+            return []
+        try:
+            changed = ensure_search_indexes(self.driver, self.written_properties)
+        except ClientError as exc:
+            logger.warning("Could not update full-text search indexes: %s", exc.message)
+            return []
+        self.written_properties = defaultdict(set)
+        if changed:
+            logger.info("Built full-text search indexes: %s", ", ".join(changed))
+        return changed
+
+    def refresh_stats(self, full=False, profile=None):
+        """Refresh the graph statistics snapshot after writes.
+
+        Changed labels are re-profiled when ``profile`` is set, or by default
+        when at least ``STATS_PROFILE_MIN_ROWS`` rows were written since the
+        last refresh; otherwise only the counts are refreshed. A failure is
+        logged rather than raised, so the import itself still counts as done;
+        the Dashboard then shows the previous snapshot.
+        """
+        if profile is None:
+            profile = self.rows_written >= STATS_PROFILE_MIN_ROWS
+        started = time.perf_counter()
+        try:
+            snapshot = refresh_snapshot(self.driver, self.touched_labels, full=full, profile=profile)
+        except ClientError as exc:
+            logger.warning("Could not refresh graph statistics: %s", exc.message)
+            return None
+        self.touched_labels = set()
+        self.rows_written = 0
+        logger.info(
+            "Refreshed graph statistics in %.2fs (%d nodes, %d relationships; re-profiled %s)",
+            time.perf_counter() - started, snapshot["nodes"], snapshot["relationships"],
+            ", ".join(snapshot["refreshed"]) or "no labels"
+        )
+        if snapshot["pending"]:
+            logger.info(
+                "Profiles left for a later refresh: %s (use --profile-stats or scripts/refresh_graph_stats.py)",
+                ", ".join(snapshot["pending"])
+            )
+        return snapshot
+
+    def import_file(
+        self, json_file, manifest=None, delete_missing=False, stats=True, full_stats=False, profile_stats=None
+    ):
+        """Import data from JSON file.
+
+        The file is streamed rather than loaded: one pass feeds ``nodes`` to
+        the database batch by batch, a second pass does the same for
+        ``relationships`` so their endpoints exist whatever the key order, and
+        a third applies ``enrichments`` once their targets exist.
+
+        With a ``manifest`` only new and changed rows are written; with
+        ``delete_missing`` as well, rows recorded for this file by an earlier
+        import but no longer present are deleted. With ``stats`` the graph
+        statistics snapshot is refreshed at the end (see ``refresh_stats``
+        for ``full_stats`` and ``profile_stats``).
+        """
+        logger.info("Streaming data from %s", json_file)
+
+        nodes = iter_sweep_section(json_file, "nodes")
+        relationships = iter_sweep_section(json_file, "relationships")
+        if manifest is not None:
+            nodes = manifest.filter_changed(NODE, nodes, node_key, node_hash)
+            relationships = manifest.filter_changed(
+                RELATIONSHIP, relationships, relationship_key, relationship_hash
+            )
+
+        node_written = relationship_written = None
+        if manifest is not None:
+            # Hashes are recorded only for rows the database reported written
+            def node_written(keys):
+                manifest.confirm(NODE, keys)
+
+            def relationship_written(keys):
+                manifest.confirm(RELATIONSHIP, keys)
+
+        try:
+            # Import nodes
+            self.import_nodes(nodes, on_written=node_written)
+
+            # Import relationships
+            self.import_relationships(relationships, on_written=relationship_written)
+
+            # Apply enrichments
+            self.import_enrichments(iter_sweep_section(json_file, "enrichments"))
+
+            if manifest is not None and delete_missing:
+                self.delete_relationships(json.loads(key) for key in manifest.missing(RELATIONSHIP))
+                self.delete_nodes(manifest.missing(NODE))
+                manifest.forget_missing()
+        except Exception:
+            if manifest is not None:
+                manifest.rollback()
+            raise
+
+        if manifest is not None:
+            unconfirmed = manifest.unconfirmed(NODE) + manifest.unconfirmed(RELATIONSHIP)
+            if unconfirmed:
+                logger.warning("%d rows not written; the next delta import will send them again", unconfirmed)
+            manifest.commit()
+            logger.info("Delta summary: %s", dict(manifest.stats))
+
+        if self.retry_stats:
+            logger.info("Retried batches: %s", dict(self.retry_stats))
+        self.refresh_search_indexes()
+        if stats:
+            self.refresh_stats(full=full_stats, profile=profile_stats)
         logger.info("Import complete!")
 
 
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Import sweep JSON into Neo4j")
+    parser.add_argument("json_file", help="Sweep JSON or JSON Lines file to import")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Rows per UNWIND transaction (default: {DEFAULT_BATCH_SIZE})"
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=DEFAULT_MAX_RETRIES,
+        help=f"Retries per batch on transient errors (default: {DEFAULT_MAX_RETRIES})"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Concurrent writer threads, one session each (default: 1)"
+    )
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        help="Send only rows whose content hash changed since the last import of this file"
+    )
+    parser.add_argument(
+        "--delete-missing",
+        action="store_true",
+        help="With --delta, delete rows that disappeared from the file since the last import"
+    )
+    parser.add_argument(
+        "--manifest",
+        default=DEFAULT_MANIFEST_PATH,
+        help=f"Delta manifest location (default: {DEFAULT_MANIFEST_PATH})"
+    )
+    parser.add_argument(
+        "--no-stats",
+        action="store_true",
+        help="Do not refresh the graph statistics snapshot after the import"
+    )
+    parser.add_argument(
+        "--profile-stats",
+        action="store_true",
+        default=None,
+        help=f"Re-profile changed labels even if the import wrote fewer than {STATS_PROFILE_MIN_ROWS} rows"
+    )
+    parser.add_argument(
+        "--full-stats",
+        action="store_true",
+        help="Re-profile every label when refreshing graph statistics, not just changed ones"
+    )
+    return parser.parse_args(argv)
+
+
 def main():
     """Main execution."""
-    if len(sys.argv) < 2:
-        print("Usage: python scripts/import_to_neo4j.py <json_file>")
-        sys.exit(1)
-
-    json_file = sys.argv[1]
+    args = parse_args()
+    json_file = args.json_file
 
     if not Path(json_file).exists():
         logger.error("File not found: %s", json_file)
         sys.exit(1)
 
-    importer = Neo4jImporter()
+    importer = Neo4jImporter(
+        batch_size=args.batch_size,
+        max_retries=args.max_retries,
+        workers=args.workers
+    )
 
     try:
-        importer.import_file(json_file)
+        if args.delta or args.delete_missing:
+            scope = f"{NEO4J_URI}|{Path(json_file).resolve()}"
+            manifest = ImportManifest(args.manifest, scope=scope)
+            try:
+                importer.import_file(
+                    json_file,
+                    manifest=manifest,
+                    delete_missing=args.delete_missing,
+                    stats=not args.no_stats,
+                    full_stats=args.full_stats,
+                    profile_stats=args.profile_stats
+                )
+            finally:
+                manifest.close()
+        else:
+            importer.import_file(
+                json_file,
+                stats=not args.no_stats,
+                full_stats=args.full_stats,
+                profile_stats=args.profile_stats
+            )
     finally:
         importer.close()
 
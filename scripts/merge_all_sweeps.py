@@ -0,0 +1,215 @@
+"""
+Merge sweep outputs into one graph file without a database.
+
+Every sweep file (JSON or JSON Lines) is streamed into a ``GraphMerger``
+indexed by id: nodes are keyed on ``id`` with their labels unioned,
+duplicate relationships ``(source_id, type, target_id)`` collapse into one,
+and enrichments are keyed on ``(target_id, label)``.
+
+Files are merged in precedence order, and conflicting property values are
+resolved by ``--conflict`` (default ``last``, so later files win):
+
+- ``--precedence latest-sweep`` (default) orders files by ``sweep_id``
+  (a file's ``sweep_id`` field, else its name), comparing numbers
+  numerically, so the latest sweep wins
+- ``--precedence file-order`` keeps the order given on the command line
+
+With ``--spill`` merged elements are kept in a temporary SQLite file rather
+than in memory, for inputs larger than RAM.
+
+Usage:
+    python scripts/merge_all_sweeps.py
+    python scripts/merge_all_sweeps.py output/neo4j_ready/sweep0*.ndjson --output merged.ndjson
+    python scripts/merge_all_sweeps.py --precedence file-order --conflict first
+    python scripts/merge_all_sweeps.py --spill
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+# Ensure repository root is on sys.path when executed directly
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.utils import setup_logger
+from scripts.utils.graph_merge import CONFLICT_POLICIES, GraphMerger
+from scripts.utils.ndjson import NDJSON_SUFFIXES, NdjsonWriter, iter_sweep_items
+
+# Configure logging
+logger = setup_logger("merge", log_file="output/logs/merge_all_sweeps.log")
+
+INPUT_DIR = "output/neo4j_ready"
+DEFAULT_OUTPUT_PATH = "output/json/merged_graph.json"
+PRECEDENCE_ORDERS = ("latest-sweep", "file-order")
+SECTIONS = ("nodes", "relationships", "enrichments")
+PROGRESS_INTERVAL = 1_000_000
+
+
+def natural_key(text):
+    """Sort key that compares digit runs as numbers (sweep2 < sweep10)."""
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r"(\d+)", text)]
+
+
+def sweep_id_of(path):
+    """The file's ``sweep_id``, read from the fields before its first element, else its name."""
+    items = iter_sweep_items(path)
+    try:
+        for key, value in items:
+            if key == "sweep_id":
+                return str(value)
+            if key in SECTIONS:
+                break
+    finally:
+        items.close()
+    return Path(path).stem
+
+
+def default_inputs(output_path):
+    """Every sweep file in the output directory except the merged output itself."""
+    suffixes = (".json",) + NDJSON_SUFFIXES
+    output = Path(output_path).resolve()
+    return [
+        str(path) for path in sorted(Path(INPUT_DIR).iterdir())
+        if path.suffix.lower() in suffixes and path.resolve() != output
+    ]
+
+
+def merge_files(paths, merger):
+    """Stream each file into ``merger`` in the given order."""
+    sources = []
+    for path in paths:
+        started = time.perf_counter()
+        counts = {section: 0 for section in SECTIONS}
+        sweep_id = None
+        for key, value in iter_sweep_items(path):
+            if key == "nodes":
+                merger.add_node(value)
+            elif key == "relationships":
+                merger.add_relationship(value)
+            elif key == "enrichments":
+                merger.add_enrichment(value)
+            elif key == "sweep_id":
+                sweep_id = value
+                continue
+            else:
+                continue
+            counts[key] += 1
+            total = sum(counts.values())
+            if total % PROGRESS_INTERVAL == 0:
+                logger.info("  %s: %d elements read", path, total)
+
+        logger.info(
+            "Merged %s (%s) in %.1fs: %s",
+            path, sweep_id or "no sweep_id", time.perf_counter() - started, counts
+        )
+        sources.append({"file": str(path), "sweep_id": sweep_id, **counts})
+    return sources
+
+
+def write_merged(merger, sources, output_path):
+    """Write the merged graph as a JSON document, or JSON Lines for .ndjson/.jsonl."""
+    output = Path(output_path)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    counts = {}
+
+    if output.suffix.lower() in NDJSON_SUFFIXES:
+        writer = NdjsonWriter(output)
+        try:
+            writer.add_meta({"merged_from": sources})
+            for section in SECTIONS:
+                for item in merger.iter_section(section):
+                    writer.add(section, item)
+        finally:
+            writer.close()
+        return dict(writer.counts)
+
+    # One element per line keeps the file streamable and diffable
+    with open(output, "w", encoding="utf-8") as handle:
+        handle.write('{\n"merged_from": ')
+        handle.write(json.dumps(sources, ensure_ascii=False))
+        for section in SECTIONS:
+            handle.write(f',\n"{section}": [')
+            count = 0
+            for item in merger.iter_section(section):
+                handle.write(",\n" if count else "\n")
+                handle.write(json.dumps(item, ensure_ascii=False))
+                count += 1
+            handle.write("\n]" if count else "]")
+            counts[section] = count
+        handle.write("\n}\n")
+    return counts
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Merge sweep outputs into one graph file")
+    parser.add_argument(
+        "inputs",
+        nargs="*",
+        help=f"Sweep JSON or JSON Lines files (default: every sweep file in {INPUT_DIR})"
+    )
+    parser.add_argument(
+        "--output",
+        default=DEFAULT_OUTPUT_PATH,
+        help=f"Merged file; .ndjson or .jsonl writes JSON Lines (default: {DEFAULT_OUTPUT_PATH})"
+    )
+    parser.add_argument(
+        "--precedence",
+        choices=PRECEDENCE_ORDERS,
+        default="latest-sweep",
+        help="Order in which files are merged (default: latest-sweep)"
+    )
+    parser.add_argument(
+        "--conflict",
+        choices=CONFLICT_POLICIES,
+        default="last",
+        help="Which value wins a property conflict, in precedence order (default: last)"
+    )
+    parser.add_argument("--spill", action="store_true", help="Keep merged elements on disk instead of in memory")
+    parser.add_argument("--spill-dir", default="output/tmp", help="Directory for spill files (default: output/tmp)")
+    return parser.parse_args(argv)
+
+
+def main():
+    """Main execution."""
+    args = parse_args()
+
+    inputs = args.inputs or default_inputs(args.output)
+    missing = [path for path in inputs if not Path(path).exists()]
+    if missing:
+        logger.error("File not found: %s", ", ".join(missing))
+        sys.exit(1)
+    if not inputs:
+        logger.error("No sweep files to merge in %s", INPUT_DIR)
+        sys.exit(1)
+
+    if args.precedence == "latest-sweep":
+        inputs = sorted(inputs, key=lambda path: natural_key(sweep_id_of(path)))
+    logger.info("Merging %d files (%s, conflicts: %s)", len(inputs), args.precedence, args.conflict)
+
+    spill_dir = None
+    if args.spill:
+        Path(args.spill_dir).mkdir(parents=True, exist_ok=True)
+        spill_dir = args.spill_dir
+
+    started = time.perf_counter()
+    merger = GraphMerger(conflict_policy=args.conflict, spill_dir=spill_dir)
+    try:
+        sources = merge_files(inputs, merger)
+        counts = write_merged(merger, sources, args.output)
+    finally:
+        merger.close()
+
+    logger.info("Merge summary: %s", dict(merger.stats))
+    logger.info(
+        "Wrote %s in %.1fs: %s", args.output, time.perf_counter() - started, counts
+    )
+
+
+if __name__ == "__main__":
+    main()
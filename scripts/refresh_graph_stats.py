@@ -0,0 +1,83 @@
+"""
+Refresh the graph statistics snapshot shown on the Dashboard, and the
+Explorer's full-text search indexes.
+
+Imports refresh both themselves; run this after changing the graph some
+other way (the Editor, Neo4j Browser, a manual Cypher script), or after
+small imports, which refresh only the counts. Counts are re-read from the
+count store and labels whose counts changed, or that an import left
+pending, are re-profiled; ``--full`` re-profiles every label, and
+``--labels`` names labels whose properties changed without their counts
+changing. Search indexes are rebuilt to cover exactly the string
+properties in the schema; ``--no-search-indexes`` leaves them alone.
+
+Usage:
+    python scripts/refresh_graph_stats.py
+    python scripts/refresh_graph_stats.py --labels Concept Claim
+    python scripts/refresh_graph_stats.py --full
+    python scripts/refresh_graph_stats.py --no-search-indexes
+"""
+
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Ensure repository root is on sys.path when executed directly
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from dotenv import load_dotenv
+from neo4j import GraphDatabase
+
+from scripts.utils import setup_logger
+from scripts.utils.graph_stats import refresh_snapshot
+from scripts.utils.search_indexes import ensure_search_indexes
+
+# Load environment
+load_dotenv()
+
+# Configure logging
+logger = setup_logger("graph_stats", log_file="output/logs/refresh_graph_stats.log")
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Refresh the graph statistics snapshot")
+    parser.add_argument("--labels", nargs="+", default=[], help="Labels to re-profile in any case")
+    parser.add_argument("--full", action="store_true", help="Re-profile every label")
+    parser.add_argument(
+        "--no-search-indexes", action="store_true", help="Do not rebuild the full-text search indexes"
+    )
+    return parser.parse_args(argv)
+
+
+def main():
+    """Main execution."""
+    args = parse_args()
+    driver = GraphDatabase.driver(
+        os.getenv("NEO4J_URI"),
+        auth=(os.getenv("NEO4J_USER"), os.getenv("NEO4J_PASSWORD"))
+    )
+    try:
+        started = time.perf_counter()
+        snapshot = refresh_snapshot(driver, args.labels, full=args.full)
+        elapsed = time.perf_counter() - started
+        indexes = None if args.no_search_indexes else ensure_search_indexes(driver)
+    finally:
+        driver.close()
+
+    logger.info(
+        "Refreshed graph statistics in %.2fs: %d nodes, %d relationships, %d labels, %d relationship types",
+        elapsed, snapshot["nodes"], snapshot["relationships"],
+        len(snapshot["labels"]), len(snapshot["relationship_types"])
+    )
+    logger.info("Re-profiled: %s", ", ".join(snapshot["refreshed"]) or "no labels")
+    if indexes is not None:
+        logger.info("Rebuilt search indexes: %s", ", ".join(indexes) or "none needed")
+
+
+if __name__ == "__main__":
+    main()
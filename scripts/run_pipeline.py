@@ -0,0 +1,361 @@
+"""
+Run a declared pipeline of sweeps in dependency order.
+
+The pipeline is a TOML file listing each sweep's script, prompt, input files,
+output file and the sweeps it depends on (see
+``scripts/templates/pipeline_template.toml``):
+
+    [sweeps.concepts]
+    script = "scripts/sweep02_concepts.py"
+    prompt = "prompts/v5/02_concept_extraction.txt"
+    inputs = ["data/raw/corpus.txt"]
+    output = "output/neo4j_ready/sweep02_concepts.json"
+    depends_on = ["structure"]
+
+A sweep starts as soon as everything it depends on has finished and been
+imported, so independent sweeps (e.g. citations and concepts, which both
+need only structure) run side by side. Each sweep script is run as its own
+process, with the declared paths passed in ``SWEEP_PROMPT_PATH``,
+``SWEEP_CORPUS_PATH`` and ``SWEEP_OUTPUT_PATH``.
+
+A sweep is skipped when its script, prompt, inputs and upstream outputs
+hash the same as at its last successful run and its output is still on
+disk. Outputs are imported one at a time, each after its dependencies, using
+the importer's delta manifest so unchanged rows are not rewritten.
+
+Usage:
+    python scripts/run_pipeline.py pipeline.toml
+    python scripts/run_pipeline.py pipeline.toml --parallel 4
+    python scripts/run_pipeline.py pipeline.toml --only concepts --force
+    python scripts/run_pipeline.py pipeline.toml --dry-run
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+import subprocess
+import threading
+import tomllib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+
+# Ensure repository root is on sys.path when executed directly
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.utils import setup_logger
+from scripts.utils.import_manifest import DEFAULT_MANIFEST_PATH, ImportManifest
+
+# Configure logging
+logger = setup_logger("pipeline", log_file="output/logs/run_pipeline.log")
+
+DEFAULT_STATE_PATH = "output/manifests/pipeline_state.json"
+DEFAULT_PARALLEL = 2
+HASH_BLOCK_SIZE = 1 << 20
+
+
+class PipelineError(ValueError):
+    """Raised for an invalid pipeline declaration."""
+
+
+def file_hash(path):
+    """SHA-256 of a file's contents, or None if it does not exist."""
+    path = Path(path)
+    if not path.is_file():
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_pipeline(path):
+    """
+    Read and validate a pipeline file.
+
+    Returns:
+        Tuple of (settings, sweeps) where ``sweeps`` maps each name to its
+        declaration, in a dependency-respecting order
+    """
+    with open(path, "rb") as handle:
+        config = tomllib.load(handle)
+
+    settings = config.get("pipeline", {})
+    declared = config.get("sweeps", {})
+    if not declared:
+        raise PipelineError(f"{path} declares no [sweeps.<name>] tables")
+
+    sweeps = {}
+    for name, sweep in declared.items():
+        for key in ("script", "output"):
+            if not sweep.get(key):
+                raise PipelineError(f"Sweep {name!r} is missing {key!r}")
+        unknown = [dep for dep in sweep.get("depends_on", []) if dep not in declared]
+        if unknown:
+            raise PipelineError(f"Sweep {name!r} depends on undeclared sweeps: {', '.join(unknown)}")
+        sweeps[name] = {
+            "script": sweep["script"],
+            "prompt": sweep.get("prompt"),
+            "inputs": list(sweep.get("inputs", [])),
+            "output": sweep["output"],
+            "depends_on": list(sweep.get("depends_on", [])),
+            "import": sweep.get("import", settings.get("import", True)),
+        }
+
+    return settings, topological_order(sweeps)
+
+
+def topological_order(sweeps):
+    """Order sweeps so every sweep follows its dependencies; reject cycles."""
+    ordered = {}
+    visiting = set()
+
+    def visit(name, path):
+        if name in ordered:
+            return
+        if name in visiting:
+            raise PipelineError(f"Dependency cycle: {' -> '.join(path + [name])}")
+        visiting.add(name)
+        for dep in sweeps[name]["depends_on"]:
+            visit(dep, path + [name])
+        visiting.discard(name)
+        ordered[name] = sweeps[name]
+
+    for name in sweeps:
+        visit(name, [])
+    return ordered
+
+
+class PipelineRunner:
+    """Run the sweeps of a pipeline, skipping unchanged ones."""
+
+    def __init__(self, sweeps, state_path=DEFAULT_STATE_PATH, parallel=DEFAULT_PARALLEL,
+                 force=(), run_import=True, dry_run=False):
+        self.sweeps = sweeps
+        self.state_path = Path(state_path)
+        self.parallel = max(1, parallel)
+        self.force = set(force)
+        self.run_import = run_import
+        self.dry_run = dry_run
+        self.state = self._load_state()
+        self.results = {}
+        self._import_lock = threading.Lock()
+        self._importer = None
+
+    def _load_state(self):
+        if self.state_path.exists():
+            return json.loads(self.state_path.read_text())
+        return {}
+
+    def _save_state(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.state_path.with_suffix(".tmp")
+        temp.write_text(json.dumps(self.state, indent=2, sort_keys=True))
+        temp.replace(self.state_path)
+
+    def fingerprint(self, name):
+        """Hash of everything a sweep's output depends on."""
+        sweep = self.sweeps[name]
+        parts = {
+            "script": file_hash(sweep["script"]),
+            "prompt": file_hash(sweep["prompt"]) if sweep["prompt"] else None,
+            "inputs": {path: file_hash(path) for path in sweep["inputs"]},
+            "upstream": {dep: file_hash(self.sweeps[dep]["output"]) for dep in sweep["depends_on"]},
+        }
+        payload = json.dumps(parts, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def is_current(self, name, fingerprint):
+        """Whether the last successful run used the same fingerprint and its output remains."""
+        previous = self.state.get(name, {})
+        output_hash = file_hash(self.sweeps[name]["output"])
+        return (
+            name not in self.force
+            and previous.get("fingerprint") == fingerprint
+            and output_hash is not None
+            and previous.get("output_hash") == output_hash
+        )
+
+    def run_sweep(self, name):
+        """Run one sweep script as a subprocess; return True on success."""
+        sweep = self.sweeps[name]
+        log_path = Path("output/logs/pipeline") / f"{name}.log"
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(REPO_ROOT), env.get("PYTHONPATH")]))
+        env["SWEEP_OUTPUT_PATH"] = sweep["output"]
+        if sweep["prompt"]:
+            env["SWEEP_PROMPT_PATH"] = sweep["prompt"]
+        if sweep["inputs"]:
+            env["SWEEP_CORPUS_PATH"] = sweep["inputs"][0]
+
+        logger.info("Running %s (%s)", name, sweep["script"])
+        with open(log_path, "w") as log:
+            process = subprocess.run(
+                [sys.executable, sweep["script"]],
+                env=env, stdout=log, stderr=subprocess.STDOUT
+            )
+        if process.returncode != 0:
+            logger.error("%s failed with exit code %d; see %s", name, process.returncode, log_path)
+            return False
+        if not Path(sweep["output"]).exists():
+            logger.error("%s finished but wrote no output at %s", name, sweep["output"])
+            return False
+        return True
+
+    def import_output(self, name):
+        """Import a sweep's output through the delta manifest, one import at a time."""
+        from scripts.import_to_neo4j import NEO4J_URI, Neo4jImporter
+
+        output = self.sweeps[name]["output"]
+        with self._import_lock:
+            if self._importer is None:
+                self._importer = Neo4jImporter()
+            logger.info("Importing %s output %s", name, output)
+            manifest = ImportManifest(DEFAULT_MANIFEST_PATH, scope=f"{NEO4J_URI}|{Path(output).resolve()}")
+            try:
+                self._importer.import_file(output, manifest=manifest)
+            finally:
+                manifest.close()
+
+    def process(self, name):
+        """Run (or skip) and import one sweep whose dependencies are done."""
+        sweep = self.sweeps[name]
+        fingerprint = self.fingerprint(name)
+        previous = self.state.get(name, {})
+
+        if self.is_current(name, fingerprint):
+            logger.info("Skipping %s: script, prompt, inputs and upstream outputs unchanged", name)
+            status = "skipped"
+        elif self.dry_run:
+            logger.info("Would run %s", name)
+            return "pending"
+        elif self.run_sweep(name):
+            status = "ran"
+        else:
+            return "failed"
+
+        output_hash = file_hash(sweep["output"])
+        if sweep["import"] and self.run_import and not self.dry_run and previous.get("imported_hash") != output_hash:
+            self.import_output(name)
+            imported_hash = output_hash
+        else:
+            imported_hash = previous.get("imported_hash")
+
+        self.state[name] = {
+            "fingerprint": fingerprint,
+            "output_hash": output_hash,
+            "imported_hash": imported_hash,
+            "completed_at": previous.get("completed_at") if status == "skipped" else datetime.now().isoformat(),
+        }
+        with self._import_lock:
+            self._save_state()
+        return status
+
+    def run(self):
+        """Run every sweep once its dependencies are done; return name -> status."""
+        remaining = dict(self.sweeps)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.parallel) as executor:
+            while remaining or running:
+                for name, sweep in list(remaining.items()):
+                    statuses = [self.results.get(dep) for dep in sweep["depends_on"]]
+                    if any(status in ("failed", "blocked") for status in statuses):
+                        logger.warning("Not running %s: a dependency did not complete", name)
+                        self.results[name] = "blocked"
+                        del remaining[name]
+                    elif "pending" in statuses:
+                        logger.info("Would run %s after its dependencies", name)
+                        self.results[name] = "pending"
+                        del remaining[name]
+                    elif all(status in ("ran", "skipped") for status in statuses):
+                        running[executor.submit(self.process, name)] = name
+                        del remaining[name]
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        self.results[name] = future.result()
+                    except Exception as e:
+                        logger.error("%s failed: %s", name, str(e), exc_info=True)
+                        self.results[name] = "failed"
+
+        if self._importer is not None:
+            self._importer.close()
+        return self.results
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Run a pipeline of sweeps in dependency order")
+    parser.add_argument("pipeline", help="Pipeline TOML file")
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        help=f"Sweeps to run at once (default: pipeline setting or {DEFAULT_PARALLEL})"
+    )
+    parser.add_argument("--only", nargs="+", metavar="SWEEP", help="Run only these sweeps and what they depend on")
+    parser.add_argument("--force", nargs="*", metavar="SWEEP", help="Rerun these sweeps (all if none given)")
+    parser.add_argument("--no-import", action="store_true", help="Run sweeps without importing their output")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would run without running it")
+    parser.add_argument("--state", help=f"Pipeline state file (default: {DEFAULT_STATE_PATH})")
+    return parser.parse_args(argv)
+
+
+def main():
+    """Main execution."""
+    args = parse_args()
+
+    try:
+        settings, sweeps = load_pipeline(args.pipeline)
+    except (OSError, tomllib.TOMLDecodeError, PipelineError) as e:
+        logger.error("Cannot load pipeline %s: %s", args.pipeline, str(e))
+        sys.exit(1)
+
+    if args.only:
+        unknown = [name for name in args.only if name not in sweeps]
+        if unknown:
+            logger.error("Unknown sweeps: %s", ", ".join(unknown))
+            sys.exit(1)
+        wanted = set()
+        stack = list(args.only)
+        while stack:
+            name = stack.pop()
+            if name not in wanted:
+                wanted.add(name)
+                stack.extend(sweeps[name]["depends_on"])
+        sweeps = {name: sweep for name, sweep in sweeps.items() if name in wanted}
+
+    if args.force is None:
+        force = []
+    else:
+        force = args.force or list(sweeps)
+
+    runner = PipelineRunner(
+        sweeps,
+        state_path=args.state or settings.get("state", DEFAULT_STATE_PATH),
+        parallel=args.parallel or settings.get("parallel", DEFAULT_PARALLEL),
+        force=force,
+        run_import=not args.no_import,
+        dry_run=args.dry_run,
+    )
+    results = runner.run()
+
+    for name, status in results.items():
+        logger.info("%-24s %s", name, status)
+    if any(status in ("failed", "blocked") for status in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,19 +2,31 @@
 SweepNN: [Description]
 
 Purpose: [What this sweep extracts or enriches]
-Output: output/neo4j_ready/sweepNN_description.json
+Output: output/neo4j_ready/sweepNN_description.ndjson
 
 Usage:
     python scripts/sweepNN_description.py
+    python scripts/sweepNN_description.py --resume
 """
 
 import os
 import json
-import google.generativeai as genai
+import argparse
+from collections import Counter
 from pathlib import Path
 from dotenv import load_dotenv
 from neo4j import GraphDatabase
 from scripts.utils import setup_logger, get_timestamp
+from scripts.utils.checkpoint import ChunkCheckpoint, chunk_key
+from scripts.utils.chunking import chunk_corpus, estimate_tokens
+from scripts.utils.context_builder import NodeIndex, build_context
+from scripts.utils.graph_merge import GraphMerger, element_id
+from scripts.utils.json_recovery import SECTIONS, cut_in_elements, recover_json
+from scripts.utils.json_stream import JSONStreamError, iter_json_items
+from scripts.utils.ndjson import NdjsonWriter
+from scripts.utils.llm_client import RequestScheduler, make_provider
+from scripts.utils.response_cache import ResponseCache
+from scripts.utils.sweep_sinks import ImporterSink, ProgressSink, SweepFileSink, TeeSink, stream_into
 
 # Load environment
 load_dotenv()
@@ -22,10 +34,32 @@ load_dotenv()
 # Configure logging
 logger = setup_logger("sweepNN", log_file="output/logs/sweepNN_description.log")
 
-# Paths
-CORPUS_TEXT_PATH = "data/raw/corpus.txt"  # Update with your corpus file
-PROMPT_PATH = "prompts/v5/NN_description.txt"
-OUTPUT_PATH = "output/neo4j_ready/sweepNN_description.json"
+# Paths (scripts/run_pipeline.py passes the paths declared in the pipeline)
+CORPUS_TEXT_PATH = os.getenv("SWEEP_CORPUS_PATH", "data/raw/corpus.txt")  # Update with your corpus file
+PROMPT_PATH = os.getenv("SWEEP_PROMPT_PATH", "prompts/v5/NN_description.txt")
+OUTPUT_PATH = os.getenv("SWEEP_OUTPUT_PATH", "output/neo4j_ready/sweepNN_description.ndjson")
+
+# Output format follows the extension: .ndjson/.jsonl writes one tagged element
+# per line (appendable, streamed by the importer); .json writes one indented
+# document for reading by hand
+OUTPUT_FORMAT = "json" if OUTPUT_PATH.endswith(".json") else "ndjson"
+
+# Each chunk's response and parsed result are appended here as they complete;
+# --resume picks up from the chunks that have no record yet
+CHECKPOINT_PATH = f"output/checkpoints/{Path(OUTPUT_PATH).stem}.jsonl"
+
+# Chunking: corpora larger than the budget are split on chapter, section,
+# paragraph and sentence boundaries, extracted chunk by chunk, then merged
+CHUNK_MAX_TOKENS = 30000
+CHUNK_OVERLAP_TOKENS = 500
+MERGE_CONFLICT_POLICY = "last"  # first | last | longest
+
+# Existing-node context: per chunk, the nodes it mentions, as a compact table.
+# CONTEXT_LABELS restricts the nodes loaded to the labels this sweep links to
+# (empty for every imported node); at most CONTEXT_MAX_NODES are loaded.
+CONTEXT_TOKEN_BUDGET = 2000
+CONTEXT_LABELS = []  # e.g. ["Concept", "Person"]
+CONTEXT_MAX_NODES = 200_000
 
 # Neo4j connection
 NEO4J_URI = os.getenv("NEO4J_URI")
@@ -33,9 +67,41 @@ NEO4J_USER = os.getenv("NEO4J_USER")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
 driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
 
-# Gemini configuration
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-model = genai.GenerativeModel("gemini-2.0-flash-exp")
+# LLM configuration
+LLM_PROVIDER = "gemini"  # gemini | anthropic | fake
+LLM_MODEL = "gemini-2.0-flash-exp"
+LLM_API_KEY = os.getenv("ANTHROPIC_API_KEY" if LLM_PROVIDER == "anthropic" else "GEMINI_API_KEY")
+LLM_CONCURRENCY = 4            # requests in flight
+LLM_REQUESTS_PER_MINUTE = 60   # None for unlimited
+LLM_TOKENS_PER_MINUTE = None   # e.g. 1_000_000
+LLM_MAX_RETRIES = 5            # per request, on 429 and 5xx
+
+# Response cache: identical prompts (same model and parameters) are answered
+# from disk. Set LLM_CACHE_BYPASS=1 to force fresh calls (results are re-cached).
+LLM_CACHE_PATH = "output/cache/llm_responses.sqlite"
+LLM_CACHE_BYPASS = os.getenv("LLM_CACHE_BYPASS") == "1"
+
+# Streaming: parse each response while it is generated and write elements to
+# OUTPUT_PATH as they close (chunks run one after another, and elements are
+# not merged across chunks; the importer's MERGE deduplicates them).
+# STREAM_IMPORT also loads them into Neo4j in batches during generation.
+LLM_STREAMING = os.getenv("LLM_STREAMING") == "1"
+STREAM_IMPORT = False
+
+# Cut-off responses: every complete element is kept and only the missing
+# tail is requested again, at most this many times per chunk
+MAX_CONTINUATIONS = 3
+
+provider = make_provider(LLM_PROVIDER, LLM_MODEL, api_key=LLM_API_KEY)
+response_cache = ResponseCache(LLM_CACHE_PATH, bypass=LLM_CACHE_BYPASS)
+scheduler = RequestScheduler(
+    provider,
+    concurrency=LLM_CONCURRENCY,
+    requests_per_minute=LLM_REQUESTS_PER_MINUTE,
+    tokens_per_minute=LLM_TOKENS_PER_MINUTE,
+    max_retries=LLM_MAX_RETRIES,
+    cache=response_cache,
+)
 
 
 def load_corpus_text():
@@ -53,83 +119,286 @@ def load_corpus_text():
 
 def load_existing_nodes():
     """
-    Load existing nodes from Neo4j for context.
+    Load the label, id and name of existing nodes from Neo4j for context.
 
-    Modify this query based on what nodes you need for your sweep.
+    Only these three short fields are fetched; each chunk later gets the
+    relevant subset. Nodes are read through a label scan of the ``Node``
+    base label, or of ``CONTEXT_LABELS`` when set, and capped at
+    ``CONTEXT_MAX_NODES``.
     """
-    logger.info("Loading existing nodes from Neo4j")
+    labels = "|".join("`" + label.replace("`", "``") + "`" for label in CONTEXT_LABELS) or "Node"
+    logger.info("Loading existing :%s nodes from Neo4j", labels)
 
     with driver.session() as session:
-        result = session.run("""
-            MATCH (n)
-            RETURN labels(n)[0] as label, n.id as id, n.name as name
-            LIMIT 100
-        """)
+        result = session.run(f"""
+            MATCH (n:{labels})
+            WHERE n.id IS NOT NULL
+            RETURN coalesce([l IN labels(n) WHERE l <> 'Node'][0], 'Node') as label,
+                   n.id as id, n.name as name
+            LIMIT $limit
+        """, limit=CONTEXT_MAX_NODES)
         nodes = [dict(record) for record in result]
 
+    if len(nodes) == CONTEXT_MAX_NODES:
+        logger.warning(
+            "Loaded the first %d nodes only; set CONTEXT_LABELS to the labels this sweep needs",
+            CONTEXT_MAX_NODES
+        )
     logger.info("Loaded %d nodes", len(nodes))
     return nodes
 
 
-def extract_with_gemini(corpus_text, existing_nodes, prompt_text):
-    """Extract data using Gemini model."""
-    logger.info("Preparing extraction prompt")
-
+def build_prompt(corpus_text, existing_context, prompt_text, chunk_heading=""):
+    """Combine the sweep prompt with existing-node context and corpus text."""
     # Build context
     context = f"""
-# Existing Nodes (for reference)
-{json.dumps(existing_nodes, indent=2)}
+# Existing Nodes (for reference; tab-separated label, id, name)
+{existing_context or "(none relevant)"}
 
-# Corpus Text
+# Corpus Text{chunk_heading}
 {corpus_text}
 """
 
     # Combine with prompt
-    full_prompt = prompt_text + "\n\n" + context
+    return prompt_text + "\n\n" + context
+
 
-    logger.info("Sending request to Gemini (context size: %d chars)", len(full_prompt))
-    response = model.generate_content(full_prompt)
+def extract_with_gemini(prompts, on_response=None):
+    """Send prompts to the configured model concurrently; responses keep prompt order."""
+    logger.info(
+        "Sending %d requests to %s (largest context: %d chars)",
+        len(prompts), LLM_MODEL, max((len(prompt) for prompt in prompts), default=0)
+    )
+    responses = scheduler.run_sync(prompts, on_response)
 
-    logger.info("Received response from Gemini")
-    return response.text
+    logger.info("Received %d responses (%s)", len(responses), dict(scheduler.stats))
+    logger.info("Response cache: %s", response_cache.summary())
+    return responses
 
 
 def parse_response(response_text):
-    """Parse JSON from Gemini response."""
-    logger.info("Parsing Gemini response")
-
-    # Extract JSON from markdown code blocks if present
-    if "```json" in response_text:
-        start = response_text.find("```json") + 7
-        end = response_text.find("```", start)
-        json_text = response_text[start:end].strip()
-    else:
-        json_text = response_text.strip()
+    """Parse JSON from a model response, salvaging complete elements of a cut-off one."""
+    logger.info("Parsing model response")
 
     try:
-        data = json.loads(json_text)
-        logger.info("Parsed JSON successfully")
-        return data
-    except json.JSONDecodeError as e:
+        recovered = recover_json(response_text)
+    except JSONStreamError as e:
         logger.error("Failed to parse JSON: %s", str(e))
         logger.debug("Response text: %s", response_text[:500])
         raise
 
+    for start, end in recovered.skipped:
+        logger.warning("Skipped malformed element at characters %d-%d", start, end)
+    if recovered.truncated:
+        logger.warning(
+            "Response cut off at character %d of %d in %s (%s); salvaged %s",
+            recovered.cutoff, len(response_text), recovered.section or "top level",
+            recovered.error, recovered.counts()
+        )
+    else:
+        logger.info("Parsed JSON successfully")
+    return recovered
+
+
+def describe_element(section, item):
+    """Short reference to an element for a continuation prompt."""
+    if section == "relationships":
+        return f"{item.get('source_id')} -[{item.get('type')}]-> {item.get('target_id')}"
+    if section == "enrichments":
+        return str(item.get("target_id", item.get("id")))
+    return str(element_id(item))
+
+
+def build_continuation_prompt(prompt, counts, last):
+    """Ask for the rest of a response that was cut off after ``last``."""
+    received = "\n".join(
+        f"- {section}: {counts[section]} (last: {describe_element(section, last[section])})"
+        for section in SECTIONS if counts.get(section)
+    )
+    return prompt + f"""
+
+# Continuation
+Your previous answer to this request was cut off. These elements arrived complete:
+{received or "- (none)"}
+
+Continue after the last element listed above. Return the same JSON structure
+containing only the elements you have not returned yet.
+"""
+
+
+def extract_response(prompt, response_text):
+    """Parse one response, requesting only the missing tail while it comes back cut off."""
+    recovered = parse_response(response_text)
+    results = [recovered.data]
+    counts = Counter()
+    last = {}
+
+    continuations = 0
+    while True:
+        new = recovered.counts()
+        counts.update(new)
+        last.update({section: recovered.data[section][-1] for section, count in new.items() if count})
+        if not recovered.truncated:
+            break
+        if not recovered.elements_truncated:
+            # Only trailing metadata such as "statistics" was lost
+            logger.info("Response cut off in %r after the last element; not continuing", recovered.section)
+            break
+        if continuations == MAX_CONTINUATIONS or not sum(new.values()):
+            logger.warning("Giving up on the missing tail after %d continuations", continuations)
+            break
+
+        continuations += 1
+        logger.info("Requesting the missing tail (continuation %d of %d)", continuations, MAX_CONTINUATIONS)
+        response_text = scheduler.run_sync([build_continuation_prompt(prompt, counts, last)])[0]
+        try:
+            recovered = parse_response(response_text)
+        except JSONStreamError:
+            break
+        results.append(recovered.data)
+
+    return results
+
+
+def build_chunk_prompts(corpus_text, existing_nodes, prompt_text):
+    """Split the corpus into chunks and build one prompt per chunk."""
+    chunks = chunk_corpus(corpus_text, CHUNK_MAX_TOKENS, CHUNK_OVERLAP_TOKENS)
+    logger.info(
+        "Split corpus (~%d tokens) into %d chunks",
+        estimate_tokens(corpus_text), len(chunks)
+    )
+
+    index = NodeIndex(existing_nodes)
+
+    prompts = []
+    for chunk in chunks:
+        heading = ""
+        if len(chunks) > 1:
+            heading = f" (chunk {chunk.index + 1} of {len(chunks)}"
+            heading += f"; {chunk.location})" if chunk.location else ")"
+        existing_context = build_context(index, chunk.text, CONTEXT_TOKEN_BUDGET)
+        prompts.append(build_prompt(chunk.text, existing_context, prompt_text, heading))
+    return prompts
+
+
+def extract_streaming(prompts):
+    """Stream each prompt's response into the output file (and Neo4j) as it arrives."""
+    if OUTPUT_FORMAT == "ndjson":
+        file_sink = NdjsonWriter(OUTPUT_PATH)
+    else:
+        file_sink = SweepFileSink(OUTPUT_PATH)
+    sinks = [file_sink]
+    importer = None
+    if STREAM_IMPORT:
+        from scripts.import_to_neo4j import Neo4jImporter
+
+        importer = Neo4jImporter(driver=driver)
+        sinks.append(ImporterSink(importer))
+    sink = TeeSink(*sinks)
+
+    try:
+        for number, prompt in enumerate(prompts, 1):
+            logger.info("Streaming response %d of %d from %s", number, len(prompts), LLM_MODEL)
+            progress = ProgressSink()
+            request = prompt
+            for continuation in range(MAX_CONTINUATIONS + 1):
+                before = sum(progress.counts.values())
+                try:
+                    fragments = scheduler.iter_stream(request)
+                    stream_into(iter_json_items(fragments, skip_preamble=True), TeeSink(progress, sink))
+                    break
+                except JSONStreamError as e:
+                    logger.warning("Stream cut off: %s; received %s", e, dict(progress.counts))
+                    if not cut_in_elements(e.section):
+                        logger.info("Stream cut off in %r after the last element; not continuing", e.section)
+                        break
+                    if continuation == MAX_CONTINUATIONS or sum(progress.counts.values()) == before:
+                        logger.warning("Giving up on the missing tail after %d continuations", continuation)
+                        break
+                    logger.info("Requesting the missing tail (continuation %d of %d)", continuation + 1, MAX_CONTINUATIONS)
+                    request = build_continuation_prompt(prompt, progress.counts, progress.last)
+            logger.info("Streamed %s", dict(progress.counts))
+    finally:
+        sink.close()
+
+    logger.info("Output written to %s (%s)", OUTPUT_PATH, dict(file_sink.counts))
+    if importer is not None:
+        logger.info("Imported while streaming: %s", dict(sinks[1].counts))
+        importer.refresh_search_indexes()
+        importer.refresh_stats()
+    return dict(file_sink.counts)
+
+
+def extract_chunked(corpus_text, existing_nodes, prompt_text, resume=False):
+    """Extract each corpus chunk independently, checkpointing as chunks finish, and merge the results."""
+    prompts = build_chunk_prompts(corpus_text, existing_nodes, prompt_text)
+    keys = [chunk_key(prompt) for prompt in prompts]
+
+    checkpoint = ChunkCheckpoint(CHECKPOINT_PATH, resume=resume)
+    try:
+        pending = [index for index, key in enumerate(keys) if not checkpoint.done(key)]
+        if resume:
+            logger.info(
+                "Resuming from %s: %d of %d chunks already done",
+                CHECKPOINT_PATH, len(prompts) - len(pending), len(prompts)
+            )
+
+        def on_response(position, response):
+            index = pending[position]
+            checkpoint.record_response(keys[index], index, response)
+
+        if pending:
+            extract_with_gemini([prompts[index] for index in pending], on_response)
+
+        # Merge in chunk order so a resumed run produces the same output
+        merger = GraphMerger(conflict_policy=MERGE_CONFLICT_POLICY)
+        for index, (prompt, key) in enumerate(zip(prompts, keys)):
+            results = checkpoint.results.get(key)
+            if results is None:
+                results = extract_response(prompt, checkpoint.responses[key])
+                checkpoint.record_results(key, index, results)
+            merger.add_all(results)
+    finally:
+        checkpoint.close()
+
+    if merger.stats:
+        logger.info("Merge summary: %s", dict(merger.stats))
+    return merger.result()
+
 
 def save_output(data):
-    """Save output to JSON file."""
+    """Save output as JSON Lines, or as an indented JSON document for a .json path."""
     logger.info("Saving output to %s", OUTPUT_PATH)
 
     Path(OUTPUT_PATH).parent.mkdir(parents=True, exist_ok=True)
 
-    with open(OUTPUT_PATH, 'w') as f:
-        json.dump(data, f, indent=2)
+    if OUTPUT_FORMAT == "ndjson":
+        writer = NdjsonWriter(OUTPUT_PATH)
+        try:
+            writer.add_result(data)
+        finally:
+            writer.close()
+    else:
+        with open(OUTPUT_PATH, 'w') as f:
+            json.dump(data, f, indent=2)
 
     logger.info("Output saved successfully")
 
 
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="SweepNN: [Description]")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=f"Continue from the chunks recorded in {CHECKPOINT_PATH}"
+    )
+    return parser.parse_args(argv)
+
+
 def main():
     """Main execution."""
+    args = parse_args()
     logger.info("=== SweepNN: [Description] ===")
 
     try:
@@ -148,17 +417,23 @@ def main():
 
         prompt_text = Path(PROMPT_PATH).read_text()
 
-        # Extract with Gemini
-        response = extract_with_gemini(corpus_text, existing_nodes, prompt_text)
-
-        # Parse response
-        data = parse_response(response)
+        if LLM_STREAMING:
+            if args.resume:
+                logger.warning("--resume applies to non-streaming runs; streaming starts over")
+            # Stream elements straight to the output file as they are generated
+            prompts = build_chunk_prompts(corpus_text, existing_nodes, prompt_text)
+            data = extract_streaming(prompts)
+        else:
+            # Extract with Gemini, chunk by chunk, and merge
+            data = extract_chunked(corpus_text, existing_nodes, prompt_text, resume=args.resume)
 
-        # Save output
-        save_output(data)
+            # Save output
+            save_output(data)
 
         # Log statistics
-        if "nodes" in data:
+        if LLM_STREAMING:
+            logger.info("Total elements streamed: %s", data)
+        elif "nodes" in data:
             logger.info("Total nodes extracted: %d", len(data["nodes"]))
         elif "relationships" in data:
             logger.info("Total relationships extracted: %d", len(data["relationships"]))
@@ -173,6 +448,7 @@ def main():
 
     finally:
         driver.close()
+        response_cache.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,92 @@
+"""
+Durable per-chunk checkpoints for long sweeps.
+
+A sweep over a large corpus sends one request per chunk. ``ChunkCheckpoint``
+appends a line to a JSON Lines file as soon as a chunk's response arrives,
+and another once it has been parsed, flushing each to disk. After a crash
+or quota error, a resumed run reads the file back and only requests the
+chunks that have no record; the recorded results are merged in chunk order
+so the final output matches an uninterrupted run.
+
+Chunks are identified by a hash of their full prompt, so a record is reused
+only if the chunk text, existing-node context and instructions are the
+same. A line cut short by a crash mid-write is ignored.
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+def chunk_key(prompt: str) -> str:
+    """Hash identifying one chunk request."""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+class ChunkCheckpoint:
+    """
+    Append-only record of completed chunks.
+
+    Args:
+        path: Checkpoint file (JSON Lines)
+        resume: Load existing records; otherwise the file is started afresh
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.responses: Dict[str, str] = {}
+        self.results: Dict[str, List[Dict[str, Any]]] = {}
+        self.ignored_lines = 0
+
+        if resume and self.path.exists():
+            self._load()
+        elif self.path.exists():
+            self.path.unlink()
+        self._file = open(self.path, "a", encoding="utf-8")
+        if self._file.tell() and not self._ends_with_newline():
+            # Start after a line that was cut short rather than continuing it
+            self._file.write("\n")
+
+    def _load(self):
+        with open(self.path, encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    self.ignored_lines += 1
+                    continue
+                if "results" in record:
+                    self.results[record["key"]] = record["results"]
+                elif "response" in record:
+                    self.responses[record["key"]] = record["response"]
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as handle:
+            handle.seek(-1, os.SEEK_END)
+            return handle.read(1) == b"\n"
+
+    def _append(self, record: Dict[str, Any]):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def done(self, key: str) -> bool:
+        """Whether a chunk's response has been received."""
+        return key in self.results or key in self.responses
+
+    def record_response(self, key: str, index: int, response: str):
+        """Record a chunk's raw response as soon as it arrives."""
+        self.responses[key] = response
+        self._append({"key": key, "chunk": index, "response": response})
+
+    def record_results(self, key: str, index: int, results: List[Dict[str, Any]]):
+        """Record a chunk's parsed results."""
+        self.results[key] = results
+        self._append({"key": key, "chunk": index, "results": results})
+
+    def close(self):
+        """Close the checkpoint file."""
+        self._file.close()
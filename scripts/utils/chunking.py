@@ -0,0 +1,204 @@
+"""
+Structure-aware corpus chunking under a token budget.
+
+Long corpora are split so each chunk fits a model's context comfortably.
+Splits prefer the strongest structural boundary available: chapter headings
+first, then section headings, then paragraph breaks, then sentence ends, and
+only as a last resort a hard cut. Consecutive chunks can overlap by a few
+trailing paragraphs or sentences so entities spanning a boundary are seen
+whole at least once.
+"""
+
+import re
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+DEFAULT_MAX_TOKENS = 30_000
+DEFAULT_OVERLAP_TOKENS = 500
+
+# Rough average for English prose; good enough for budgeting, not billing
+DEFAULT_CHARS_PER_TOKEN = 4.0
+
+# A heading longer than this, or ending like a sentence, is taken for prose
+MAX_HEADING_CHARS = 80
+
+# "Chapter 3", "Part IV: Methods", "Book One"; or a short keyword line without
+# closing punctuation ("Chapter the Last"), so "Part of the problem is..." is prose
+_NUMERAL = r"(?:\d+|[ivxlcdm]+|one|two|three|four|five|six|seven|eight|nine|ten|eleven|twelve)"
+CHAPTER_PATTERN = re.compile(
+    r"^[ \t]*(?:"
+    rf"(?:chapter|part|book)[ \t]+{_NUMERAL}[ \t]*(?:[:.\-\u2013\u2014].*)?"
+    rf"|(?:chapter|part|book)\b[^\n.!?]{{0,{MAX_HEADING_CHARS}}}"
+    r"|#[ \t].*"
+    r")$",
+    re.IGNORECASE | re.MULTILINE,
+)
+SECTION_PATTERN = re.compile(r"^[ \t]*(?:section\b|#{2,6}[ \t]).*$", re.IGNORECASE | re.MULTILINE)
+PARAGRAPH_PATTERN = re.compile(r"\n[ \t]*\n\s*")
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
+
+@dataclass
+class Chunk:
+    """A contiguous slice of the corpus."""
+
+    index: int
+    start: int
+    end: int
+    text: str
+    headings: List[str] = field(default_factory=list)
+
+    @property
+    def location(self) -> str:
+        """Human-readable position, e.g. ``Chapter 2 > Section 2.1``."""
+        return " > ".join(self.headings)
+
+
+def estimate_tokens(text: str, chars_per_token: float = DEFAULT_CHARS_PER_TOKEN) -> int:
+    """Estimate the token count of ``text``."""
+    return int(len(text) / chars_per_token) + 1
+
+
+def _is_bare_heading(piece: str) -> bool:
+    """Whether ``piece`` is a lone short line like ``Chapter 3`` or ``## Methods``."""
+    piece = piece.strip()
+    return "\n" not in piece and len(piece) <= MAX_HEADING_CHARS and not piece.endswith((".", "!", "?"))
+
+
+def _boundaries(pattern: re.Pattern, text: str, start: int, end: int) -> List[int]:
+    """Split positions for ``pattern`` strictly inside ``(start, end)``."""
+    positions = []
+    for match in pattern.finditer(text, start, end):
+        # Headings start a new piece; separators end the previous one
+        position = match.start() if pattern in (CHAPTER_PATTERN, SECTION_PATTERN) else match.end()
+        if start < position < end:
+            positions.append(position)
+    return positions
+
+
+class _Splitter:
+    """Recursive splitter producing spans that each fit the budget."""
+
+    LEVELS = (CHAPTER_PATTERN, SECTION_PATTERN, PARAGRAPH_PATTERN, SENTENCE_PATTERN)
+    # Levels whose cuts may separate a heading from its text; sentence cuts never do
+    HEADING_LEVELS = 3
+
+    def __init__(self, text: str, max_chars: int):
+        self.text = text
+        self.max_chars = max_chars
+
+    def split(self, start: int, end: int, level: int = 0) -> List[Tuple[int, int]]:
+        if end - start <= self.max_chars:
+            return [(start, end)]
+        if level == len(self.LEVELS):
+            return [
+                (position, min(position + self.max_chars, end))
+                for position in range(start, end, self.max_chars)
+            ]
+
+        cuts = _boundaries(self.LEVELS[level], self.text, start, end)
+        if not cuts:
+            return self.split(start, end, level + 1)
+
+        # Keep a bare heading line together with the text it introduces
+        kept = cuts
+        if level < self.HEADING_LEVELS:
+            kept = []
+            previous = start
+            for cut in cuts:
+                if not _is_bare_heading(self.text[previous:cut]):
+                    kept.append(cut)
+                    previous = cut
+
+        spans = []
+        edges = [start, *kept, end]
+        for piece_start, piece_end in zip(edges, edges[1:]):
+            spans.extend(self.split(piece_start, piece_end, level + 1))
+        return spans
+
+
+def _heading_index(text: str) -> Tuple[List[int], List[Tuple[str, str]]]:
+    """Positions and ``(kind, line)`` of every chapter and section heading."""
+    headings = [(m.start(), ("chapter", m.group().strip())) for m in CHAPTER_PATTERN.finditer(text)]
+    headings += [(m.start(), ("section", m.group().strip())) for m in SECTION_PATTERN.finditer(text)]
+    headings.sort()
+    return [position for position, _ in headings], [heading for _, heading in headings]
+
+
+def _headings_at(position: int, index: Tuple[List[int], List[Tuple[str, str]]]) -> List[str]:
+    """Chapter and section headings in force at ``position``."""
+    positions, headings = index
+    chapter: Optional[str] = None
+    section: Optional[str] = None
+    # Walk back from the nearest heading until the enclosing chapter is found
+    for i in range(bisect_right(positions, position) - 1, -1, -1):
+        kind, line = headings[i]
+        if kind == "section" and section is None:
+            section = line
+        elif kind == "chapter":
+            chapter = line
+            break
+    return [line for line in (chapter, section) if line]
+
+
+def chunk_corpus(
+    text: str,
+    max_tokens: int = DEFAULT_MAX_TOKENS,
+    overlap_tokens: int = DEFAULT_OVERLAP_TOKENS,
+    chars_per_token: float = DEFAULT_CHARS_PER_TOKEN,
+) -> List[Chunk]:
+    """
+    Split ``text`` into chunks of at most ``max_tokens`` estimated tokens.
+
+    Args:
+        text: Corpus text
+        max_tokens: Token budget per chunk, including overlap
+        overlap_tokens: Budget for trailing context repeated from the previous chunk
+        chars_per_token: Characters per token used for estimation
+
+    Returns:
+        Chunks in corpus order; a corpus that fits the budget is one chunk
+    """
+    if max_tokens < 1:
+        raise ValueError("max_tokens must be at least 1")
+    if not 0 <= overlap_tokens < max_tokens:
+        raise ValueError("overlap_tokens must be between 0 and max_tokens")
+
+    if not text:
+        return []
+
+    max_chars = max(1, int(max_tokens * chars_per_token))
+    overlap_chars = int(overlap_tokens * chars_per_token)
+
+    # Spans leave room for the overlap so chunk size stays within budget
+    spans = _Splitter(text, max(1, max_chars - overlap_chars)).split(0, len(text))
+    headings = _heading_index(text)
+
+    chunks: List[Chunk] = []
+    first = 0
+    while first < len(spans):
+        # Greedily extend the chunk while it fits
+        last = first
+        while last + 1 < len(spans) and spans[last + 1][1] - spans[first][0] <= max_chars - overlap_chars:
+            last += 1
+
+        # Prepend whole trailing spans of the previous chunk as overlap
+        start = spans[first][0]
+        if chunks and overlap_chars:
+            back = first
+            while back > 0 and spans[first][0] - spans[back - 1][0] <= overlap_chars:
+                back -= 1
+            start = spans[back][0]
+
+        end = spans[last][1]
+        chunks.append(Chunk(
+            index=len(chunks),
+            start=start,
+            end=end,
+            text=text[start:end],
+            headings=_headings_at(spans[first][0], headings),
+        ))
+        first = last + 1
+
+    return chunks
@@ -0,0 +1,121 @@
+"""
+Relevance-selected context of existing nodes for extraction prompts.
+
+Instead of pasting an arbitrary sample of the graph into every prompt,
+``NodeIndex`` builds a small lexical index over existing node names and ids
+and, for each corpus chunk, picks the nodes that chunk actually talks about.
+The selection is rendered as a compact tab-separated table and cut off at a
+token budget, so the context costs a predictable, small share of the prompt.
+
+Scoring is BM25-like: each chunk term that also occurs in a node's name or
+id slug contributes its inverse document frequency, weighted by how often
+the chunk uses it. A node whose full name appears verbatim in the chunk gets
+a large bonus, so exact mentions always come first.
+"""
+
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from scripts.utils.chunking import estimate_tokens
+
+DEFAULT_CONTEXT_TOKENS = 2000
+
+_TOKEN_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it its of on or that the this to was were with".split()
+)
+EXACT_MATCH_BONUS = 10.0
+# Terms shared by more than this share of nodes carry no signal
+MAX_DOCUMENT_FREQUENCY = 0.05
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords or single characters."""
+    return [
+        token for token in _TOKEN_PATTERN.findall(text.lower())
+        if len(token) > 1 and token not in _STOPWORDS
+    ]
+
+
+def _id_terms(node_id: str) -> str:
+    """Readable part of an id such as ``concept:climate_change``."""
+    return str(node_id).split(":", 1)[-1].replace("_", " ").replace("-", " ")
+
+
+class NodeIndex:
+    """Inverted index over existing nodes' names and id slugs."""
+
+    def __init__(self, nodes: Sequence[Dict]):
+        self.nodes = [node for node in nodes if node.get("id") is not None]
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        self.names: List[str] = []
+
+        for index, node in enumerate(self.nodes):
+            name = str(node.get("name") or "")
+            self.names.append(name.lower())
+            for term in set(tokenize(name) + tokenize(_id_terms(node["id"]))):
+                self.postings[term].append(index)
+
+        total = max(1, len(self.nodes))
+        self.idf = {
+            term: math.log(1 + (total - len(posting) + 0.5) / (len(posting) + 0.5))
+            for term, posting in self.postings.items()
+        }
+        self.max_postings = max(10, int(total * MAX_DOCUMENT_FREQUENCY))
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def select(self, text: str, limit: Optional[int] = None) -> List[Dict]:
+        """Nodes relevant to ``text``, best first."""
+        term_counts = Counter(tokenize(text))
+        scores: Dict[int, float] = defaultdict(float)
+        for term, count in term_counts.items():
+            posting = self.postings.get(term)
+            if not posting or len(posting) > self.max_postings:
+                continue
+            weight = self.idf[term] * (1 + math.log(count))
+            for index in posting:
+                scores[index] += weight
+
+        if not scores:
+            return []
+
+        # Verbatim mentions are only checked for candidates, not the whole index
+        lowered = text.lower()
+        for index in scores:
+            name = self.names[index]
+            if len(name) > 2 and name in lowered:
+                scores[index] += EXACT_MATCH_BONUS
+
+        ranked = sorted(scores, key=lambda index: (-scores[index], index))
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [self.nodes[index] for index in ranked]
+
+
+def render_table(nodes: Iterable[Dict], token_budget: int = DEFAULT_CONTEXT_TOKENS) -> str:
+    """
+    Render nodes as a tab-separated ``label, id, name`` table within a token budget.
+
+    Rows are added in order until the next one would exceed the budget.
+    """
+    lines = ["label\tid\tname"]
+    used = estimate_tokens(lines[0])
+    for node in nodes:
+        name = str(node.get("name") or "").replace("\t", " ").replace("\n", " ")
+        line = f"{node.get('label') or ''}\t{node['id']}\t{name}"
+        cost = estimate_tokens(line)
+        if used + cost > token_budget:
+            break
+        lines.append(line)
+        used += cost
+    return "\n".join(lines) if len(lines) > 1 else ""
+
+
+def build_context(index: NodeIndex, text: str, token_budget: int = DEFAULT_CONTEXT_TOKENS) -> str:
+    """Compact table of the existing nodes most relevant to ``text``."""
+    # Rows cost at least a few tokens each, which bounds how many can fit
+    return render_table(index.select(text, limit=token_budget // 4 + 1), token_budget)
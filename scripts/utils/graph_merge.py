@@ -0,0 +1,233 @@
+"""
+Merge sweep results that may describe the same elements.
+
+Chunked extraction produces one result per chunk, and overlapping chunks
+(or chunks that mention the same concept) return the same node more than
+once. ``GraphMerger`` folds any number of results into one:
+
+- nodes are keyed on ``id``; labels are unioned in first-seen order
+- relationships are keyed on ``(source_id, type, target_id)``
+- enrichments are keyed on ``(target_id, label)``
+
+Conflicting property values are resolved by a policy: ``first`` keeps the
+value seen first, ``last`` lets later results win, and ``longest`` keeps the
+longer text (useful when overlapping chunks summarise the same passage with
+different amounts of context). Non-conflicting properties are always kept.
+
+The merged elements live in dicts by default. With ``spill_dir`` they are
+kept in a temporary SQLite file instead (``DiskMap``), so merging many large
+sweeps is bounded by disk rather than memory.
+"""
+
+import json
+import shutil
+import sqlite3
+import tempfile
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+CONFLICT_POLICIES = ("first", "last", "longest")
+
+
+def element_id(node: dict) -> Optional[Any]:
+    """Id of a sweep node, from ``properties.id`` or a top-level ``id``."""
+    properties = node.get("properties") or {}
+    return properties.get("id", node.get("id"))
+
+
+def _resolve(current: Any, new: Any, policy: str) -> Any:
+    """Pick between two conflicting property values."""
+    if policy == "first":
+        return current
+    if policy == "longest":
+        return new if len(str(new)) > len(str(current)) else current
+    return new
+
+
+class DiskMap:
+    """
+    Dict-like map of JSON values stored in a SQLite file.
+
+    Supports the subset of the dict interface ``GraphMerger`` uses. Values
+    are copies: a value changed after ``get`` must be stored again.
+    Iteration follows first-insertion order, like a dict.
+    """
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path)
+        # Scratch data: durability is not needed
+        self._conn.execute("PRAGMA journal_mode = OFF")
+        self._conn.execute("PRAGMA synchronous = OFF")
+        self._conn.execute("CREATE TABLE items (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._length = 0
+
+    @staticmethod
+    def _key(key: Any) -> str:
+        return json.dumps(key, ensure_ascii=False)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        row = self._conn.execute("SELECT value FROM items WHERE key = ?", (self._key(key),)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def __setitem__(self, key: Any, value: Any):
+        self._conn.execute(
+            "INSERT INTO items (key, value) VALUES (?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (self._key(key), json.dumps(value, ensure_ascii=False))
+        )
+        self._length = None
+
+    def __len__(self) -> int:
+        if self._length is None:
+            self._length = self._conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+        return self._length
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def values(self) -> Iterator[Any]:
+        for (value,) in self._conn.execute("SELECT value FROM items ORDER BY rowid"):
+            yield json.loads(value)
+
+    def close(self):
+        self._conn.close()
+
+
+class GraphMerger:
+    """
+    Accumulate sweep results and emit one deduplicated result.
+
+    Args:
+        conflict_policy: ``first``, ``last`` or ``longest``
+        spill_dir: Keep merged elements in a SQLite file under this
+            directory instead of in memory
+    """
+
+    def __init__(self, conflict_policy: str = "last", spill_dir: Optional[str] = None):
+        if conflict_policy not in CONFLICT_POLICIES:
+            raise ValueError(
+                f"Unknown conflict policy {conflict_policy!r}; choose from {', '.join(CONFLICT_POLICIES)}"
+            )
+        self.conflict_policy = conflict_policy
+        self.extra: Dict[str, Any] = {}
+        self.stats = Counter()
+        self._spill_path = None
+        if spill_dir is None:
+            self.nodes: Dict[Any, dict] = {}
+            self.relationships: Dict[Tuple[Any, str, Any], dict] = {}
+            self.enrichments: Dict[Tuple[Any, Optional[str]], dict] = {}
+        else:
+            self._spill_path = tempfile.mkdtemp(prefix="graph_merge_", dir=spill_dir)
+            self.nodes = DiskMap(f"{self._spill_path}/nodes.sqlite")
+            self.relationships = DiskMap(f"{self._spill_path}/relationships.sqlite")
+            self.enrichments = DiskMap(f"{self._spill_path}/enrichments.sqlite")
+
+    def _merge_properties(self, target: dict, properties: dict):
+        for key, value in properties.items():
+            if value is None:
+                continue
+            current = target.get(key)
+            if current is None:
+                target[key] = value
+            elif current != value:
+                target[key] = _resolve(current, value, self.conflict_policy)
+                self.stats["property_conflicts"] += 1
+
+    def add_node(self, node: dict):
+        """Merge one sweep node."""
+        node_id = element_id(node)
+        if node_id is None:
+            self.stats["nodes_without_id"] += 1
+            return
+
+        existing = self.nodes.get(node_id)
+        if existing is None:
+            properties = dict(node.get("properties") or {})
+            properties["id"] = node_id
+            self.nodes[node_id] = {
+                "id": node_id,
+                "labels": list(dict.fromkeys(node.get("labels") or [])),
+                "properties": properties,
+            }
+            return
+
+        self.stats["duplicate_nodes"] += 1
+        for label in node.get("labels") or []:
+            if label not in existing["labels"]:
+                existing["labels"].append(label)
+        self._merge_properties(existing["properties"], node.get("properties") or {})
+        # Store back for DiskMap, whose values are copies
+        self.nodes[node_id] = existing
+
+    def add_relationship(self, rel: dict):
+        """Merge one sweep relationship."""
+        key = (rel["source_id"], rel["type"], rel["target_id"])
+        existing = self.relationships.get(key)
+        if existing is None:
+            self.relationships[key] = {
+                "source_id": rel["source_id"],
+                "target_id": rel["target_id"],
+                "type": rel["type"],
+                "properties": dict(rel.get("properties") or {}),
+            }
+            return
+
+        self.stats["duplicate_relationships"] += 1
+        self._merge_properties(existing["properties"], rel.get("properties") or {})
+        self.relationships[key] = existing
+
+    def add_enrichment(self, enrichment: dict):
+        """Merge one sweep enrichment."""
+        target_id = enrichment.get("target_id", enrichment.get("id"))
+        key = (target_id, enrichment.get("label"))
+        existing = self.enrichments.get(key)
+        if existing is None:
+            merged = {key_: value for key_, value in enrichment.items() if key_ != "properties"}
+            merged["properties"] = dict(enrichment.get("properties") or {})
+            self.enrichments[key] = merged
+            return
+
+        self.stats["duplicate_enrichments"] += 1
+        self._merge_properties(existing["properties"], enrichment.get("properties") or {})
+        self.enrichments[key] = existing
+
+    def add(self, data: dict):
+        """Merge a whole sweep result (``nodes``/``relationships``/``enrichments``)."""
+        for node in data.get("nodes") or []:
+            self.add_node(node)
+        for rel in data.get("relationships") or []:
+            self.add_relationship(rel)
+        for enrichment in data.get("enrichments") or []:
+            self.add_enrichment(enrichment)
+        # Keep scalar metadata such as sweep_id from the first result that has it
+        for key, value in data.items():
+            if key not in ("nodes", "relationships", "enrichments", "statistics"):
+                self.extra.setdefault(key, value)
+
+    def add_all(self, results: Iterable[dict]):
+        """Merge several sweep results in order."""
+        for data in results:
+            self.add(data)
+
+    def iter_section(self, section: str) -> Iterator[dict]:
+        """Stream the merged elements of ``nodes``, ``relationships`` or ``enrichments``."""
+        return iter(getattr(self, section).values())
+
+    def result(self) -> Dict[str, List[dict]]:
+        """Return the merged result; empty sections are omitted."""
+        merged: Dict[str, Any] = dict(self.extra)
+        if self.nodes:
+            merged["nodes"] = list(self.nodes.values())
+        if self.relationships:
+            merged["relationships"] = list(self.relationships.values())
+        if self.enrichments:
+            merged["enrichments"] = list(self.enrichments.values())
+        return merged
+
+    def close(self):
+        """Release the spill files, if any."""
+        if self._spill_path is not None:
+            for store in (self.nodes, self.relationships, self.enrichments):
+                store.close()
+            shutil.rmtree(self._spill_path, ignore_errors=True)
+            self._spill_path = None
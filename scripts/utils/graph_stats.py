@@ -0,0 +1,238 @@
+"""
+Graph statistics snapshot for the Dashboard.
+
+Two kinds of numbers are kept apart:
+
+- Counts (nodes and relationships in total, per label, per relationship
+  type, and per label and type in each direction) come from Neo4j's count
+  store. A query like ``MATCH (:Concept)-[:MENTIONS]->() RETURN count(*)``
+  is answered from stored counters without touching the graph, so they are
+  cheap enough to read on every refresh.
+- Profiles (property fill rates and degree histograms per label) need a pass
+  over the label's nodes. They are computed only for labels that may have
+  changed: labels an import wrote to, and labels whose count-store counts
+  differ from the previous snapshot. Every other label keeps its earlier
+  profile. A refresh without profiling (after a small import) records the
+  labels it skipped as ``pending``, and the next profiling refresh picks
+  them up.
+
+The snapshot is stored as JSON on a single ``:GraphStats`` node. That node
+has no ``id`` and no base label, so imports, searches and browsing never see
+it, and reading the snapshot costs the same however large the graph is.
+"""
+
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+STATS_LABEL = "GraphStats"
+SNAPSHOT_VERSION = 1
+
+# Label shared by every imported node; profiling it would scan the whole graph
+BASE_LABEL = "Node"
+
+
+def _quote(name: str) -> str:
+    return "`" + str(name).replace("`", "``") + "`"
+
+
+def _scalar(session, query: str) -> int:
+    return session.run(query).single()[0]
+
+
+def _union_counts(session, branches: List[str]) -> List[int]:
+    """Run count-store queries as one ``UNION ALL`` round trip, in order."""
+    if not branches:
+        return []
+    query = "\nUNION ALL\n".join(
+        f"{branch} RETURN {position} AS position, count(*) AS count"
+        for position, branch in enumerate(branches)
+    )
+    counts = [0] * len(branches)
+    for record in session.run(query):
+        counts[record["position"]] = record["count"]
+    return counts
+
+
+def degree_bucket(degree: int) -> str:
+    """Histogram bucket of a node degree: ``0``, ``1``, ``2-3``, ``4-7``, ..."""
+    if degree < 2:
+        return str(degree)
+    low = 1 << (degree.bit_length() - 1)
+    return f"{low}-{2 * low - 1}"
+
+
+def read_counts(session) -> Dict[str, Any]:
+    """
+    Read node and relationship counts from the count store.
+
+    Returns:
+        Dict with ``nodes``, ``relationships``, ``labels`` (count per label),
+        ``relationship_types`` (count per type) and ``label_relationships``
+        (per label, per type, ``[outgoing, incoming]`` for the pairs that
+        occur)
+    """
+    labels = sorted(
+        record[0] for record in session.run("CALL db.labels()") if record[0] != STATS_LABEL
+    )
+    rel_types = sorted(record[0] for record in session.run("CALL db.relationshipTypes()"))
+
+    label_counts = _union_counts(session, [f"MATCH (:{_quote(label)})" for label in labels])
+    type_counts = _union_counts(session, [f"MATCH ()-[:{_quote(rel_type)}]->()" for rel_type in rel_types])
+
+    label_relationships = {}
+    for label in labels:
+        if label == BASE_LABEL:
+            continue
+        branches = []
+        for rel_type in rel_types:
+            branches.append(f"MATCH (:{_quote(label)})-[:{_quote(rel_type)}]->()")
+            branches.append(f"MATCH ()-[:{_quote(rel_type)}]->(:{_quote(label)})")
+        counts = _union_counts(session, branches)
+        pairs = {
+            rel_type: counts[2 * position:2 * position + 2]
+            for position, rel_type in enumerate(rel_types)
+            if any(counts[2 * position:2 * position + 2])
+        }
+        if pairs:
+            label_relationships[label] = pairs
+
+    return {
+        "nodes": _scalar(session, "MATCH (n) RETURN count(n)")
+        - _scalar(session, f"MATCH (n:{_quote(STATS_LABEL)}) RETURN count(n)"),
+        "relationships": _scalar(session, "MATCH ()-[r]->() RETURN count(r)"),
+        "labels": dict(zip(labels, label_counts)),
+        "relationship_types": dict(zip(rel_types, type_counts)),
+        "label_relationships": label_relationships,
+    }
+
+
+def profile_label(session, label: str) -> Dict[str, Any]:
+    """
+    Property fill counts and degree histogram of the nodes with ``label``.
+
+    Each is one pass over the label's nodes, aggregated by the server;
+    degrees are read from each node's relationship counters rather than by
+    expanding its relationships.
+    """
+    query = f"""
+    MATCH (n:{_quote(label)})
+    UNWIND keys(n) AS key
+    RETURN key, count(*) AS filled
+    """
+    properties = {record["key"]: record["filled"] for record in session.run(query)}
+
+    query = f"""
+    MATCH (n:{_quote(label)})
+    WITH COUNT {{ (n)--() }} AS degree
+    RETURN degree, count(*) AS nodes
+    """
+    degrees = {record["degree"]: record["nodes"] for record in session.run(query)}
+
+    histogram = {}
+    for degree in sorted(degrees):
+        bucket = degree_bucket(degree)
+        histogram[bucket] = histogram.get(bucket, 0) + degrees[degree]
+
+    return {
+        "count": sum(degrees.values()),
+        "properties": dict(sorted(properties.items())),
+        "degrees": histogram,
+        "max_degree": max(degrees) if degrees else 0,
+        "profiled_at": _now(),
+    }
+
+
+def load_snapshot(session) -> Optional[Dict[str, Any]]:
+    """Return the stored snapshot, or ``None`` if there is none (or an older format)."""
+    record = session.run(
+        f"MATCH (s:{_quote(STATS_LABEL)}) RETURN s.snapshot AS snapshot LIMIT 1"
+    ).single()
+    if record is None or not record["snapshot"]:
+        return None
+    snapshot = json.loads(record["snapshot"])
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        return None
+    return snapshot
+
+
+def save_snapshot(session, snapshot: Dict[str, Any]):
+    """Store ``snapshot`` on the single stats node."""
+    session.run(
+        f"MERGE (s:{_quote(STATS_LABEL)}) SET s.snapshot = $snapshot, s.updated_at = $updated_at",
+        snapshot=json.dumps(snapshot, ensure_ascii=False),
+        updated_at=snapshot["updated_at"],
+    ).consume()
+
+
+def stale_labels(previous: Optional[Dict[str, Any]], counts: Dict[str, Any]) -> List[str]:
+    """Labels whose count-store counts changed since ``previous`` (all of them without one)."""
+    labels = [label for label in counts["labels"] if label != BASE_LABEL]
+    if previous is None:
+        return labels
+    profiles = previous.get("profiles", {})
+    return [
+        label for label in labels
+        if label not in profiles
+        or previous["labels"].get(label) != counts["labels"][label]
+        or previous["label_relationships"].get(label) != counts["label_relationships"].get(label)
+    ]
+
+
+def refresh_snapshot(
+    driver,
+    touched: Optional[Iterable[str]] = None,
+    full: bool = False,
+    profile: bool = True,
+) -> Dict[str, Any]:
+    """
+    Recompute the counts, re-profile labels that may have changed, and store the result.
+
+    Args:
+        driver: ``neo4j.Driver``
+        touched: Labels whose properties were written since the last refresh
+        full: Re-profile every label regardless
+        profile: Re-profile changed labels now; without it only the counts
+            are refreshed and the changed labels are left ``pending``
+
+    Returns:
+        The stored snapshot, with a ``refreshed`` list of re-profiled labels
+        and a ``pending`` list of labels whose profiles are out of date
+    """
+    touched = set(touched or ())
+    with driver.session() as session:
+        previous = None if full else load_snapshot(session)
+        counts = read_counts(session)
+
+        labels = [label for label in counts["labels"] if label != BASE_LABEL]
+        if full or previous is None:
+            refresh = labels
+        else:
+            stale = set(stale_labels(previous, counts)) | touched | set(previous.get("pending", ()))
+            refresh = [label for label in labels if label in stale]
+        pending = []
+        if not profile and not full:
+            pending, refresh = refresh, []
+
+        profiles = {
+            label: profile
+            for label, profile in (previous or {}).get("profiles", {}).items()
+            if label in counts["labels"]
+        }
+        for label in refresh:
+            profiles[label] = profile_label(session, label)
+
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "updated_at": _now(),
+            **counts,
+            "profiles": dict(sorted(profiles.items())),
+            "refreshed": refresh,
+            "pending": pending,
+        }
+        save_snapshot(session, snapshot)
+    return snapshot
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
@@ -0,0 +1,200 @@
+"""
+Content-hash manifest for incremental (delta) imports.
+
+The manifest is a local SQLite file recording, for every node ``id`` and
+relationship ``(source_id, type, target_id)`` an import has written, a hash
+over its labels, properties and endpoints. Later imports of the same source
+consult it to send only new and changed rows, and can list the rows that
+disappeared from the source so they can be deleted.
+
+A row's new hash is only recorded once the database has confirmed writing
+it: ``filter_changed`` holds the hash as pending, and the importer calls
+``confirm`` with the keys its write transaction returned. A row whose batch
+failed, or whose relationship endpoints were not found, keeps its old hash
+(or stays unrecorded) and is sent again by the next delta import.
+
+Entries are scoped, normally to the database URI plus the resolved sweep
+file path, so re-importing one sweep never treats another sweep's rows as
+missing.
+"""
+
+import json
+import sqlite3
+import hashlib
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, List
+
+DEFAULT_MANIFEST_PATH = "output/manifests/import_manifest.sqlite"
+
+NODE = "node"
+RELATIONSHIP = "relationship"
+
+
+def _digest(payload: Any) -> str:
+    """Stable hash of a JSON-compatible payload."""
+    text = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def node_key(node: dict) -> str:
+    """Manifest key of a sweep node."""
+    return str(node["properties"]["id"])
+
+
+def node_hash(node: dict) -> str:
+    """Content hash of a sweep node over its labels and properties."""
+    return _digest({
+        "labels": sorted(node.get("labels") or []),
+        "properties": node["properties"],
+    })
+
+
+def relationship_key(rel: dict) -> str:
+    """Manifest key of a sweep relationship (its MERGE identity)."""
+    return json.dumps([rel["source_id"], rel["type"], rel["target_id"]], ensure_ascii=False)
+
+
+def relationship_hash(rel: dict) -> str:
+    """Content hash of a sweep relationship over its endpoints, type and properties."""
+    return _digest({
+        "source_id": rel["source_id"],
+        "target_id": rel["target_id"],
+        "type": rel["type"],
+        "properties": rel.get("properties") or {},
+    })
+
+
+class ImportManifest:
+    """
+    Per-scope record of what has been imported, keyed on content hashes.
+
+    Confirmed writes are committed as they are confirmed; call ``commit`` at
+    the end of a successful run to persist which rows were seen, or
+    ``rollback`` to discard that.
+    """
+
+    def __init__(self, path: str = DEFAULT_MANIFEST_PATH, scope: str = "default"):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.scope = scope
+        self.stats = Counter()
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                scope TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                run INTEGER NOT NULL,
+                PRIMARY KEY (scope, kind, key)
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_by_key ON entries (kind, key)")
+        # New hashes waiting for the database to confirm the write
+        self._conn.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS pending (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                PRIMARY KEY (kind, key)
+            ) WITHOUT ROWID
+        """)
+        self._conn.commit()
+
+        row = self._conn.execute(
+            "SELECT COALESCE(MAX(run), 0) FROM entries WHERE scope = ?", (scope,)
+        ).fetchone()
+        self.run = row[0] + 1
+
+    def filter_changed(
+        self,
+        kind: str,
+        items: Iterable[dict],
+        key_fn: Callable[[dict], str],
+        hash_fn: Callable[[dict], str],
+    ) -> Iterator[dict]:
+        """
+        Yield only the items that are new or whose content hash changed.
+
+        Every item, changed or not, is marked as seen in this run. The new
+        hash of a yielded item is recorded only when ``confirm`` is called
+        with its key.
+        """
+        lookup = "SELECT hash FROM entries WHERE scope = ? AND kind = ? AND key = ?"
+        for item in items:
+            key = key_fn(item)
+            digest = hash_fn(item)
+            row = self._conn.execute(lookup, (self.scope, kind, key)).fetchone()
+            if row is not None and row[0] == digest:
+                self._conn.execute(
+                    "UPDATE entries SET run = ? WHERE scope = ? AND kind = ? AND key = ?",
+                    (self.run, self.scope, kind, key)
+                )
+                self.stats[f"{kind}_unchanged"] += 1
+                continue
+
+            if row is not None:
+                # Still provided by this source, so not missing, but not yet rewritten
+                self._conn.execute(
+                    "UPDATE entries SET run = ? WHERE scope = ? AND kind = ? AND key = ?",
+                    (self.run, self.scope, kind, key)
+                )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pending (kind, key, hash) VALUES (?, ?, ?)", (kind, key, digest)
+            )
+            self.stats[f"{kind}_{'new' if row is None else 'changed'}"] += 1
+            yield item
+
+    def confirm(self, kind: str, keys: Iterable[str]):
+        """Record the pending hashes of ``keys``, which the database reported as written."""
+        keys = [(kind, key) for key in keys]
+        self._conn.executemany("""
+            INSERT OR REPLACE INTO entries (scope, kind, key, hash, run)
+            SELECT ?, kind, key, hash, ? FROM pending WHERE kind = ? AND key = ?
+        """, [(self.scope, self.run, kind, key) for kind, key in keys])
+        self._conn.executemany("DELETE FROM pending WHERE kind = ? AND key = ?", keys)
+        self._conn.commit()
+        self.stats[f"{kind}_confirmed"] += len(keys)
+
+    def unconfirmed(self, kind: str) -> int:
+        """Number of yielded items of ``kind`` the database has not confirmed."""
+        return self._conn.execute("SELECT COUNT(*) FROM pending WHERE kind = ?", (kind,)).fetchone()[0]
+
+    def missing(self, kind: str) -> List[str]:
+        """
+        Keys recorded for this scope but not seen in the current run.
+
+        Keys still recorded under another scope are left out, since another
+        source still provides them.
+        """
+        rows = self._conn.execute("""
+            SELECT e.key FROM entries e
+            WHERE e.scope = ? AND e.kind = ? AND e.run < ?
+              AND NOT EXISTS (
+                  SELECT 1 FROM entries o
+                  WHERE o.kind = e.kind AND o.key = e.key AND o.scope != e.scope
+              )
+        """, (self.scope, kind, self.run))
+        return [key for (key,) in rows]
+
+    def forget_missing(self):
+        """Drop entries for this scope that were not seen in the current run."""
+        self._conn.execute(
+            "DELETE FROM entries WHERE scope = ? AND run < ?", (self.scope, self.run)
+        )
+
+    def commit(self):
+        """Persist this run's changes; hashes never confirmed are dropped."""
+        self._conn.execute("DELETE FROM pending")
+        self._conn.commit()
+
+    def rollback(self):
+        """Discard this run's unconfirmed changes."""
+        self._conn.rollback()
+        self._conn.execute("DELETE FROM pending")
+        self._conn.commit()
+
+    def close(self):
+        """Close the manifest file, discarding uncommitted changes."""
+        self._conn.close()
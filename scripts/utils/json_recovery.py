@@ -0,0 +1,253 @@
+"""
+Salvage sweep results from truncated or slightly malformed model output.
+
+A response that runs into the output-token limit stops mid-element, and a
+strict ``json.loads`` then discards everything. ``recover_json`` instead
+walks the top-level object member by member and keeps every element that
+decodes on its own:
+
+- a malformed element inside ``nodes``/``relationships``/``enrichments`` is
+  skipped up to the next element that parses, and its span is reported
+- trailing and doubled commas are tolerated
+- where the input ends (or cannot be followed any further) the offset in
+  the response text and the member being read are reported, so the caller
+  can ask the model for only the missing tail
+
+Well-formed responses take the ``json`` fast path unchanged.
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from scripts.utils.json_stream import JSONStreamError, _name_prefix
+
+SECTIONS = ("nodes", "relationships", "enrichments")
+
+_WHITESPACE = " \t\n\r"
+_DECODER = json.JSONDecoder()
+_SECTION_START = re.compile(r'"(%s)"\s*:\s*\[' % "|".join(SECTIONS))
+
+
+def cut_in_elements(section: Optional[str]) -> bool:
+    """
+    Whether output cut off while reading member ``section`` may have lost elements.
+
+    Only a section the response opened counts. A cut inside ``nodes``,
+    ``relationships`` or ``enrichments`` did, as did one inside a member
+    name that can still become one of them (``section`` is then the part
+    that arrived). A cut inside any other member (a trailing
+    ``statistics`` object, say) or after a complete member (``section`` is
+    None) did not: a section that never appears is taken to be absent, as
+    ``enrichments`` often is.
+    """
+    if section is None:
+        return False
+    return any(name.startswith(section) for name in SECTIONS)
+
+
+@dataclass
+class RecoveredJSON:
+    """
+    Result of a tolerant parse.
+
+    Attributes:
+        data: Everything salvaged, as a regular sweep result
+        truncated: True if parsing stopped before the closing ``}``
+        cutoff: Offset in the response text where parsing stopped
+        section: Member being read at the cut-off
+        error: Why parsing stopped
+        skipped: ``(start, end)`` spans of malformed elements that were dropped
+    """
+
+    data: Dict[str, Any]
+    truncated: bool = False
+    cutoff: Optional[int] = None
+    section: Optional[str] = None
+    error: Optional[str] = None
+    skipped: List[Tuple[int, int]] = field(default_factory=list)
+
+    @property
+    def complete(self) -> bool:
+        """True if nothing was lost."""
+        return not self.truncated and not self.skipped
+
+    def counts(self) -> Dict[str, int]:
+        """Number of salvaged elements per section."""
+        return {
+            section: len(self.data[section])
+            for section in SECTIONS
+            if isinstance(self.data.get(section), list)
+        }
+
+    @property
+    def elements_truncated(self) -> bool:
+        """True if the cut-off may have lost elements, not just trailing metadata."""
+        return self.truncated and cut_in_elements(self.section)
+
+
+def _looks_like(section: str, value: Any) -> bool:
+    """Whether ``value`` can be an element of ``section`` (not a nested dict)."""
+    if not isinstance(value, dict):
+        return False
+    if section == "nodes":
+        return "labels" in value or "properties" in value
+    if section == "relationships":
+        return "source_id" in value and "target_id" in value
+    if section == "enrichments":
+        return "target_id" in value or "id" in value
+    return True
+
+
+class _Walker:
+    """Tolerant walk over one top-level object."""
+
+    def __init__(self, text: str, start: int):
+        self.text = text
+        self.pos = start + 1
+        self.result = RecoveredJSON(data={})
+
+    def peek(self) -> str:
+        text = self.text
+        while self.pos < len(text) and text[self.pos] in _WHITESPACE:
+            self.pos += 1
+        return text[self.pos] if self.pos < len(text) else ""
+
+    def stop(self, reason: str, section: Optional[str] = None, at: Optional[int] = None) -> RecoveredJSON:
+        self.result.truncated = True
+        self.result.cutoff = self.pos if at is None else at
+        self.result.section = section
+        self.result.error = reason
+        return self.result
+
+    def run(self) -> RecoveredJSON:
+        # True after "{" or ",", when the next member has been announced
+        announced = True
+        while True:
+            found = self.peek()
+            if found == "}":
+                return self.result
+            if found == ",":
+                self.pos += 1
+                announced = True
+                continue
+            if not found:
+                return self.stop("Input ends inside the top-level object", "" if announced else None)
+
+            member_start = self.pos
+            try:
+                key, self.pos = _DECODER.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError as exc:
+                return self.stop(f"Expected a member name: {exc.msg}", _name_prefix(self.text[member_start:]))
+            if not isinstance(key, str):
+                return self.stop("Expected a member name", at=member_start)
+            if self.peek() != ":":
+                return self.stop(f"Expected ':' after member name {key!r}", key, member_start)
+            self.pos += 1
+            announced = False
+
+            if self.peek() == "[":
+                self.pos += 1
+                if not self.array(key):
+                    return self.result
+                continue
+
+            value_start = self.pos
+            try:
+                value, self.pos = _DECODER.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError as exc:
+                return self.stop(f"Incomplete value for {key!r}: {exc.msg}", key, value_start)
+            self.result.data[key] = value
+
+    def array(self, key: str) -> bool:
+        """Read array elements into ``data[key]``; False if parsing has to stop."""
+        items = self.result.data.setdefault(key, [])
+        while True:
+            found = self.peek()
+            if found == "]":
+                self.pos += 1
+                return True
+            if found == ",":
+                self.pos += 1
+                continue
+            if not found:
+                self.stop(f"Input ends inside {key!r}", key)
+                return False
+
+            element_start = self.pos
+            try:
+                value, self.pos = _DECODER.raw_decode(self.text, self.pos)
+                items.append(value)
+                continue
+            except json.JSONDecodeError as exc:
+                reason = f"Incomplete element in {key!r}: {exc.msg}"
+
+            resume, closes_array = self.resume_point(key, element_start + 1)
+            if resume is None:
+                self.stop(reason, key, element_start)
+                return False
+            self.result.skipped.append((element_start, resume))
+            self.pos = resume
+            if closes_array:
+                return True
+
+    def resume_point(self, key: str, pos: int) -> Tuple[Optional[int], bool]:
+        """
+        Where to continue after a malformed element.
+
+        Returns the start of the next element of this array that decodes, or
+        the start of the next section if one comes first (with True, meaning
+        the current array is over).
+        """
+        text = self.text
+        next_section = _SECTION_START.search(text, pos)
+        limit = next_section.start() if next_section else len(text)
+
+        candidate = text.find("{", pos, limit)
+        while candidate >= 0:
+            before = candidate - 1
+            while before >= 0 and text[before] in _WHITESPACE:
+                before -= 1
+            if before >= 0 and text[before] in ",[":
+                try:
+                    value, _ = _DECODER.raw_decode(text, candidate)
+                except json.JSONDecodeError:
+                    value = None
+                if _looks_like(key, value):
+                    return candidate, False
+            candidate = text.find("{", candidate + 1, limit)
+
+        if next_section:
+            return next_section.start(), True
+        return None, False
+
+
+def recover_json(text: str) -> RecoveredJSON:
+    """
+    Parse a sweep result from model output, salvaging what a strict parse would lose.
+
+    Any prose or Markdown fence around the object is ignored.
+
+    Args:
+        text: Raw response text
+
+    Returns:
+        ``RecoveredJSON`` with the salvaged data and, if the output was cut
+        off, where and why
+
+    Raises:
+        JSONStreamError: If the text contains no JSON object at all
+    """
+    start = text.find("{")
+    if start < 0:
+        raise JSONStreamError("No JSON object in response", 0)
+
+    try:
+        data, _ = _DECODER.raw_decode(text, start)
+    except json.JSONDecodeError:
+        data = None
+    if isinstance(data, dict):
+        return RecoveredJSON(data=data)
+
+    return _Walker(text, start).run()
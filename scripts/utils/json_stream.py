@@ -0,0 +1,217 @@
+"""
+Incremental JSON parsing for sweep documents.
+
+Sweep files are a single top-level object whose large members are arrays
+(``nodes``, ``relationships``, ``enrichments``). The parser here walks that
+object from a stream of text chunks and yields array members one at a time,
+so memory stays bounded by the chunk size and the largest single element
+rather than by the size of the document.
+
+The same parser consumes model output as it streams in: with
+``skip_preamble`` it ignores anything before the first ``{`` (prose or a
+Markdown code fence), and it stops at the closing ``}`` without reading on.
+"""
+
+import json
+from functools import partial
+from typing import Any, Iterable, Iterator, Optional, Tuple
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+_WHITESPACE = " \t\n\r"
+_DECODER = json.JSONDecoder()
+
+
+class JSONStreamError(ValueError):
+    """Raised when a streamed document is malformed or ends early.
+
+    ``section`` is the top-level member being read. If the input ended
+    inside a member name, it holds the part of the name that arrived (empty
+    right after a ``,``). It is ``None`` if the error came between members.
+    """
+
+    def __init__(self, message: str, offset: int, section: Optional[str] = None):
+        super().__init__(f"{message} (at character {offset})")
+        self.offset = offset
+        self.section = section
+
+
+class _Buffer:
+    """Sliding text window over an iterator of chunks."""
+
+    def __init__(self, chunks: Iterable[str]):
+        self._chunks = iter(chunks)
+        self.text = ""
+        self.pos = 0
+        self.offset = 0  # absolute position of text[0] in the stream
+        self.eof = False
+
+    @property
+    def position(self) -> int:
+        """Absolute position of the cursor in the stream."""
+        return self.offset + self.pos
+
+    def fill(self) -> bool:
+        """Append the next non-empty chunk; return False at end of input."""
+        if self.eof:
+            return False
+        for chunk in self._chunks:
+            if chunk:
+                break
+        else:
+            self.eof = True
+            return False
+
+        # Drop everything already consumed before growing the window
+        if self.pos:
+            self.offset += self.pos
+            self.text = self.text[self.pos:]
+            self.pos = 0
+        self.text += chunk
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character, or '' at end of input."""
+        while True:
+            text = self.text
+            pos = self.pos
+            length = len(text)
+            while pos < length and text[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < length:
+                return text[pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str):
+        """Consume ``char`` or raise."""
+        found = self.peek()
+        if found != char:
+            raise JSONStreamError(
+                f"Expected {char!r} but found {found or 'end of input'!r}",
+                self.position
+            )
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode one complete JSON value at the cursor."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError as exc:
+                if self.fill():
+                    continue
+                raise JSONStreamError(f"Incomplete or invalid value: {exc.msg}", self.position) from exc
+
+            # A number or literal at the window edge may continue in the next chunk
+            if end == len(self.text) and self.fill():
+                continue
+
+            self.pos = end
+            return value
+
+
+def _name_prefix(text: str) -> Optional[str]:
+    """The start of a member name cut off at the end of ``text``, if that is all it holds."""
+    if not text:
+        return ""
+    if text[0] == '"' and '"' not in text[1:]:
+        return text[1:]
+    return None
+
+
+def iter_json_items(chunks: Iterable[str], skip_preamble: bool = False) -> Iterator[Tuple[str, Any]]:
+    """
+    Stream the members of a top-level JSON object.
+
+    Array members are yielded one element at a time as ``(key, element)``;
+    any other member is yielded whole as ``(key, value)``.
+
+    Args:
+        chunks: Iterable of text fragments that concatenate to the document
+        skip_preamble: Ignore any text before the first ``{``
+
+    Yields:
+        ``(key, value)`` tuples in document order
+
+    Raises:
+        JSONStreamError: If the document is malformed or truncated, with the
+            member being read as its ``section``
+    """
+    buf = _Buffer(chunks)
+    if skip_preamble:
+        while True:
+            found = buf.text.find("{", buf.pos)
+            if found >= 0:
+                buf.pos = found
+                break
+            buf.pos = len(buf.text)
+            if not buf.fill():
+                break
+    buf.expect("{")
+    if buf.peek() == "}":
+        return
+
+    while True:
+        try:
+            key = buf.value()
+        except JSONStreamError as exc:
+            exc.section = _name_prefix(buf.text[buf.pos:])
+            raise
+        if not isinstance(key, str):
+            raise JSONStreamError("Object keys must be strings", buf.position)
+        try:
+            buf.expect(":")
+        except JSONStreamError as exc:
+            exc.section = key
+            raise
+
+        try:
+            if buf.peek() == "[":
+                buf.pos += 1
+                if buf.peek() == "]":
+                    buf.pos += 1
+                else:
+                    while True:
+                        yield key, buf.value()
+                        found = buf.peek()
+                        buf.pos += 1
+                        if found == ",":
+                            continue
+                        if found == "]":
+                            break
+                        raise JSONStreamError(
+                            f"Expected ',' or ']' in array {key!r} but found {found or 'end of input'!r}",
+                            buf.position - 1
+                        )
+            else:
+                yield key, buf.value()
+        except JSONStreamError as exc:
+            exc.section = key
+            raise
+
+        found = buf.peek()
+        buf.pos += 1
+        if found == ",":
+            continue
+        if found == "}":
+            return
+        raise JSONStreamError(
+            f"Expected ',' or '}}' after object member but found {found or 'end of input'!r}",
+            buf.position - 1
+        )
+
+
+def iter_json_file(path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[str, Any]]:
+    """Stream the top-level members of a JSON file (see ``iter_json_items``)."""
+    with open(path, "r", encoding="utf-8") as handle:
+        yield from iter_json_items(iter(partial(handle.read, chunk_size), ""))
+
+
+def iter_json_array(path, key: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """Stream the elements of the top-level array ``key`` from a JSON file."""
+    for member, value in iter_json_file(path, chunk_size):
+        if member == key:
+            yield value
@@ -0,0 +1,519 @@
+"""
+LLM abstraction layer for sweeps.
+
+Providers wrap one model API behind a single async ``complete(prompt)`` call:
+
+- ``GeminiProvider`` (google-generativeai)
+- ``AnthropicProvider`` (anthropic)
+- ``FakeProvider`` (local, canned or computed responses for dry runs)
+
+``RequestScheduler`` runs many prompts through a provider with bounded
+concurrency, token-bucket limits on requests and tokens per minute, and
+retries with jittered exponential backoff on rate limits (429) and server
+errors (5xx). Results come back in prompt order. The limits belong to the
+scheduler, so they hold across successive ``run`` calls and streams.
+
+``RequestScheduler.iter_stream`` instead yields one response's text as the
+model produces it, for incremental parsing with ``json_stream``; streams
+take a concurrency slot and rate budget like any other request.
+
+An optional ``ResponseCache`` (see ``response_cache.py``) is consulted before
+a request is rate limited or sent, so cached prompts return immediately.
+
+Example:
+    provider = GeminiProvider("gemini-2.0-flash-exp", api_key=os.getenv("GEMINI_API_KEY"))
+    scheduler = RequestScheduler(provider, concurrency=4, requests_per_minute=60)
+    responses = scheduler.run_sync(prompts)
+"""
+
+import asyncio
+import logging
+import queue
+import random
+import threading
+import time
+from collections import Counter
+from typing import AsyncIterator, Callable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from scripts.utils.chunking import estimate_tokens
+from scripts.utils.response_cache import ResponseCache, cache_key
+
+logger = logging.getLogger("llm_client")
+
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504, 529}
+
+# Fragments a stream may run ahead of its consumer before generation waits
+STREAM_QUEUE_SIZE = 256
+
+
+class Provider:
+    """Base class for model providers."""
+
+    name = "provider"
+
+    def __init__(self, model: str):
+        self.model = model
+
+    async def complete(self, prompt: str) -> str:
+        """Return the model's text response to ``prompt``."""
+        raise NotImplementedError
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        """Yield the response to ``prompt`` in fragments as it is generated."""
+        yield await self.complete(prompt)
+
+    def status_code(self, exc: Exception) -> Optional[int]:
+        """HTTP-like status code carried by a provider error, if any."""
+        for attr in ("status_code", "code"):
+            value = getattr(exc, attr, None)
+            if isinstance(value, int):
+                return value
+        return None
+
+    def is_retryable(self, exc: Exception) -> bool:
+        """Whether ``exc`` is a rate limit, timeout or server error worth retrying."""
+        if isinstance(exc, (asyncio.TimeoutError, ConnectionError)):
+            return True
+        return self.status_code(exc) in RETRYABLE_STATUS_CODES
+
+    def cache_params(self) -> dict:
+        """Generation parameters that change the response, for cache keys."""
+        return {}
+
+    def retry_after(self, exc: Exception) -> Optional[float]:
+        """Server-requested delay in seconds, if the error carries one."""
+        response = getattr(exc, "response", None)
+        headers = getattr(response, "headers", None) or {}
+        try:
+            value = headers.get("retry-after")
+            return float(value) if value is not None else None
+        except (TypeError, ValueError):
+            return None
+
+
+class GeminiProvider(Provider):
+    """Google Gemini through ``google-generativeai``."""
+
+    name = "gemini"
+
+    def __init__(self, model: str, api_key: Optional[str] = None, generation_config: Optional[dict] = None):
+        super().__init__(model)
+        import google.generativeai as genai
+
+        if api_key:
+            genai.configure(api_key=api_key)
+        self.generation_config = generation_config
+        self._model = genai.GenerativeModel(model, generation_config=generation_config)
+
+    async def complete(self, prompt: str) -> str:
+        response = await self._model.generate_content_async(prompt)
+        return response.text
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        response = await self._model.generate_content_async(prompt, stream=True)
+        async for chunk in response:
+            yield chunk.text
+
+    def cache_params(self) -> dict:
+        return dict(self.generation_config or {})
+
+
+class AnthropicProvider(Provider):
+    """Anthropic Claude through the ``anthropic`` SDK."""
+
+    name = "anthropic"
+
+    def __init__(self, model: str, api_key: Optional[str] = None, max_tokens: int = 8192, **params):
+        super().__init__(model)
+        import anthropic
+
+        # The scheduler owns retries, so the SDK's own retry loop is disabled
+        self._client = anthropic.AsyncAnthropic(api_key=api_key, max_retries=0)
+        self._connection_errors = (anthropic.APIConnectionError,)
+        self.max_tokens = max_tokens
+        self.params = params
+
+    async def complete(self, prompt: str) -> str:
+        message = await self._client.messages.create(
+            model=self.model,
+            max_tokens=self.max_tokens,
+            messages=[{"role": "user", "content": prompt}],
+            **self.params,
+        )
+        return "".join(block.text for block in message.content if getattr(block, "type", "") == "text")
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        async with self._client.messages.stream(
+            model=self.model,
+            max_tokens=self.max_tokens,
+            messages=[{"role": "user", "content": prompt}],
+            **self.params,
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+
+    def is_retryable(self, exc: Exception) -> bool:
+        return isinstance(exc, self._connection_errors) or super().is_retryable(exc)
+
+    def cache_params(self) -> dict:
+        return {"max_tokens": self.max_tokens, **self.params}
+
+
+class _FakeResponse:
+    def __init__(self, headers: dict):
+        self.headers = headers
+
+
+class FakeProviderError(Exception):
+    """Error raised by ``FakeProvider`` to simulate an API failure."""
+
+    def __init__(self, status_code: int, retry_after: Optional[float] = None):
+        super().__init__(f"Simulated status {status_code}")
+        self.status_code = status_code
+        self.response = _FakeResponse({} if retry_after is None else {"retry-after": str(retry_after)})
+
+
+class FakeProvider(Provider):
+    """
+    Local stand-in provider for dry runs.
+
+    ``responses`` is either a fixed string or a function of the prompt.
+    ``failures`` lists status codes to raise, in order, before answering
+    normally, which exercises the scheduler's retry path; an entry may also
+    be a ``(status, retry_after_seconds)`` pair.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        responses: Union[str, Callable[[str], str]] = '{"nodes": [], "relationships": []}',
+        latency: float = 0.0,
+        failures: Sequence[Union[int, Tuple[int, float]]] = (),
+        stream_fragment_size: int = 64,
+    ):
+        super().__init__("fake")
+        self.responses = responses
+        self.latency = latency
+        self.failures = list(failures)
+        self.stream_fragment_size = stream_fragment_size
+        self.calls: List[str] = []
+
+    async def complete(self, prompt: str) -> str:
+        self.calls.append(prompt)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.failures:
+            failure = self.failures.pop(0)
+            raise FakeProviderError(*failure) if isinstance(failure, tuple) else FakeProviderError(failure)
+        return self.responses(prompt) if callable(self.responses) else self.responses
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        text = await self.complete(prompt)
+        for start in range(0, len(text), self.stream_fragment_size):
+            await asyncio.sleep(0)
+            yield text[start:start + self.stream_fragment_size]
+
+
+def make_provider(name: str, model: str, **kwargs) -> Provider:
+    """Create a provider by name: ``gemini``, ``anthropic`` or ``fake``."""
+    providers = {"gemini": GeminiProvider, "anthropic": AnthropicProvider}
+    if name == "fake":
+        kwargs.pop("api_key", None)
+        return FakeProvider(**kwargs)
+    if name not in providers:
+        raise ValueError(f"Unknown LLM provider {name!r}; choose gemini, anthropic or fake")
+    return providers[name](model, **kwargs)
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at ``per_minute`` tokens per minute.
+
+    Tokens are taken up front and the balance may go negative: each caller
+    then waits until the refill has covered its share, so callers are served
+    in arrival order. The state is guarded by a thread lock rather than an
+    asyncio one, so one bucket can serve several event loops (``run`` calls
+    and stream threads).
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """Take ``amount`` tokens and return the seconds to wait before using them."""
+        # A request larger than the bucket would wait forever; let it drain the bucket instead
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= amount
+            return max(0.0, -self.tokens / self.rate)
+
+    async def acquire(self, amount: float = 1.0):
+        """Wait until ``amount`` tokens are available and take them."""
+        wait = self.reserve(amount)
+        if wait:
+            await asyncio.sleep(wait)
+
+
+class ConcurrencyLimit:
+    """Cap on requests in flight, shared by every event loop and thread of a scheduler."""
+
+    POLL_SECONDS = 0.01
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self.peak = 0
+        self._slots = threading.BoundedSemaphore(limit)
+        self._lock = threading.Lock()
+
+    async def __aenter__(self):
+        while not self._slots.acquire(blocking=False):
+            await asyncio.sleep(self.POLL_SECONDS)
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+
+class _StreamClosed(BaseException):
+    """Raised inside a stream whose consumer stopped reading."""
+
+
+class RequestScheduler:
+    """
+    Run prompts through a provider concurrently under rate limits.
+
+    Args:
+        provider: Provider to call
+        concurrency: Maximum requests in flight
+        requests_per_minute: Request rate limit (None for unlimited)
+        tokens_per_minute: Token rate limit over prompt plus expected output (None for unlimited)
+        expected_output_tokens: Output tokens to budget per request
+        max_retries: Retries per prompt on retryable errors
+        base_delay: First backoff delay in seconds
+        max_delay: Upper bound on a single backoff delay
+        cache: Response cache to read from and write to (None to disable)
+    """
+
+    def __init__(
+        self,
+        provider: Provider,
+        concurrency: int = 4,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        expected_output_tokens: int = 0,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        cache: Optional[ResponseCache] = None,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.provider = provider
+        self.concurrency = concurrency
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.expected_output_tokens = expected_output_tokens
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.cache = cache
+        self.stats = Counter()
+        # Shared by every run and stream, so back-to-back batches do not each get a fresh budget
+        self.slots = ConcurrencyLimit(concurrency)
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    def _backoff(self, attempt: int, exc: Exception) -> float:
+        """Delay before retry ``attempt`` (1-based): server hint, else full jitter."""
+        hinted = self.provider.retry_after(exc)
+        if hinted is not None:
+            return min(hinted, self.max_delay)
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+    async def _acquire_budget(self, tokens: int):
+        if self.request_bucket:
+            await self.request_bucket.acquire()
+        if self.token_bucket:
+            await self.token_bucket.acquire(tokens)
+
+    async def _complete(self, index: int, prompt: str) -> str:
+        key = None
+        if self.cache is not None:
+            key = cache_key(self.provider.name, self.provider.model, prompt, self.provider.cache_params())
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.stats["cached"] += 1
+                return cached
+
+        tokens = estimate_tokens(prompt) + self.expected_output_tokens
+        attempt = 0
+        while True:
+            await self._acquire_budget(tokens)
+            async with self.slots:
+                self.stats["requests"] += 1
+                try:
+                    started = time.perf_counter()
+                    text = await self.provider.complete(prompt)
+                    logger.info(
+                        "Request %d completed in %.1fs (%s)",
+                        index + 1, time.perf_counter() - started, self.provider.name
+                    )
+                    if self.cache is not None:
+                        self.cache.put(key, self.provider.model, text)
+                    return text
+                except Exception as exc:
+                    attempt += 1
+                    if not self.provider.is_retryable(exc) or attempt > self.max_retries:
+                        self.stats["failures"] += 1
+                        raise
+                    status = self.provider.status_code(exc)
+                    if status == 429:
+                        self.stats["rate_limited"] += 1
+                    self.stats["retries"] += 1
+                    reason = status or exc.__class__.__name__
+                    delay = self._backoff(attempt, exc)
+            logger.warning(
+                "Request %d failed (%s); retry %d/%d in %.1fs",
+                index + 1, reason, attempt, self.max_retries, delay
+            )
+            await asyncio.sleep(delay)
+
+    async def run(
+        self,
+        prompts: Sequence[str],
+        on_response: Optional[Callable[[int, str], None]] = None,
+    ) -> List[str]:
+        """
+        Complete every prompt and return the responses in prompt order.
+
+        Args:
+            prompts: Prompts to send
+            on_response: Called with ``(index, response)`` as each response
+                arrives, e.g. to checkpoint it before the batch finishes
+        """
+        async def complete(index: int, prompt: str) -> str:
+            response = await self._complete(index, prompt)
+            if on_response is not None:
+                on_response(index, response)
+            return response
+
+        tasks = [asyncio.create_task(complete(index, prompt)) for index, prompt in enumerate(prompts)]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    def run_sync(
+        self,
+        prompts: Sequence[str],
+        on_response: Optional[Callable[[int, str], None]] = None,
+    ) -> List[str]:
+        """Blocking wrapper around ``run`` for scripts."""
+        return asyncio.run(self.run(prompts, on_response))
+
+    async def _stream(self, prompt: str, emit: Callable[[str], None]):
+        """Stream one prompt into ``emit``, retrying failures before the first fragment."""
+        tokens = estimate_tokens(prompt) + self.expected_output_tokens
+        attempt = 0
+        while True:
+            await self._acquire_budget(tokens)
+            emitted = False
+            try:
+                async with self.slots:
+                    self.stats["requests"] += 1
+                    async for fragment in self.provider.stream(prompt):
+                        if fragment:
+                            emitted = True
+                            emit(fragment)
+                return
+            except Exception as exc:
+                attempt += 1
+                # Fragments already handed on cannot be taken back
+                if emitted or not self.provider.is_retryable(exc) or attempt > self.max_retries:
+                    self.stats["failures"] += 1
+                    raise
+                self.stats["retries"] += 1
+                reason = self.provider.status_code(exc) or exc.__class__.__name__
+                delay = self._backoff(attempt, exc)
+            logger.warning(
+                "Stream failed before output (%s); retry %d/%d in %.1fs",
+                reason, attempt, self.max_retries, delay
+            )
+            await asyncio.sleep(delay)
+
+    def iter_stream(self, prompt: str) -> Iterator[str]:
+        """
+        Yield the response to ``prompt`` in fragments as the model produces it.
+
+        The provider stream runs on its own event loop in a background thread
+        and hands fragments over through a queue, so the caller can parse and
+        write them while generation continues. The queue holds at most
+        ``STREAM_QUEUE_SIZE`` fragments, so generation waits for a slow
+        consumer; a consumer that stops early ends the stream. A cached
+        response is yielded whole. Streamed responses are not written to the
+        cache, which would mean holding the full output in memory.
+        """
+        if self.cache is not None:
+            key = cache_key(self.provider.name, self.provider.model, prompt, self.provider.cache_params())
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.stats["cached"] += 1
+                yield cached
+                return
+
+        fragments: "queue.Queue" = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+        finished = object()
+        closed = threading.Event()
+
+        def put(item):
+            while True:
+                if closed.is_set():
+                    raise _StreamClosed()
+                try:
+                    fragments.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def worker():
+            try:
+                asyncio.run(self._stream(prompt, put))
+                put(finished)
+            except _StreamClosed:
+                pass
+            except BaseException as exc:  # handed to the consuming thread
+                try:
+                    put(exc)
+                except _StreamClosed:
+                    pass
+
+        thread = threading.Thread(target=worker, name="llm-stream", daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = fragments.get()
+                if item is finished:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            closed.set()
+            thread.join()
@@ -0,0 +1,155 @@
+"""
+JSON Lines (NDJSON) sweep files.
+
+One element per line, tagged with its kind:
+
+    {"_type": "meta", "sweep_id": "sweep02_concepts"}
+    {"_type": "node", "id": "concept:climate_change", "labels": ["Concept"], "properties": {...}}
+    {"_type": "relationship", "source_id": "...", "target_id": "...", "type": "RELATES_TO"}
+    {"_type": "enrichment", "target_id": "...", "properties": {...}}
+
+The tag is ``_type`` because relationships already use ``type``. Lines can be
+appended as results arrive, concatenated with ``cat``, and read back one at
+a time, so neither writing nor importing needs the whole file in memory.
+
+``iter_sweep_items`` and ``iter_sweep_section`` read either format: JSON Lines
+(detected by extension or by a tagged first line) or a regular sweep JSON
+document.
+"""
+
+import json
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any, Iterator, Tuple
+
+from scripts.utils.json_stream import JSONStreamError, iter_json_file
+
+TYPE_KEY = "_type"
+META_TYPE = "meta"
+SECTION_TYPES = {"nodes": "node", "relationships": "relationship", "enrichments": "enrichment"}
+TYPE_SECTIONS = {tag: section for section, tag in SECTION_TYPES.items()}
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+SNIFF_CHARS = 4096
+TAGGED_START = re.compile(r'\{\s*"' + TYPE_KEY + '"')
+
+
+def to_line(section: str, item: dict) -> str:
+    """Serialise one sweep element as a tagged line (without the newline)."""
+    return json.dumps({TYPE_KEY: SECTION_TYPES[section], **item}, ensure_ascii=False)
+
+
+def is_ndjson(path) -> bool:
+    """
+    Whether ``path`` is a JSON Lines sweep file rather than a JSON document.
+
+    Only the first ``SNIFF_CHARS`` characters are read. A compact JSON
+    document can be one very long line, so the first line is never read or
+    parsed unless it fits in that prefix.
+    """
+    if Path(path).suffix.lower() in NDJSON_SUFFIXES:
+        return True
+    with open(path, "r", encoding="utf-8") as handle:
+        prefix = handle.read(SNIFF_CHARS).lstrip()
+    if TAGGED_START.match(prefix):
+        return True
+    line, newline, _ = prefix.partition("\n")
+    if not newline:
+        return False
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError:
+        # A multi-line JSON document's first line is not complete
+        return False
+    return isinstance(record, dict) and TYPE_KEY in record
+
+
+def iter_ndjson_items(path) -> Iterator[Tuple[str, Any]]:
+    """
+    Stream the elements of a JSON Lines sweep file.
+
+    Yields the same ``(key, value)`` pairs as ``json_stream.iter_json_items``
+    does for a JSON document: ``("nodes", node)`` and so on for elements,
+    and one pair per field of a ``meta`` line.
+
+    Raises:
+        JSONStreamError: On a line that is not a JSON object
+    """
+    offset = 0
+    with open(path, "r", encoding="utf-8") as handle:
+        for number, line in enumerate(handle, 1):
+            start = offset
+            offset += len(line)
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise JSONStreamError(f"Invalid JSON on line {number}: {exc.msg}", start + exc.pos) from exc
+            if not isinstance(record, dict):
+                raise JSONStreamError(f"Line {number} is not a JSON object", start)
+
+            tag = record.pop(TYPE_KEY, None)
+            if tag == META_TYPE:
+                yield from record.items()
+            elif tag in TYPE_SECTIONS:
+                yield TYPE_SECTIONS[tag], record
+            else:
+                raise JSONStreamError(f"Line {number} has unknown {TYPE_KEY} {tag!r}", start)
+
+
+def iter_sweep_items(path) -> Iterator[Tuple[str, Any]]:
+    """Stream ``(key, value)`` pairs from a sweep file in either format."""
+    if is_ndjson(path):
+        return iter_ndjson_items(path)
+    return iter_json_file(path)
+
+
+def iter_sweep_section(path, section: str) -> Iterator[Any]:
+    """Stream the elements of one section (``nodes``, ...) from a sweep file in either format."""
+    for key, value in iter_sweep_items(path):
+        if key == section:
+            yield value
+
+
+class NdjsonWriter:
+    """
+    Write sweep elements to a JSON Lines file as they are produced.
+
+    Doubles as a sink (``add``/``close``) for ``scripts.utils.sweep_sinks``.
+
+    Args:
+        path: Output file
+        append: Add to an existing file instead of replacing it
+    """
+
+    def __init__(self, path, append: bool = False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.counts = Counter()
+        # Line buffered, so every complete element reaches the file
+        self._file = open(self.path, "a" if append else "w", encoding="utf-8", buffering=1)
+
+    def add(self, section: str, item: dict):
+        """Append one element."""
+        self._file.write(to_line(section, item) + "\n")
+        self.counts[section] += 1
+
+    def add_meta(self, values: dict):
+        """Append a line of sweep metadata (``sweep_id`` and the like)."""
+        if values:
+            self._file.write(json.dumps({TYPE_KEY: META_TYPE, **values}, ensure_ascii=False) + "\n")
+
+    def add_result(self, data: dict):
+        """Append a whole sweep result (``nodes``/``relationships``/``enrichments``)."""
+        self.add_meta({
+            key: value for key, value in data.items()
+            if key not in SECTION_TYPES and key != "statistics"
+        })
+        for section in SECTION_TYPES:
+            for item in data.get(section) or []:
+                self.add(section, item)
+
+    def close(self):
+        """Close the file."""
+        self._file.close()
@@ -0,0 +1,144 @@
+"""
+Persistent, content-addressed cache for LLM responses.
+
+A response is stored under a hash of everything that determines it: the
+provider, the model name, the full prompt (instructions plus context and
+corpus text) and the generation parameters. Rerunning a sweep after a
+parsing failure or a post-processing change, or sending a chunk that is
+identical to one from another sweep, returns the stored response instead of
+paying for the call again.
+
+Entries live in a local SQLite file and are evicted by age and, least
+recently used first, by total size.
+"""
+
+import json
+import time
+import sqlite3
+import hashlib
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_PATH = "output/cache/llm_responses.sqlite"
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+DEFAULT_MAX_AGE_SECONDS = 30 * 24 * 3600
+
+
+def cache_key(provider: str, model: str, prompt: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Hash identifying one request."""
+    payload = json.dumps(
+        {"provider": provider, "model": model, "prompt": prompt, "params": params or {}},
+        sort_keys=True, ensure_ascii=False, default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    SQLite-backed response cache with size and age limits.
+
+    Args:
+        path: Cache file location
+        max_bytes: Total response size to keep; least recently used go first
+        max_age_seconds: Entries older than this are treated as misses and purged
+        bypass: Skip lookups (responses are still stored, refreshing the cache)
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+        bypass: bool = False,
+    ):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.bypass = bypass
+        self.stats = Counter()
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_by_access ON responses (accessed)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for ``key``, or None on a miss."""
+        if self.bypass:
+            self.stats["bypassed"] += 1
+            return None
+
+        row = self._conn.execute(
+            "SELECT response, created FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        now = time.time()
+        if row is None or now - row[1] > self.max_age_seconds:
+            self.stats["misses"] += 1
+            return None
+
+        self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        self._conn.commit()
+        self.stats["hits"] += 1
+        return row[0]
+
+    def put(self, key: str, model: str, response: str):
+        """Store a response and apply the eviction limits."""
+        now = time.time()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses (key, model, response, size, created, accessed) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, model, response, len(response.encode("utf-8")), now, now)
+        )
+        self.stats["stores"] += 1
+        self._evict(now)
+        self._conn.commit()
+
+    def _evict(self, now: float):
+        expired = self._conn.execute(
+            "DELETE FROM responses WHERE created < ?", (now - self.max_age_seconds,)
+        ).rowcount
+        self.stats["evicted"] += expired
+
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.stats["evicted"] += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """Hit/miss counters plus current entry count and size."""
+        entries, size = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else None,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def clear(self):
+        """Remove every entry."""
+        self._conn.execute("DELETE FROM responses")
+        self._conn.commit()
+
+    def close(self):
+        """Close the cache file."""
+        self._conn.close()
@@ -0,0 +1,119 @@
+"""
+Full-text search indexes for the Explorer.
+
+There is one index per label over the label's string properties. The shared
+``Node`` base label's index serves searches across all labels. The UI only
+reads ``SHOW FULLTEXT INDEXES`` and falls back to a scan when no usable
+index exists. Building and rebuilding indexes is schema work for the write
+user, so it happens here, at import time and in
+``scripts/refresh_graph_stats.py``.
+
+The two entry points differ in cost:
+
+- After an import, the importer passes the string properties it wrote per
+  label. An index is only created or widened when it does not cover them,
+  so a small import costs one ``SHOW FULLTEXT INDEXES``.
+- Without ``written``, the properties come from
+  ``db.schema.nodeTypeProperties``, which scans the graph. Each index is
+  then rebuilt to match exactly, which also drops properties that are gone.
+
+Index names must match ``search_index_name`` in
+``frontend/utils/graph_helpers.py``.
+"""
+
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Mapping, Optional
+
+from scripts.utils.graph_stats import STATS_LABEL
+
+SEARCH_INDEX_PREFIX = "search_"
+
+
+def _quote(name: str) -> str:
+    return "`" + str(name).replace("`", "``") + "`"
+
+
+def search_index_name(label: str) -> str:
+    """Name of the full-text index for ``label``."""
+    return SEARCH_INDEX_PREFIX + re.sub(r"\W", "_", label).lower()
+
+
+def string_properties(properties: Mapping[str, object]) -> List[str]:
+    """Keys of ``properties`` holding text, the ones worth indexing."""
+    return [key for key, value in properties.items() if isinstance(value, str)]
+
+
+def searchable_properties(session) -> Dict[str, List[str]]:
+    """String properties per label, from the schema procedure (scans the graph)."""
+    rows = session.run("""
+        CALL db.schema.nodeTypeProperties()
+        YIELD nodeLabels, propertyName, propertyTypes
+        RETURN nodeLabels, propertyName, propertyTypes
+    """)
+    properties = defaultdict(set)
+    for row in rows:
+        if not row["propertyName"] or not any(
+            str(kind).startswith("String") for kind in row["propertyTypes"] or []
+        ):
+            continue
+        for label in row["nodeLabels"] or []:
+            if label != STATS_LABEL:
+                properties[label].add(row["propertyName"])
+    return {label: sorted(names) for label, names in properties.items()}
+
+
+def existing_indexes(session) -> Dict[str, Dict[str, object]]:
+    """The search indexes that exist, by name."""
+    rows = session.run("""
+        SHOW FULLTEXT INDEXES
+        YIELD name, entityType, labelsOrTypes, properties
+        RETURN name, entityType, labelsOrTypes, properties
+    """)
+    return {
+        row["name"]: {"labels": row["labelsOrTypes"] or [], "properties": row["properties"] or []}
+        for row in rows
+        if row["entityType"] == "NODE" and row["name"].startswith(SEARCH_INDEX_PREFIX)
+    }
+
+
+def ensure_search_indexes(driver, written: Optional[Mapping[str, Iterable[str]]] = None) -> List[str]:
+    """
+    Create or rebuild full-text indexes and return the names changed.
+
+    Args:
+        driver: ``neo4j.Driver``
+        written: String properties written per label since the indexes were
+            last maintained. Indexes are only widened to cover them. Without
+            it, every label's index is rebuilt to match the schema.
+
+    Returns:
+        Names of the indexes created or rebuilt
+    """
+    with driver.session() as session:
+        existing = existing_indexes(session)
+        if written is None:
+            wanted = searchable_properties(session)
+            exact = True
+        else:
+            wanted = {label: set(names) for label, names in written.items() if names}
+            exact = False
+
+        changed = []
+        for label, properties in sorted(wanted.items()):
+            name = search_index_name(label)
+            current = existing.get(name)
+            if current and current["labels"] == [label]:
+                covered = set(current["properties"])
+                if (covered == set(properties)) if exact else covered.issuperset(properties):
+                    continue
+                if not exact:
+                    properties = covered | set(properties)
+            if current:
+                session.run(f"DROP INDEX {_quote(name)} IF EXISTS").consume()
+            fields = ", ".join(f"n.{_quote(prop)}" for prop in sorted(properties))
+            session.run(
+                f"CREATE FULLTEXT INDEX {_quote(name)} IF NOT EXISTS FOR (n:{_quote(label)}) ON EACH [{fields}]"
+            ).consume()
+            changed.append(name)
+    return changed
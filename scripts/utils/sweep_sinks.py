@@ -0,0 +1,178 @@
+"""
+Destinations for sweep elements produced one at a time.
+
+When a model response is parsed incrementally (see ``json_stream`` and
+``RequestScheduler.iter_stream``), each node, relationship and enrichment
+is handed to a sink as soon as its closing brace arrives, instead of after
+the whole response has been collected:
+
+- ``SweepFileSink`` writes a regular sweep JSON file, spooling each section
+  to a part file so nothing accumulates in memory
+- ``ImporterSink`` feeds a ``Neo4jImporter`` in batches while the model is
+  still generating
+- ``ProgressSink`` counts elements and remembers the last one per section,
+  which is what a continuation request needs after a cut-off
+- ``TeeSink`` sends the same elements to several sinks
+
+Every sink has ``add(section, item)`` and ``close()``; ``stream_into`` pumps
+``(key, value)`` pairs from the parser into one.
+"""
+
+import json
+import shutil
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+SECTIONS = ("nodes", "relationships", "enrichments")
+
+
+class SweepFileSink:
+    """
+    Write streamed elements to a sweep JSON file.
+
+    Elements are appended to one part file per section as they arrive;
+    ``close`` concatenates the parts into ``{"nodes": [...], ...}`` at
+    ``path`` and removes them. Empty sections are omitted, as in the merged
+    output of a non-streaming run.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.counts = Counter()
+        self._parts: Dict[str, Any] = {}
+
+    def _part_path(self, section: str) -> Path:
+        return self.path.with_name(f"{self.path.name}.{section}.part")
+
+    def add(self, section: str, item: dict):
+        """Append one element to its section."""
+        part = self._parts.get(section)
+        if part is None:
+            part = self._parts[section] = open(self._part_path(section), "w", encoding="utf-8")
+        else:
+            part.write(",\n")
+        part.write(json.dumps(item, ensure_ascii=False))
+        part.flush()
+        self.counts[section] += 1
+
+    def close(self):
+        """Assemble the final file from the section parts."""
+        for part in self._parts.values():
+            part.close()
+
+        with open(self.path, "w", encoding="utf-8") as out:
+            out.write("{")
+            for position, section in enumerate(section for section in SECTIONS if section in self._parts):
+                out.write(",\n" if position else "\n")
+                out.write(f"{json.dumps(section)}: [\n")
+                with open(self._part_path(section), encoding="utf-8") as part:
+                    shutil.copyfileobj(part, out)
+                out.write("\n]")
+            out.write("\n}\n")
+
+        for section in self._parts:
+            self._part_path(section).unlink()
+        self._parts = {}
+
+
+class ImporterSink:
+    """
+    Import streamed elements into Neo4j in batches.
+
+    Pending nodes are flushed before any relationship or enrichment batch,
+    so endpoints that have already been emitted exist when edges that refer
+    to them are written.
+
+    Args:
+        importer: ``Neo4jImporter`` (or anything with the same import methods)
+        batch_size: Elements per section to collect before writing; defaults
+            to the importer's batch size
+    """
+
+    def __init__(self, importer, batch_size: int = None):
+        self.importer = importer
+        self.batch_size = batch_size or importer.batch_size
+        self.counts = Counter()
+        self._pending: Dict[str, List[dict]] = {section: [] for section in SECTIONS}
+
+    def add(self, section: str, item: dict):
+        """Queue one element, writing its section once a batch is full."""
+        pending = self._pending[section]
+        pending.append(item)
+        if len(pending) >= self.batch_size:
+            self.flush(section)
+
+    def flush(self, section: str):
+        """Write the pending elements of ``section``."""
+        if section != "nodes":
+            self.flush("nodes")
+        pending = self._pending[section]
+        if not pending:
+            return
+        self._pending[section] = []
+
+        if section == "nodes":
+            self.counts["nodes"] += self.importer.import_nodes(pending)
+        elif section == "relationships":
+            self.counts["relationships"] += self.importer.import_relationships(pending)
+        else:
+            result = self.importer.import_enrichments(pending)
+            self.counts["enrichments"] += result["matched"]
+            self.counts["unmatched_enrichments"] += result["unmatched"]
+
+    def close(self):
+        """Write whatever is still pending."""
+        for section in SECTIONS:
+            self.flush(section)
+
+
+class ProgressSink:
+    """Count streamed elements and keep the last one of each section."""
+
+    def __init__(self):
+        self.counts = Counter()
+        self.last: Dict[str, dict] = {}
+
+    def add(self, section: str, item: dict):
+        self.counts[section] += 1
+        self.last[section] = item
+
+    def close(self):
+        pass
+
+
+class TeeSink:
+    """Send every element to several sinks."""
+
+    def __init__(self, *sinks):
+        self.sinks = sinks
+
+    def add(self, section: str, item: dict):
+        for sink in self.sinks:
+            sink.add(section, item)
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+def stream_into(items: Iterable[Tuple[str, Any]], sink) -> Counter:
+    """
+    Hand parsed sweep elements to ``sink`` as they arrive.
+
+    Args:
+        items: ``(key, value)`` pairs from ``json_stream.iter_json_items``
+        sink: Object with ``add(section, item)``
+
+    Returns:
+        Count of elements delivered per section; other top-level keys
+        (``sweep_id``, ``statistics``) are skipped
+    """
+    counts = Counter()
+    for key, value in items:
+        if key in SECTIONS and isinstance(value, dict):
+            sink.add(key, value)
+            counts[key] += 1
+    return counts
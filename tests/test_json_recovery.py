@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from scripts.utils.json_recovery import cut_in_elements, recover_json
+from scripts.utils.json_stream import JSONStreamError, iter_json_items
+
+NODE = {"id": "concept:a", "labels": ["Concept"], "properties": {"name": "A"}}
+RELATIONSHIP = {"source_id": "concept:a", "target_id": "concept:b", "type": "RELATES_TO"}
+
+COMPLETE = json.dumps({"nodes": [NODE], "relationships": [RELATIONSHIP]})
+WITH_STATISTICS = json.dumps({"nodes": [NODE], "relationships": [RELATIONSHIP], "statistics": {"nodes": 1}})
+
+
+def _stream_error(text):
+    with pytest.raises(JSONStreamError) as info:
+        for _ in iter_json_items(text[index:index + 7] for index in range(0, len(text), 7)):
+            pass
+    return info.value
+
+
+@pytest.mark.parametrize("text, lost", [
+    # Complete response without enrichments, only the closing brace missing
+    (COMPLETE[:-1], False),
+    (COMPLETE[:-2], True),
+    (WITH_STATISTICS[:-3], False),
+    # The next member was announced or its name started
+    (COMPLETE[:-1] + ",", True),
+    (COMPLETE[:-1] + ', "enrich', True),
+    (COMPLETE[:-1] + ', "enrichments"', True),
+    (COMPLETE[:-1] + ', "enrichments": ', True),
+    (COMPLETE[:-1] + ', "stat', False),
+    ('{"nodes": [', True),
+    ("{", True),
+])
+def test_only_opened_sections_count_as_cut_off(text, lost):
+    recovered = recover_json(text)
+    assert recovered.truncated
+    assert recovered.elements_truncated is lost
+    assert cut_in_elements(_stream_error(text).section) is lost
+
+
+def test_complete_response_without_enrichments_is_not_truncated():
+    recovered = recover_json(COMPLETE)
+    assert not recovered.truncated
+    assert not recovered.elements_truncated
+    assert recovered.counts() == {"nodes": 1, "relationships": 1}
+
+
+def test_salvages_elements_before_the_cut():
+    recovered = recover_json(COMPLETE[:COMPLETE.index("relationships") + 30])
+    assert recovered.section == "relationships"
+    assert recovered.data["nodes"] == [NODE]
+    assert recovered.elements_truncated
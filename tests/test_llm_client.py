@@ -0,0 +1,192 @@
+import asyncio
+import random
+import threading
+import time
+
+import pytest
+
+from scripts.utils.llm_client import (
+    STREAM_QUEUE_SIZE,
+    FakeProvider,
+    FakeProviderError,
+    RequestScheduler,
+    TokenBucket,
+)
+
+
+class TrackingProvider(FakeProvider):
+    """FakeProvider that records how many calls were in flight at once."""
+
+    def __init__(self, delays=None, fragments=0, **kwargs):
+        super().__init__(responses=lambda prompt: prompt, **kwargs)
+        self.delays = delays or {}
+        self.fragments = fragments
+        self.in_flight = 0
+        self.peak = 0
+        self.emitted = 0
+        self._lock = threading.Lock()
+
+    def _enter(self):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+
+    def _leave(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    async def complete(self, prompt):
+        self._enter()
+        try:
+            await asyncio.sleep(self.delays.get(prompt, 0.01))
+            return await super().complete(prompt)
+        finally:
+            self._leave()
+
+    async def stream(self, prompt):
+        self._enter()
+        try:
+            for position in range(self.fragments):
+                await asyncio.sleep(0.001)
+                self.emitted += 1
+                yield f"{prompt}:{position};"
+        finally:
+            self._leave()
+
+
+def test_retries_rate_limits_and_server_errors():
+    provider = FakeProvider(responses="ok", failures=[429, 503, 500])
+    scheduler = RequestScheduler(provider, base_delay=0.001)
+
+    assert scheduler.run_sync(["a"]) == ["ok"]
+    assert len(provider.calls) == 4
+    assert scheduler.stats["retries"] == 3
+    assert scheduler.stats["rate_limited"] == 1
+
+
+def test_client_errors_are_not_retried():
+    provider = FakeProvider(responses="ok", failures=[400])
+    scheduler = RequestScheduler(provider, base_delay=0.001)
+
+    with pytest.raises(FakeProviderError):
+        scheduler.run_sync(["a"])
+    assert len(provider.calls) == 1
+    assert scheduler.stats["failures"] == 1
+
+
+def test_gives_up_after_max_retries():
+    provider = FakeProvider(responses="ok", failures=[503] * 3)
+    scheduler = RequestScheduler(provider, max_retries=2, base_delay=0.001)
+
+    with pytest.raises(FakeProviderError):
+        scheduler.run_sync(["a"])
+    assert len(provider.calls) == 3
+
+
+def test_honours_retry_after():
+    scheduler = RequestScheduler(FakeProvider(), base_delay=30.0, max_delay=60.0)
+
+    assert scheduler._backoff(1, FakeProviderError(429, retry_after=7)) == 7
+    # A hint beyond the cap is clipped
+    assert scheduler._backoff(1, FakeProviderError(429, retry_after=600)) == 60.0
+
+    # The hint replaces the (here 30s) exponential delay
+    provider = FakeProvider(responses="ok", failures=[(429, 0.05)])
+    scheduler = RequestScheduler(provider, base_delay=30.0)
+    started = time.monotonic()
+    assert scheduler.run_sync(["a"]) == ["ok"]
+    assert 0.05 <= time.monotonic() - started < 5
+
+
+def test_backoff_uses_full_jitter():
+    random.seed(1)
+    scheduler = RequestScheduler(FakeProvider(), base_delay=1.0, max_delay=60.0)
+    delays = [scheduler._backoff(3, FakeProviderError(503)) for _ in range(500)]
+
+    assert all(0 <= delay <= 4.0 for delay in delays)
+    assert min(delays) < 1.0
+
+
+def test_results_keep_prompt_order_under_concurrency():
+    prompts = [f"p{index}" for index in range(12)]
+    # Later prompts finish first
+    provider = TrackingProvider(delays={prompt: 0.002 * (12 - index) for index, prompt in enumerate(prompts)})
+    arrived = []
+    scheduler = RequestScheduler(provider, concurrency=12)
+
+    assert scheduler.run_sync(prompts, on_response=lambda index, _: arrived.append(index)) == prompts
+    assert arrived != sorted(arrived)
+
+
+def test_concurrency_limit_is_enforced():
+    provider = TrackingProvider()
+    scheduler = RequestScheduler(provider, concurrency=3)
+
+    scheduler.run_sync([f"p{index}" for index in range(20)])
+    assert provider.peak == 3
+    assert scheduler.slots.peak == 3
+
+
+def test_token_bucket_enforces_rate():
+    bucket = TokenBucket(per_minute=600, capacity=1)
+
+    async def take(count):
+        for _ in range(count):
+            await bucket.acquire()
+
+    started = time.monotonic()
+    asyncio.run(take(5))
+    # One token up front, then one every 0.1s
+    assert time.monotonic() - started >= 0.35
+
+
+def test_request_budget_carries_over_between_runs():
+    scheduler = RequestScheduler(FakeProvider(responses="ok"), concurrency=8, requests_per_minute=120)
+
+    scheduler.run_sync(["a"] * 120)
+    started = time.monotonic()
+    scheduler.run_sync(["b"])
+    # The first run spent the whole burst; refill is 2 requests per second
+    assert time.monotonic() - started >= 0.4
+
+
+def test_token_budget_counts_prompt_and_output():
+    scheduler = RequestScheduler(FakeProvider(responses="ok"), tokens_per_minute=10_000, expected_output_tokens=500)
+
+    scheduler.run_sync(["x" * 400] * 4)
+    assert scheduler.token_bucket.tokens < 10_000 - 4 * 500
+
+
+def test_streams_share_the_concurrency_limit():
+    provider = TrackingProvider(fragments=50)
+    scheduler = RequestScheduler(provider, concurrency=1)
+    outputs = {}
+
+    def consume(prompt):
+        outputs[prompt] = "".join(scheduler.iter_stream(prompt))
+
+    threads = [threading.Thread(target=consume, args=(prompt,)) for prompt in ("a", "b", "c")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert provider.peak == 1
+    assert all(outputs[prompt].count(";") == 50 for prompt in ("a", "b", "c"))
+    assert scheduler.stats["requests"] == 3
+
+
+def test_stream_waits_for_slow_consumer_and_stops_when_closed():
+    provider = TrackingProvider(fragments=STREAM_QUEUE_SIZE * 4)
+    scheduler = RequestScheduler(provider)
+    stream = scheduler.iter_stream("a")
+
+    assert next(stream) == "a:0;"
+    time.sleep(0.5)
+    # The producer is held back by the bounded queue instead of buffering everything
+    assert provider.emitted <= STREAM_QUEUE_SIZE + 2
+
+    stream.close()
+    assert provider.in_flight == 0
+    assert scheduler.slots.in_flight == 0
+    assert not any(thread.name == "llm-stream" for thread in threading.enumerate())
@@ -0,0 +1,59 @@
+import json
+import tracemalloc
+
+from scripts.utils.ndjson import NdjsonWriter, is_ndjson, iter_sweep_section
+
+
+def _sweep(count):
+    return {
+        "sweep_id": "sweep_test",
+        "nodes": [
+            {"id": f"concept:{index}", "labels": ["Concept"], "properties": {"name": f"Concept {index}", "text": "x" * 200}}
+            for index in range(count)
+        ],
+        "relationships": [
+            {"source_id": f"concept:{index}", "target_id": f"concept:{index + 1}", "type": "RELATES_TO"}
+            for index in range(count - 1)
+        ],
+    }
+
+
+def test_detects_tagged_lines_without_the_extension(tmp_path):
+    path = tmp_path / "sweep.json"
+    writer = NdjsonWriter(path)
+    writer.add_result(_sweep(3))
+    writer.close()
+
+    assert is_ndjson(path)
+    assert [node["id"] for node in iter_sweep_section(path, "nodes")] == ["concept:0", "concept:1", "concept:2"]
+
+
+def test_detects_documents(tmp_path):
+    indented = tmp_path / "indented.json"
+    indented.write_text(json.dumps(_sweep(3), indent=2))
+    compact = tmp_path / "compact.json"
+    compact.write_text(json.dumps(_sweep(3)))
+
+    assert not is_ndjson(indented)
+    assert not is_ndjson(compact)
+    assert len(list(iter_sweep_section(compact, "relationships"))) == 2
+
+
+def test_large_single_line_document_streams_in_bounded_memory(tmp_path):
+    path = tmp_path / "sweep.json"
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(_sweep(40_000), handle)
+    size = path.stat().st_size
+    assert size > 10_000_000
+    assert path.read_text(encoding="utf-8").count("\n") == 0
+
+    tracemalloc.start()
+    try:
+        count = sum(1 for _ in iter_sweep_section(path, "nodes"))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert count == 40_000
+    # Sniffing the format must not read the whole line
+    assert peak < size / 2